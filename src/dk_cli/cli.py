@@ -10,10 +10,13 @@ from rich.console import Console
 from rich.live import Live
 from rich.panel import Panel
 
-from .client import DraftKingsClient, fetch_nfl_games
-from .database import Database
+from .client import (
+    DraftKingsClient, LEAGUE_URLS, PARSE_STRATEGIES, fetch_nfl_games, merge_league_games
+)
+from .database import EXPORT_TABLES, Database
 from .display import display_games, display_game_detail, display_games_table
 from .models import NFLGame
+from .request_filter import RequestFilter
 
 
 console = Console()
@@ -57,17 +60,109 @@ def main():
     default=True,
     help="Run browser in headless mode (default: headless)"
 )
-def fetch(format: str, watch: bool, interval: int, no_save: bool, headless: bool):
+@click.option(
+    "--ingestion",
+    type=click.Choice(["dom", "network"]),
+    default="dom",
+    help="Parse the rendered page (dom) or DraftKings' JSON feeds (network)"
+)
+@click.option(
+    "--block-resources/--no-block-resources",
+    default=True,
+    help="Abort images, fonts, stylesheets and trackers (default: block)"
+)
+@click.option(
+    "--league", "-L",
+    "leagues",
+    multiple=True,
+    help=f"League to fetch, repeatable ({', '.join(LEAGUE_URLS)} or a game-lines URL)"
+)
+@click.option(
+    "--concurrency",
+    type=int,
+    default=3,
+    help="Max pages fetched at once with several leagues (default: 3)"
+)
+@click.option(
+    "--profile-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Persistent browser profile; reuses cookies and the HTTP cache between runs"
+)
+@click.option(
+    "--storage-state",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Load and save cookies/localStorage from this JSON file"
+)
+@click.option(
+    "--timings",
+    is_flag=True,
+    help="Print per-phase scrape timings"
+)
+def fetch(
+    format: str,
+    watch: bool,
+    interval: int,
+    no_save: bool,
+    headless: bool,
+    ingestion: str,
+    block_resources: bool,
+    leagues: tuple,
+    concurrency: int,
+    profile_dir: Optional[Path],
+    storage_state: Optional[Path],
+    timings: bool
+):
     """Fetch current NFL betting lines from DraftKings."""
     db = None if no_save else Database()
+    request_filter = RequestFilter() if block_resources else None
 
     async def do_fetch() -> List[NFLGame]:
         try:
-            async with DraftKingsClient(headless=headless) as client:
-                games = await client.fetch_nfl_games()
+            async with DraftKingsClient(
+                headless=headless,
+                ingestion=ingestion,
+                request_filter=request_filter,
+                user_data_dir=profile_dir,
+                storage_state_path=storage_state,
+            ) as client:
+                if leagues and list(leagues) != ["nfl"]:
+                    games_by_league = await client.fetch_leagues(leagues, concurrency)
+                    for league, league_games in games_by_league.items():
+                        console.print(f"[dim]{league}: {len(league_games)} games[/dim]")
+                    games = merge_league_games(games_by_league)
+                else:
+                    games = await client.fetch_nfl_games()
+                stats = client.last_request_stats
+                if stats:
+                    console.print(
+                        f"[dim]Blocked {stats.blocked_requests} of "
+                        f"{stats.blocked_requests + stats.allowed_requests} requests, "
+                        f"{stats.bytes_received / 1024:.0f} KB received, "
+                        f"{stats.cached_responses} from cache[/dim]"
+                    )
+                if timings:
+                    if client.launch_seconds is not None:
+                        console.print(f"[dim]launch: {client.launch_seconds:.2f}s[/dim]")
+                    for metrics in client.last_fetch_metrics:
+                        phases = ", ".join(
+                            f"{name} {seconds:.2f}s" for name, seconds in metrics.phases.items()
+                        )
+                        console.print(
+                            f"[dim]{metrics.url}: {phases} - {metrics.cards} cards, "
+                            f"{metrics.games} games, {metrics.parse_failures} parse failures[/dim]"
+                        )
                 if db and games:
-                    saved = db.save_games(games)
-                    console.print(f"[dim]Saved {saved} games to database[/dim]")
+                    report = db.save_games(games)
+                    console.print(
+                        f"[dim]Saved {report.saved} games to database "
+                        f"({report.inserted} changed)[/dim]"
+                    )
+                    for game_id, error in report.errors.items():
+                        console.print(
+                            f"[yellow]Warning: Failed to save game {game_id}: {error}[/yellow]"
+                        )
                 return games
         except Exception as e:
             console.print(f"[red]Error fetching data: {e}[/red]")
@@ -208,6 +303,170 @@ def games():
         console.print(f"  {game_id}")
 
 
+@main.command()
+@click.option(
+    "--config", "-c",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Config file with a [retention] table"
+)
+@click.option(
+    "--no-vacuum",
+    is_flag=True,
+    help="Skip the incremental vacuum"
+)
+def maintain(config: Optional[Path], no_vacuum: bool):
+    """Roll up, archive and vacuum old line history."""
+    from .config import load_config
+
+    cfg = load_config(config)
+    db = Database()
+    report = db.apply_retention(cfg.retention_policy())
+    if not no_vacuum:
+        report.pages_vacuumed = db.incremental_vacuum()
+
+    console.print(f"[cyan]Raw rows rolled up:[/cyan] {report.raw_rows_rolled_up}")
+    console.print(f"[cyan]Minute rows rolled up:[/cyan] {report.minute_rows_rolled_up}")
+    console.print(f"[cyan]Hour rows archived:[/cyan] {report.hour_rows_archived}")
+    console.print(f"[cyan]Game rows pruned:[/cyan] {report.games_rows_pruned}")
+    console.print(f"[cyan]Pages freed:[/cyan] {report.pages_vacuumed}")
+
+
+@main.command()
+@click.argument(
+    "out",
+    type=click.Path(file_okay=False, path_type=Path),
+    required=False
+)
+@click.option(
+    "--table", "-t",
+    "tables",
+    multiple=True,
+    type=click.Choice(list(EXPORT_TABLES)),
+    help="Table to export, repeatable (default: all)"
+)
+@click.option(
+    "--full",
+    is_flag=True,
+    help="Rewrite every table instead of appending rows added since the last export"
+)
+def export(out: Optional[Path], tables: tuple, full: bool):
+    """Export line history and bets to partitioned Parquet files."""
+    from .export import DEFAULT_EXPORT_DIR, export_history
+
+    out = out or DEFAULT_EXPORT_DIR
+    try:
+        report = export_history(Database(), out, tables or EXPORT_TABLES, full=full)
+    except RuntimeError as e:
+        console.print(f"[red]{e}[/red]")
+        raise SystemExit(1)
+
+    for table, rows in report.rows.items():
+        updated = report.updated.get(table)
+        suffix = f", {updated} updated" if updated else ""
+        console.print(f"[cyan]{table}:[/cyan] {rows} rows{suffix}")
+    console.print(f"[green]Wrote {len(report.files)} files to {out}[/green]")
+
+
+@main.command()
+@click.option(
+    "--out", "-o",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Directory to save the fixture in (default: ~/.dk_cli/fixtures)"
+)
+@click.option(
+    "--headless/--no-headless",
+    default=True,
+    help="Run browser in headless mode"
+)
+def capture(out: Optional[Path], headless: bool):
+    """Save the current NFL page as an HTML fixture for offline replay."""
+    from .replay import DEFAULT_FIXTURE_DIR, capture_fixture
+
+    async def do_capture() -> Path:
+        async with DraftKingsClient(headless=headless, request_filter=RequestFilter()) as client:
+            return await capture_fixture(client, out or DEFAULT_FIXTURE_DIR)
+
+    path = asyncio.run(do_capture())
+    console.print(f"[green]Saved fixture to {path}[/green]")
+
+
+@main.command()
+@click.argument(
+    "fixtures",
+    nargs=-1,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.option(
+    "--strategy", "-s",
+    type=click.Choice(list(PARSE_STRATEGIES)),
+    multiple=True,
+    help="Parse strategy to time (default: all)"
+)
+@click.option(
+    "--repeat", "-r",
+    type=int,
+    default=5,
+    help="Runs per strategy (default: 5)"
+)
+@click.option(
+    "--format", "-f",
+    type=click.Choice(["table", "json"]),
+    default="table",
+    help="Output format"
+)
+def bench(fixtures: tuple, strategy: tuple, repeat: int, format: str):
+    """Benchmark parser strategies against saved HTML fixtures.
+
+    Uses every fixture in ~/.dk_cli/fixtures when none are given.
+    """
+    import json
+    from rich.table import Table
+    from .replay import benchmark_fixture, list_fixtures
+
+    paths = list(fixtures) or list_fixtures()
+    if not paths:
+        console.print("[yellow]No fixtures found.[/yellow]")
+        console.print("Run 'dk capture' to save one.")
+        return
+
+    async def do_bench():
+        results = []
+        async with DraftKingsClient() as client:
+            for path in paths:
+                results.extend(
+                    await benchmark_fixture(client, path, strategy or PARSE_STRATEGIES, repeat)
+                )
+        return results
+
+    results = asyncio.run(do_bench())
+
+    if format == "json":
+        console.print(json.dumps([r.to_dict() for r in results], indent=2))
+        return
+
+    table = Table(title="Parser benchmark")
+    table.add_column("Fixture")
+    table.add_column("Strategy")
+    table.add_column("Games", justify="right")
+    table.add_column("Slate (ms)", justify="right")
+    table.add_column("Best (ms)", justify="right")
+    table.add_column("Per game (ms)", justify="right")
+
+    for r in results:
+        table.add_row(
+            r.fixture,
+            r.strategy,
+            str(r.games),
+            f"{r.median_ms:.2f}",
+            f"{r.best_ms:.2f}",
+            f"{r.per_game_ms:.2f}",
+        )
+
+    console.print(table)
+
+
 @main.command()
 def install_browser():
     """Install Playwright browser (required before first use)."""
@@ -259,6 +518,16 @@ def install_browser():
     is_flag=True,
     help="Don't save fetched data to database"
 )
+@click.option(
+    "--adaptive/--fixed-interval",
+    default=None,
+    help="Adapt the poll interval to kickoffs and line movement"
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Keep one page open and push line changes as they happen"
+)
 @click.option(
     "--reload",
     is_flag=True,
@@ -271,6 +540,8 @@ def serve(
     config: Optional[Path],
     headless: Optional[bool],
     no_save: bool,
+    adaptive: Optional[bool],
+    stream: bool,
     reload: bool
 ):
     """Start the API server with WebSocket support.
@@ -302,13 +573,23 @@ def serve(
         cfg.headless = headless
     if no_save:
         cfg.save_to_db = False
+    if adaptive is not None:
+        cfg.adaptive_polling = adaptive
+    if stream:
+        cfg.streaming = True
 
     console.print("[cyan]Starting DraftKings API Server[/cyan]")
     console.print(f"  Host: {cfg.host}")
     console.print(f"  Port: {cfg.port}")
     console.print(f"  Poll interval: {cfg.poll_interval}s")
+    if cfg.adaptive_polling:
+        console.print(
+            f"  Adaptive polling: {cfg.min_poll_interval}s - {cfg.max_poll_interval}s"
+        )
     console.print(f"  Headless: {cfg.headless}")
     console.print(f"  Save to DB: {cfg.save_to_db}")
+    console.print(f"  Browser pool: {cfg.browser_pool_size}")
+    console.print(f"  Streaming: {cfg.streaming}")
     console.print()
     console.print(f"[green]API docs: http://{cfg.host}:{cfg.port}/docs[/green]")
     console.print(f"[green]WebSocket: ws://{cfg.host}:{cfg.port}/ws[/green]")
@@ -323,7 +604,9 @@ def serve(
         host=cfg.host,
         port=cfg.port,
         reload=reload,
-        log_level=cfg.log_level
+        log_level=cfg.log_level,
+        # permessage-deflate, for clients that offer it in the handshake
+        ws_per_message_deflate=cfg.ws_compression,
     )
 
 
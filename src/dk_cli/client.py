@@ -1,56 +1,426 @@
 import asyncio
+import os
 import re
+import time
 from datetime import datetime, timedelta
-from typing import List, Optional
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
 
-from playwright.async_api import async_playwright, Browser, Page
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 
+from .feeds import FeedCapture
+from .metrics import FetchMetrics
 from .models import NFLGame, Team, BettingLines, MoneyLine, Spread, Total
+from .request_filter import RequestFilter, RequestStats
 
 
 NFL_URL = "https://sportsbook.draftkings.com/leagues/football/nfl"
 
+# League pages that fetch_leagues knows by name. Only game-line pages: the
+# parsers read spread/total/moneyline cards, so alternate-line and prop
+# pages would come back as mislabeled main lines.
+LEAGUE_URLS = {
+    "nfl": NFL_URL,
+    "ncaaf": "https://sportsbook.draftkings.com/leagues/football/ncaaf",
+}
+
+# Extraction modes for game cards:
+# - "evaluate": one page.evaluate call returns every card as plain data
+# - "elements": walk ElementHandles, one round trip per selector/text read
+EXTRACTION_MODES = ("evaluate", "elements")
+
+# Ingestion engines:
+# - "dom": wait for the page to render, then parse game cards
+# - "network": decode the page's own JSON feeds, falling back to "dom"
+INGESTION_MODES = ("dom", "network")
+
+# Reads one card's labels, scoreboard, buttons and time text. Shared by the
+# one-shot extraction and the streaming observer; output feeds _parse_card_data.
+_EXTRACT_CARD_FN = """
+(card) => {
+    const text = (root, selector) => {
+        const el = root.querySelector(selector);
+        return el ? el.innerText : "";
+    };
+
+    let labels = card.querySelectorAll("[class*='cb-market__label-inner--parlay']");
+    if (labels.length < 2) {
+        labels = card.querySelectorAll("[class*='cb-market__label-inner']");
+    }
+
+    return {
+        labels: Array.from(labels).slice(0, 2).map((el) => el.innerText),
+        score_count: card.querySelectorAll("[class*='cb-market__scoreboard-team-score']").length,
+        buttons: Array.from(card.querySelectorAll("[class*='cb-market__button']")).map((btn) => ({
+            points: text(btn, "[class*='button-points']"),
+            odds: text(btn, "[class*='button-odds']"),
+            title: text(btn, "[class*='button-title']"),
+        })),
+        time_text: text(card, "[class*='event-start-time'], [class*='event-cell__start-time'], [class*='cb-market__time'], [class*='event-time']"),
+    };
+}
+"""
+
+# Collects every card on the page in a single round trip
+EXTRACT_CARDS_JS = """
+() => {
+    const extractCard = __EXTRACT_CARD__;
+
+    let cards = document.querySelectorAll("[class*='cb-static-parlay__content']");
+    if (!cards.length) {
+        cards = document.querySelectorAll("[class*='parlay-card-10']");
+    }
+
+    return Array.from(cards).map(extractCard);
+}
+""".replace("__EXTRACT_CARD__", _EXTRACT_CARD_FN.strip())
+
+# Watches odds buttons and reports re-extracted cards through the
+# __dkLinesChanged binding, batching mutations for debounceMs
+OBSERVE_CARDS_JS = """
+(debounceMs) => {
+    const extractCard = __EXTRACT_CARD__;
+    const cardSelector = "[class*='cb-static-parlay__content'], [class*='parlay-card-10']";
+
+    let pending = new Set();
+    let timer = null;
+
+    const flush = () => {
+        timer = null;
+        const cards = Array.from(pending).filter((card) => card.isConnected).map(extractCard);
+        pending = new Set();
+        if (cards.length) {
+            window.__dkLinesChanged(cards);
+        }
+    };
+
+    const observer = new MutationObserver((mutations) => {
+        for (const mutation of mutations) {
+            const node = mutation.target.nodeType === Node.TEXT_NODE
+                ? mutation.target.parentElement
+                : mutation.target;
+            const button = node && node.closest("[class*='cb-market__button']");
+            const card = button && button.closest(cardSelector);
+            if (card) {
+                pending.add(card);
+            }
+        }
+        if (pending.size && !timer) {
+            timer = setTimeout(flush, debounceMs);
+        }
+    });
+
+    observer.observe(document.body, {
+        subtree: true,
+        childList: true,
+        characterData: true,
+        attributes: true,
+        attributeFilter: ["class", "aria-label"],
+    });
+    window.__dkLineObserver = observer;
+}
+""".replace("__EXTRACT_CARD__", _EXTRACT_CARD_FN.strip())
+
+# Parser strategies that can be run against a loaded page (see parse_page)
+PARSE_STRATEGIES = ("evaluate", "elements", "game-card", "table")
+
+CONTENT_SELECTOR = "[class*='sportsbook-table'], [class*='parlay-card'], [class*='event-cell']"
+
+SCRIPT_TAG_PATTERN = re.compile(r"<script\b[^>]*>.*?</script>", re.IGNORECASE | re.DOTALL)
+
+GamesCallback = Callable[[List[NFLGame]], Awaitable[None]]
+
 
 class DraftKingsClient:
-    def __init__(self, headless: bool = True):
+    def __init__(
+        self,
+        headless: bool = True,
+        extraction: str = "evaluate",
+        ingestion: str = "dom",
+        feed_timeout: float = 15.0,
+        request_filter: Optional[RequestFilter] = None,
+        user_data_dir: Optional[Path] = None,
+        storage_state_path: Optional[Path] = None,
+    ):
+        if extraction not in EXTRACTION_MODES:
+            raise ValueError(f"Unknown extraction mode: {extraction}")
+        if ingestion not in INGESTION_MODES:
+            raise ValueError(f"Unknown ingestion mode: {ingestion}")
+
         self.headless = headless
+        self.extraction = extraction
+        self.ingestion = ingestion
+        self.feed_timeout = feed_timeout
+        self.request_filter = request_filter
+        self.last_request_stats: Optional[RequestStats] = None
+        # One entry per page loaded by the most recent fetch
+        self.last_fetch_metrics: List[FetchMetrics] = []
+        self.launch_seconds: Optional[float] = None
+        # Persistent profile: disk cache, cookies and service workers survive
+        # across runs. Storage state: only cookies/localStorage do. Live pages
+        # must not use page.route, which turns the HTTP cache off.
+        self.user_data_dir = Path(user_data_dir) if user_data_dir else None
+        self.storage_state_path = Path(storage_state_path) if storage_state_path else None
         self._browser: Optional[Browser] = None
+        self._context: Optional[BrowserContext] = None
+        self._context_closed = False
         self._playwright = None
 
     async def __aenter__(self):
+        start = time.perf_counter()
         self._playwright = await async_playwright().start()
-        self._browser = await self._playwright.chromium.launch(headless=self.headless)
+
+        if self.user_data_dir:
+            self.user_data_dir.mkdir(parents=True, exist_ok=True)
+            self._context = await self._playwright.chromium.launch_persistent_context(
+                str(self.user_data_dir), headless=self.headless
+            )
+            self._browser = self._context.browser
+        else:
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            if self.storage_state_path:
+                state = self.storage_state_path if self.storage_state_path.exists() else None
+                self._context = await self._browser.new_context(storage_state=state)
+
+        if self._context:
+            self._context_closed = False
+            self._context.on("close", self._on_context_close)
+
+        self.launch_seconds = time.perf_counter() - start
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._context and not self._context_closed:
+            if self.storage_state_path:
+                try:
+                    self.storage_state_path.parent.mkdir(parents=True, exist_ok=True)
+                    await self._context.storage_state(path=str(self.storage_state_path))
+                except Exception as e:
+                    print(f"Warning: Failed to save storage state: {e}")
+            await self._context.close()
         if self._browser:
             await self._browser.close()
         if self._playwright:
             await self._playwright.stop()
+        self._context = None
+        self._browser = None
+        self._playwright = None
+
+    def _on_context_close(self, context) -> None:
+        self._context_closed = True
+
+    def is_healthy(self) -> bool:
+        """Check whether the underlying browser is still connected."""
+        if self._context and self.user_data_dir:
+            return not self._context_closed
+        return self._browser is not None and self._browser.is_connected()
+
+    async def _new_page(self) -> Page:
+        """Open a page in the shared context, or in a fresh one without it."""
+        if self._context:
+            return await self._context.new_page()
+        if self._browser:
+            return await self._browser.new_page()
+        raise RuntimeError("Client not initialized. Use 'async with' context manager.")
+
+    async def memory_usage_mb(self) -> Optional[float]:
+        """Resident memory of all Chromium processes, in MB.
+
+        Reads process IDs over CDP and sums their RSS from /proc, so this
+        only works on Linux. Returns None when the figure is unavailable.
+        """
+        if not self.is_healthy() or not self._browser:
+            return None
+
+        try:
+            session = await self._browser.new_browser_cdp_session()
+            try:
+                info = await session.send("SystemInfo.getProcessInfo")
+            finally:
+                await session.detach()
+        except Exception:
+            return None
+
+        page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+        total_bytes = 0
+        for process in info.get("processInfo", []):
+            try:
+                with open(f"/proc/{process['id']}/statm") as f:
+                    total_bytes += int(f.read().split()[1]) * page_size
+            except (OSError, KeyError, ValueError, IndexError):
+                continue
+
+        return total_bytes / (1024 * 1024) if total_bytes else None
 
     async def fetch_nfl_games(self) -> List[NFLGame]:
         """Fetch all NFL games with betting lines from DraftKings."""
-        if not self._browser:
-            raise RuntimeError("Client not initialized. Use 'async with' context manager.")
+        games, metrics = await self._fetch_url(NFL_URL)
+        self.last_fetch_metrics = [metrics]
+        self.last_request_stats = metrics.request_stats
+        return games
 
-        page = await self._browser.new_page()
+    async def fetch_leagues(
+        self,
+        leagues: Iterable[str] = ("nfl",),
+        max_concurrency: int = 3,
+    ) -> Dict[str, List[NFLGame]]:
+        """Fetch several leagues concurrently on this browser.
+
+        Each entry is a LEAGUE_URLS key or the URL of a game-lines page. At most
+        ``max_concurrency`` pages are open at once. Returns games keyed by
+        the requested league; a league that fails is logged and omitted.
+        """
+        leagues = list(dict.fromkeys(leagues))
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def fetch_one(league: str):
+            async with semaphore:
+                return await self._fetch_url(LEAGUE_URLS.get(league, league))
+
+        results = await asyncio.gather(
+            *(fetch_one(league) for league in leagues), return_exceptions=True
+        )
+
+        games_by_league: Dict[str, List[NFLGame]] = {}
+        fetch_metrics = []
+        for league, result in zip(leagues, results):
+            if isinstance(result, BaseException):
+                print(f"Warning: Failed to fetch {league}: {result}")
+                continue
+            games_by_league[league], metrics = result
+            fetch_metrics.append(metrics)
+
+        stats = [m.request_stats for m in fetch_metrics if m.request_stats]
+        self.last_fetch_metrics = fetch_metrics
+        self.last_request_stats = RequestStats.combine(stats) if stats else None
+        return games_by_league
+
+    async def _fetch_url(self, url: str) -> Tuple[List[NFLGame], FetchMetrics]:
+        """Load one sportsbook page and parse its games.
+
+        Returns the games and a FetchMetrics with per-phase timings.
+        """
+        metrics = FetchMetrics(url=url)
+        with metrics.phase("new_page"):
+            page = await self._new_page()
+        capture = None
         try:
-            # Use 'load' instead of 'networkidle' - DK has constant websocket activity
-            await page.goto(NFL_URL, wait_until="load", timeout=60000)
+            if self.request_filter:
+                metrics.request_stats = await self.request_filter.install(page)
+
+            # Feed decoding only knows the NFL event group
+            if self.ingestion == "network" and url == NFL_URL:
+                capture = FeedCapture(self._abbreviate)
+                page.on("response", capture.on_response)
+
+                # Feeds start arriving long before 'load'; only wait for navigation
+                with metrics.phase("goto"):
+                    await page.goto(url, wait_until="commit", timeout=60000)
+                with metrics.phase("feed_wait"):
+                    games = await capture.wait_for_games(self.feed_timeout)
+                if games:
+                    metrics.source = "feed"
+                    metrics.games = len(games)
+                    return games, metrics
+
+                # No feed payload seen - fall back to the rendered DOM
+                with metrics.phase("goto"):
+                    await page.wait_for_load_state("load", timeout=60000)
+            else:
+                # Use 'load' instead of 'networkidle' - DK has constant websocket activity
+                with metrics.phase("goto"):
+                    await page.goto(url, wait_until="load", timeout=60000)
 
-            # Wait for betting content to appear
-            try:
-                await page.wait_for_selector("[class*='sportsbook-table'], [class*='parlay-card'], [class*='event-cell']", timeout=20000)
-            except:
-                # If no betting tables, page might still have data in other format
+            await self._wait_for_content(page, metrics)
+
+            with metrics.phase("parse"):
+                games = await self._parse_games(page, metrics)
+            metrics.source = "dom"
+            metrics.games = len(games)
+            return games, metrics
+        finally:
+            if capture:
+                capture.close()
+            await page.close()
+
+    async def _wait_for_content(
+        self, page: Page, metrics: Optional[FetchMetrics] = None
+    ) -> None:
+        """Wait for betting content to appear."""
+        metrics = metrics or FetchMetrics()
+        try:
+            with metrics.phase("wait_for_selector"):
+                await page.wait_for_selector(CONTENT_SELECTOR, timeout=20000)
+            metrics.selector_fallback = "content-selector"
+        except:
+            # If no betting tables, page might still have data in other format
+            metrics.selector_fallback = "sleep"
+            with metrics.phase("fallback_sleep"):
                 await asyncio.sleep(3)
 
-            games = await self._parse_games(page)
-            return games
+    async def capture_html(self) -> str:
+        """Load the NFL page and return its rendered HTML for offline replay."""
+        page = await self._new_page()
+        try:
+            if self.request_filter:
+                await self.request_filter.install(page)
+            await page.goto(NFL_URL, wait_until="load", timeout=60000)
+            await self._wait_for_content(page)
+            return await page.content()
         finally:
             await page.close()
 
-    async def _parse_games(self, page: Page) -> List[NFLGame]:
+    async def load_html(self, html: str) -> Page:
+        """Open a page from saved HTML with scripts stripped and network cut off.
+
+        The caller owns the returned page and must close it.
+        """
+        async def abort(route):
+            await route.abort()
+
+        page = await self._new_page()
+        await page.route("**/*", abort)
+        await page.set_content(SCRIPT_TAG_PATTERN.sub("", html), wait_until="domcontentloaded")
+        return page
+
+    async def parse_page(self, page: Page, strategy: str = "evaluate") -> List[NFLGame]:
+        """Parse a loaded page with one of PARSE_STRATEGIES."""
+        if strategy in ("evaluate", "elements"):
+            return await self._parse_from_page_data(page, extraction=strategy)
+
+        if strategy == "game-card":
+            games = []
+            cards = await page.query_selector_all("[class*='sportsbook-event-accordion__wrapper']")
+            for card in cards:
+                try:
+                    game = await self._parse_game_card(card)
+                    if game:
+                        games.append(game)
+                except Exception as e:
+                    print(f"Warning: Failed to parse game card: {e}")
+            return games
+
+        if strategy == "table":
+            return await self._parse_from_table(page)
+
+        raise ValueError(f"Unknown parse strategy: {strategy}")
+
+    def stream(
+        self,
+        on_snapshot: GamesCallback,
+        on_change: GamesCallback,
+        debounce_ms: int = 250,
+        resync_interval: float = 300.0,
+    ) -> "LineStream":
+        """Create a LineStream that keeps one page open on this browser."""
+        return LineStream(
+            self, on_snapshot, on_change,
+            debounce_ms=debounce_ms, resync_interval=resync_interval,
+        )
+
+    async def _parse_games(
+        self, page: Page, metrics: Optional[FetchMetrics] = None
+    ) -> List[NFLGame]:
         """Parse game data from the page."""
         games = []
 
@@ -63,12 +433,20 @@ class DraftKingsClient:
 
         # DraftKings displays games in pairs (away team row, home team row)
         # Let's get all the data from the page's JavaScript state instead
-        games = await self._parse_from_page_data(page)
+        games = await self._parse_from_page_data(page, metrics=metrics)
 
         return games
 
-    async def _parse_from_page_data(self, page: Page) -> List[NFLGame]:
+    async def _parse_from_page_data(
+        self,
+        page: Page,
+        extraction: Optional[str] = None,
+        metrics: Optional[FetchMetrics] = None,
+    ) -> List[NFLGame]:
         """Extract game data from page's embedded JSON or DOM structure."""
+        if (extraction or self.extraction) == "evaluate":
+            return self._parse_card_data_list(await page.evaluate(EXTRACT_CARDS_JS), metrics)
+
         games = []
 
         # DraftKings uses cb-* (component builder) classes
@@ -79,6 +457,9 @@ class DraftKingsClient:
             # Try alternative selectors
             game_cards = await page.query_selector_all("[class*='parlay-card-10']")
 
+        if metrics:
+            metrics.cards += len(game_cards)
+
         for card in game_cards:
             try:
                 game = await self._parse_cb_game_card(card)
@@ -86,12 +467,39 @@ class DraftKingsClient:
                     games.append(game)
             except Exception as e:
                 print(f"Warning: Failed to parse game card: {e}")
+                if metrics:
+                    metrics.parse_failures += 1
+                continue
+
+        return games
+
+    def _parse_card_data_list(
+        self, cards: List[dict], metrics: Optional[FetchMetrics] = None
+    ) -> List[NFLGame]:
+        """Parse the card structures returned by EXTRACT_CARDS_JS."""
+        if metrics:
+            metrics.cards += len(cards)
+
+        games = []
+        for data in cards:
+            try:
+                game = self._parse_card_data(data)
+                if game:
+                    games.append(game)
+            except Exception as e:
+                print(f"Warning: Failed to parse game card: {e}")
+                if metrics:
+                    metrics.parse_failures += 1
                 continue
 
         return games
 
     async def _parse_cb_game_card(self, card) -> Optional[NFLGame]:
-        """Parse a game card using DraftKings component builder structure."""
+        """Parse a game card using DraftKings component builder structure.
+
+        Reads the card element by element, which costs several Playwright
+        round trips per button. Kept for the "elements" extraction mode.
+        """
         # Get team names
         team_labels = await card.query_selector_all("[class*='cb-market__label-inner--parlay']")
         if len(team_labels) < 2:
@@ -100,19 +508,14 @@ class DraftKingsClient:
         if len(team_labels) < 2:
             return None
 
-        away_name = await team_labels[0].inner_text()
-        home_name = await team_labels[1].inner_text()
+        labels = [await label.inner_text() for label in team_labels[:2]]
 
         # Get scores if live
         scores = await card.query_selector_all("[class*='cb-market__scoreboard-team-score']")
-        status = "upcoming"
-        if len(scores) >= 2:
-            status = "live"
 
         # Get betting buttons (spread, total, moneyline)
         buttons = await card.query_selector_all("[class*='cb-market__button']")
 
-        betting_lines = BettingLines()
         odds_data = []
 
         for btn in buttons:
@@ -129,6 +532,44 @@ class DraftKingsClient:
             except:
                 continue
 
+        # Get game time/status
+        time_el = await card.query_selector("[class*='event-start-time'], [class*='event-cell__start-time'], [class*='cb-market__time'], [class*='event-time']")
+        time_text = ""
+
+        if time_el:
+            try:
+                time_text = await time_el.inner_text()
+            except:
+                pass
+
+        return self._parse_card_data({
+            "labels": labels,
+            "score_count": len(scores),
+            "buttons": odds_data,
+            "time_text": time_text,
+        })
+
+    def _parse_card_data(self, data: dict) -> Optional[NFLGame]:
+        """Build an NFLGame from a card's extracted text.
+
+        Expects the structure produced by EXTRACT_CARDS_JS: team labels,
+        scoreboard count, button points/odds/titles and the time text.
+        """
+        labels = data.get("labels") or []
+        if len(labels) < 2:
+            return None
+
+        away_name = labels[0]
+        home_name = labels[1]
+
+        # Scores are only rendered for live games
+        status = "upcoming"
+        if data.get("score_count", 0) >= 2:
+            status = "live"
+
+        betting_lines = BettingLines()
+        odds_data = data.get("buttons") or []
+
         # Parse odds data - 24 buttons per game card with this layout:
         # Button 0: Away Spread (points + odds)
         # Button 4: Over Total (points + odds, title='O')
@@ -157,18 +598,8 @@ class DraftKingsClient:
                 home=self._parse_american_odds(odds_data[21]["odds"]),
             )
 
-        # Get game time/status
-        time_el = await card.query_selector("[class*='event-start-time'], [class*='event-cell__start-time'], [class*='cb-market__time'], [class*='event-time']")
-        start_time = datetime.now()
-
-        if time_el:
-            try:
-                time_text = await time_el.inner_text()
-                parsed_time = self._parse_game_time(time_text)
-                if parsed_time:
-                    start_time = parsed_time
-            except:
-                pass
+        parsed_time = self._parse_game_time(data.get("time_text") or "")
+        start_time = parsed_time or datetime.now()
 
         game_id = f"{self._abbreviate(away_name)}_{self._abbreviate(home_name)}_{start_time.strftime('%Y%m%d')}"
 
@@ -179,6 +610,7 @@ class DraftKingsClient:
             start_time=start_time,
             status=status,
             betting_lines=betting_lines,
+            start_time_known=parsed_time is not None,
         )
 
     def _parse_float(self, text: str) -> Optional[float]:
@@ -326,7 +758,7 @@ class DraftKingsClient:
 
         # Get game time
         time_element = await card.query_selector("[class*='event-cell__time'], [class*='event-start-time']")
-        start_time = datetime.now()
+        parsed_time = None
         status = "upcoming"
 
         if time_element:
@@ -337,8 +769,7 @@ class DraftKingsClient:
                 status = "final"
             else:
                 parsed_time = self._parse_game_time(time_text)
-                if parsed_time:
-                    start_time = parsed_time
+        start_time = parsed_time or datetime.now()
 
         # Generate game ID from team names
         game_id = f"{self._abbreviate(away_name)}_{self._abbreviate(home_name)}_{start_time.strftime('%Y%m%d')}"
@@ -350,6 +781,7 @@ class DraftKingsClient:
             start_time=start_time,
             status=status,
             betting_lines=betting_lines,
+            start_time_known=parsed_time is not None,
         )
 
     async def _parse_from_table(self, page: Page) -> List[NFLGame]:
@@ -381,7 +813,7 @@ class DraftKingsClient:
                 betting_lines = await self._parse_row_odds(away_odds, home_odds)
 
                 # Get game time
-                start_time = datetime.now()
+                parsed_time = None
                 status = "upcoming"
                 time_el = await away_row.query_selector("[class*='event-cell__time'], [class*='event-start-time']")
                 if time_el:
@@ -392,8 +824,7 @@ class DraftKingsClient:
                         status = "final"
                     else:
                         parsed_time = self._parse_game_time(time_text)
-                        if parsed_time:
-                            start_time = parsed_time
+                start_time = parsed_time or datetime.now()
 
                 game_id = f"{self._abbreviate(away_name)}_{self._abbreviate(home_name)}_{start_time.strftime('%Y%m%d')}"
 
@@ -404,6 +835,7 @@ class DraftKingsClient:
                     start_time=start_time,
                     status=status,
                     betting_lines=betting_lines,
+                    start_time_known=parsed_time is not None,
                 ))
             except Exception as e:
                 print(f"Warning: Failed to parse row pair: {e}")
@@ -599,6 +1031,95 @@ class DraftKingsClient:
         return team_name[:3] if team_name else "UNK"
 
 
+class LineStream:
+    """Keeps the NFL page resident and pushes line changes as they render.
+
+    A MutationObserver on the odds buttons sends re-extracted cards back
+    through ``expose_binding``; those reach ``on_change`` as the changed
+    games only. ``on_snapshot`` receives the full slate on start and on
+    every resync, which catches added/removed cards the observer misses.
+    """
+
+    def __init__(
+        self,
+        client: DraftKingsClient,
+        on_snapshot: GamesCallback,
+        on_change: GamesCallback,
+        debounce_ms: int = 250,
+        resync_interval: float = 300.0,
+    ):
+        self.client = client
+        self.on_snapshot = on_snapshot
+        self.on_change = on_change
+        self.debounce_ms = debounce_ms
+        self.resync_interval = resync_interval
+        self.change_events = 0
+        self._wake = asyncio.Event()
+        self._stopped = False
+
+    async def run(self) -> None:
+        """Stream until stop() is called or the page goes away."""
+        page = await self.client._new_page()
+        try:
+            if self.client.request_filter:
+                await self.client.request_filter.install(page)
+
+            await page.expose_binding("__dkLinesChanged", self._handle_change)
+            await page.goto(NFL_URL, wait_until="load", timeout=60000)
+            await page.wait_for_selector(
+                "[class*='cb-static-parlay__content'], [class*='parlay-card-10']",
+                timeout=20000,
+            )
+
+            await self._snapshot(page)
+            await page.evaluate(OBSERVE_CARDS_JS, self.debounce_ms)
+
+            while not self._stopped:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.resync_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+
+                if self._stopped:
+                    break
+                if page.is_closed():
+                    raise RuntimeError("Streaming page closed unexpectedly")
+
+                await self._snapshot(page)
+        finally:
+            if not page.is_closed():
+                await page.close()
+
+    def resync(self) -> None:
+        """Re-read the full slate from the open page."""
+        self._wake.set()
+
+    def stop(self) -> None:
+        self._stopped = True
+        self._wake.set()
+
+    async def _snapshot(self, page: Page) -> None:
+        games = self.client._parse_card_data_list(await page.evaluate(EXTRACT_CARDS_JS))
+        if games:
+            await self.on_snapshot(games)
+
+    async def _handle_change(self, source, cards: List[dict]) -> None:
+        games = self.client._parse_card_data_list(cards)
+        if games:
+            self.change_events += 1
+            await self.on_change(games)
+
+
+def merge_league_games(games_by_league: Dict[str, List[NFLGame]]) -> List[NFLGame]:
+    """Flatten fetch_leagues output, keeping the first game seen per game_id."""
+    merged: Dict[str, NFLGame] = {}
+    for games in games_by_league.values():
+        for game in games:
+            merged.setdefault(game.game_id, game)
+    return list(merged.values())
+
+
 async def fetch_nfl_games(headless: bool = True) -> List[NFLGame]:
     """Convenience function to fetch NFL games."""
     async with DraftKingsClient(headless=headless) as client:
@@ -1,9 +1,12 @@
 """Configuration management for DraftKings CLI server."""
 
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+
+from .request_filter import RequestFilter
+from .retention import RetentionPolicy
 
 if sys.version_info >= (3, 11):
     import tomllib
@@ -21,9 +24,62 @@ class ServerConfig:
     host: str = "127.0.0.1"
     port: int = 8000
     poll_interval: int = 60
+    adaptive_polling: bool = True
+    min_poll_interval: int = 15
+    max_poll_interval: int = 900
     headless: bool = True
     save_to_db: bool = True
     log_level: str = "info"
+    streaming: bool = False
+    leagues: List[str] = field(default_factory=lambda: ["nfl"])
+    max_concurrent_pages: int = 3
+    delta_updates: bool = True
+    ws_queue_size: int = 64
+    ws_compression: bool = True
+    browser_pool_size: int = 1
+    browser_max_uses: int = 50
+    browser_max_memory_mb: Optional[int] = 1024
+    extraction: str = "evaluate"
+    ingestion: str = "dom"
+    block_resources: bool = True
+    blocked_resource_types: Optional[List[str]] = None
+    blocked_url_patterns: Optional[List[str]] = None
+    allowed_url_patterns: List[str] = field(default_factory=list)
+    profile_dir: Optional[Path] = None
+    storage_state: Optional[Path] = None
+    # Off by default: retention deletes raw history for good
+    retention_enabled: bool = False
+    retention_raw_days: int = 7
+    retention_minute_days: int = 30
+    retention_archive_days: Optional[int] = 365
+    maintenance_interval: int = 3600
+
+    def client_options(self) -> dict:
+        """Keyword arguments for constructing a DraftKingsClient."""
+        request_filter = None
+        if self.block_resources:
+            request_filter = RequestFilter(
+                blocked_resource_types=self.blocked_resource_types,
+                blocked_url_patterns=self.blocked_url_patterns,
+                allowed_url_patterns=self.allowed_url_patterns,
+            )
+
+        return {
+            "headless": self.headless,
+            "extraction": self.extraction,
+            "ingestion": self.ingestion,
+            "request_filter": request_filter,
+            "user_data_dir": self.profile_dir,
+            "storage_state_path": self.storage_state,
+        }
+
+    def retention_policy(self) -> RetentionPolicy:
+        """RetentionPolicy for the history database maintenance job."""
+        return RetentionPolicy(
+            raw_days=self.retention_raw_days,
+            minute_days=self.retention_minute_days,
+            archive_days=self.retention_archive_days,
+        )
 
 
 DEFAULT_CONFIG_PATHS = [
@@ -61,12 +117,70 @@ def load_config(config_path: Optional[Path] = None) -> ServerConfig:
                     config.port = server_data["port"]
                 if "poll_interval" in server_data:
                     config.poll_interval = server_data["poll_interval"]
+                if "adaptive_polling" in server_data:
+                    config.adaptive_polling = server_data["adaptive_polling"]
+                if "min_poll_interval" in server_data:
+                    config.min_poll_interval = server_data["min_poll_interval"]
+                if "max_poll_interval" in server_data:
+                    config.max_poll_interval = server_data["max_poll_interval"]
                 if "headless" in server_data:
                     config.headless = server_data["headless"]
                 if "save_to_db" in server_data:
                     config.save_to_db = server_data["save_to_db"]
                 if "log_level" in server_data:
                     config.log_level = server_data["log_level"]
+                if "streaming" in server_data:
+                    config.streaming = server_data["streaming"]
+                if "leagues" in server_data:
+                    config.leagues = server_data["leagues"]
+                if "max_concurrent_pages" in server_data:
+                    config.max_concurrent_pages = server_data["max_concurrent_pages"]
+                if "delta_updates" in server_data:
+                    config.delta_updates = server_data["delta_updates"]
+                if "ws_queue_size" in server_data:
+                    config.ws_queue_size = server_data["ws_queue_size"]
+                if "ws_compression" in server_data:
+                    config.ws_compression = server_data["ws_compression"]
+
+                browser_data = data.get("browser", {})
+
+                if "pool_size" in browser_data:
+                    config.browser_pool_size = browser_data["pool_size"]
+                if "max_uses" in browser_data:
+                    config.browser_max_uses = browser_data["max_uses"]
+                if "max_memory_mb" in browser_data:
+                    config.browser_max_memory_mb = browser_data["max_memory_mb"]
+                if "extraction" in browser_data:
+                    config.extraction = browser_data["extraction"]
+                if "ingestion" in browser_data:
+                    config.ingestion = browser_data["ingestion"]
+                if "block_resources" in browser_data:
+                    config.block_resources = browser_data["block_resources"]
+                if "blocked_resource_types" in browser_data:
+                    config.blocked_resource_types = browser_data["blocked_resource_types"]
+                if "blocked_url_patterns" in browser_data:
+                    config.blocked_url_patterns = browser_data["blocked_url_patterns"]
+                if "allowed_url_patterns" in browser_data:
+                    config.allowed_url_patterns = browser_data["allowed_url_patterns"]
+                if "profile_dir" in browser_data:
+                    config.profile_dir = Path(browser_data["profile_dir"]).expanduser()
+                if "storage_state" in browser_data:
+                    config.storage_state = Path(browser_data["storage_state"]).expanduser()
+
+                retention_data = data.get("retention", {})
+
+                if "enabled" in retention_data:
+                    config.retention_enabled = retention_data["enabled"]
+                if "raw_days" in retention_data:
+                    config.retention_raw_days = retention_data["raw_days"]
+                if "minute_days" in retention_data:
+                    config.retention_minute_days = retention_data["minute_days"]
+                if "archive_days" in retention_data:
+                    # 0 or a negative value keeps hourly rollups in the main database
+                    archive_days = retention_data["archive_days"]
+                    config.retention_archive_days = archive_days if archive_days > 0 else None
+                if "interval" in retention_data:
+                    config.maintenance_interval = retention_data["interval"]
             break
 
     return config
@@ -1,25 +1,411 @@
+import asyncio
+import base64
+import functools
+import hashlib
+import json
+import queue
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+from .betting import determine_bet_result
 from .models import (
     NFLGame, Team, BettingLines, MoneyLine, Spread, Total, Bet, Bankroll
 )
+from .retention import (
+    ROLLUP_SERIES, Candle, RetentionPolicy, RetentionReport, candles_to_history, fold_candles
+)
+from .timestamps import from_epoch_ms, iso_to_epoch_ms, to_epoch_ms
 
 
 DEFAULT_DB_PATH = Path.home() / ".dk_cli" / "history.db"
 
+# Tables iter_rows can read. The rollup tables have no integer id and are
+# always read in full; betting_lines_archive is the archive database's
+# hour rollups.
+EXPORT_TABLES = (
+    "games", "betting_lines", "bets", "betting_lines_rollup", "betting_lines_archive",
+)
+
+ROLLUP_TABLES = ("betting_lines_rollup", "betting_lines_archive")
+
+# Snapshot tables whose newest rows get last_seen_at moved in place
+SEEN_TABLES = ("games", "betting_lines")
+
+# Per-connection settings. WAL lets readers run alongside the poller's
+# writes; synchronous=NORMAL is durable across crashes in WAL mode.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA temp_store = MEMORY",
+)
+
+# OHLC rollups of betting_lines, one row per game, resolution, bucket and
+# series. NUMERIC keeps integer odds as integers. Also created in the archive.
+_ROLLUP_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {schema}betting_lines_rollup{suffix} (
+        game_id TEXT NOT NULL,
+        resolution TEXT NOT NULL,
+        bucket_start INTEGER NOT NULL,
+        series TEXT NOT NULL,
+        open NUMERIC,
+        high NUMERIC,
+        low NUMERIC,
+        close NUMERIC,
+        samples INTEGER NOT NULL,
+        last_seen_at INTEGER NOT NULL,
+        PRIMARY KEY (game_id, resolution, bucket_start, series)
+    ) WITHOUT ROWID
+"""
+
+# Rebuilds a TEXT-timestamp rollup table with epoch ms; the archive
+# database is converted with the same statements
+_CONVERT_ROLLUP_SQL = (
+    _ROLLUP_TABLE_SQL.format(schema="", suffix="_new"),
+    """
+    INSERT INTO betting_lines_rollup_new
+    SELECT game_id, resolution, iso_ms(bucket_start), series,
+           open, high, low, close, samples, iso_ms(last_seen_at)
+    FROM betting_lines_rollup
+    """,
+    "DROP TABLE betting_lines_rollup",
+    "ALTER TABLE betting_lines_rollup_new RENAME TO betting_lines_rollup",
+)
+
+# user_version of an archive database whose timestamps are epoch ms
+_ARCHIVE_VERSION = 1
+
+_UPSERT_ROLLUP_SQL = """
+    INSERT INTO betting_lines_rollup
+    (game_id, resolution, bucket_start, series, open, high, low, close, samples, last_seen_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (game_id, resolution, bucket_start, series) DO UPDATE SET
+        high = MAX(high, excluded.high),
+        low = MIN(low, excluded.low),
+        close = excluded.close,
+        samples = samples + excluded.samples,
+        last_seen_at = MAX(last_seen_at, excluded.last_seen_at)
+"""
+
+# Schema changes on top of the base tables in _init_db, applied in order and
+# tracked with PRAGMA user_version. Append new migrations; never edit old ones.
+_MIGRATIONS: Tuple[Tuple[str, ...], ...] = (
+    # 1: change-only snapshots. A row is stored when a game's lines change;
+    # last_seen_at is bumped on each unchanged fetch.
+    (
+        "ALTER TABLE games ADD COLUMN line_hash TEXT",
+        "ALTER TABLE games ADD COLUMN last_seen_at TEXT",
+        "ALTER TABLE betting_lines ADD COLUMN line_hash TEXT",
+        "ALTER TABLE betting_lines ADD COLUMN last_seen_at TEXT",
+        "UPDATE games SET last_seen_at = fetched_at",
+        "UPDATE betting_lines SET last_seen_at = fetched_at",
+    ),
+    # 2: minute/hour rollup tier for retention
+    (
+        _ROLLUP_TABLE_SQL.format(schema="", suffix=""),
+    ),
+    # 3: indexes that match the keyset-paginated queries. The UNIQUE
+    # (game_id, fetched_at) constraints already index both snapshot tables
+    # and bets(status, placed_at) covers status lookups, so the
+    # single-column indexes they prefix only cost writes.
+    (
+        "CREATE INDEX IF NOT EXISTS idx_bets_status_placed_at ON bets(status, placed_at)",
+        "CREATE INDEX IF NOT EXISTS idx_bets_placed_at ON bets(placed_at)",
+        "CREATE INDEX IF NOT EXISTS idx_games_last_seen_at ON games(last_seen_at)",
+        "DROP INDEX IF EXISTS idx_games_game_id",
+        "DROP INDEX IF EXISTS idx_betting_lines_game_id",
+        "DROP INDEX IF EXISTS idx_bets_status",
+    ),
+    # 4: append-only bankroll ledger; bankroll.balance stays the
+    # materialized running total. Existing balances become the opening entry.
+    (
+        """
+        CREATE TABLE IF NOT EXISTS bankroll_transactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            amount REAL NOT NULL,
+            balance_after REAL NOT NULL,
+            bet_id INTEGER,
+            created_at TEXT NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_bankroll_transactions_bet_id "
+        "ON bankroll_transactions(bet_id)",
+        """
+        INSERT INTO bankroll_transactions (kind, amount, balance_after, bet_id, created_at)
+        SELECT 'opening', balance, balance, NULL, updated_at FROM bankroll WHERE id = 1
+        """,
+    ),
+    # 5: timestamps become INTEGER epoch milliseconds (see timestamps.py).
+    # Column types cannot be altered, so each table is rebuilt; iso_ms is
+    # registered by _migrate. Integer keys make the (game_id, fetched_at),
+    # (status, placed_at) and rollup indexes a fraction of their TEXT size.
+    (
+        """
+        CREATE TABLE games_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            game_id TEXT NOT NULL,
+            home_team_name TEXT NOT NULL,
+            home_team_abbr TEXT NOT NULL,
+            away_team_name TEXT NOT NULL,
+            away_team_abbr TEXT NOT NULL,
+            start_time INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            fetched_at INTEGER NOT NULL,
+            line_hash TEXT,
+            last_seen_at INTEGER,
+            UNIQUE(game_id, fetched_at)
+        )
+        """,
+        """
+        INSERT INTO games_new
+        SELECT id, game_id, home_team_name, home_team_abbr, away_team_name, away_team_abbr,
+               iso_ms(start_time), status, iso_ms(fetched_at), line_hash, iso_ms(last_seen_at)
+        FROM games
+        """,
+        "DROP TABLE games",
+        "ALTER TABLE games_new RENAME TO games",
+        "CREATE INDEX idx_games_fetched_at ON games(fetched_at)",
+        "CREATE INDEX idx_games_last_seen_at ON games(last_seen_at)",
+        """
+        CREATE TABLE betting_lines_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            game_id TEXT NOT NULL,
+            fetched_at INTEGER NOT NULL,
+            ml_home INTEGER,
+            ml_away INTEGER,
+            spread_home_line REAL,
+            spread_home_odds INTEGER,
+            spread_away_line REAL,
+            spread_away_odds INTEGER,
+            total_over_line REAL,
+            total_over_odds INTEGER,
+            total_under_line REAL,
+            total_under_odds INTEGER,
+            line_hash TEXT,
+            last_seen_at INTEGER,
+            UNIQUE(game_id, fetched_at)
+        )
+        """,
+        """
+        INSERT INTO betting_lines_new
+        SELECT id, game_id, iso_ms(fetched_at), ml_home, ml_away,
+               spread_home_line, spread_home_odds, spread_away_line, spread_away_odds,
+               total_over_line, total_over_odds, total_under_line, total_under_odds,
+               line_hash, iso_ms(last_seen_at)
+        FROM betting_lines
+        """,
+        "DROP TABLE betting_lines",
+        "ALTER TABLE betting_lines_new RENAME TO betting_lines",
+        """
+        CREATE TABLE bets_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            game_id TEXT NOT NULL,
+            bet_type TEXT NOT NULL,
+            selection TEXT NOT NULL,
+            stake REAL NOT NULL,
+            odds INTEGER NOT NULL,
+            potential_payout REAL NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            result_amount REAL,
+            home_score INTEGER,
+            away_score INTEGER,
+            placed_at INTEGER NOT NULL,
+            settled_at INTEGER,
+            home_team_abbr TEXT NOT NULL,
+            away_team_abbr TEXT NOT NULL,
+            line_value REAL
+        )
+        """,
+        """
+        INSERT INTO bets_new
+        SELECT id, game_id, bet_type, selection, stake, odds, potential_payout,
+               status, result_amount, home_score, away_score,
+               iso_ms(placed_at), iso_ms(settled_at),
+               home_team_abbr, away_team_abbr, line_value
+        FROM bets
+        """,
+        "DROP TABLE bets",
+        "ALTER TABLE bets_new RENAME TO bets",
+        "CREATE INDEX idx_bets_game_id ON bets(game_id)",
+        "CREATE INDEX idx_bets_status_placed_at ON bets(status, placed_at)",
+        "CREATE INDEX idx_bets_placed_at ON bets(placed_at)",
+        """
+        CREATE TABLE bankroll_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            balance REAL NOT NULL DEFAULT 10000.00,
+            updated_at INTEGER NOT NULL
+        )
+        """,
+        "INSERT INTO bankroll_new SELECT id, balance, iso_ms(updated_at) FROM bankroll",
+        "DROP TABLE bankroll",
+        "ALTER TABLE bankroll_new RENAME TO bankroll",
+        """
+        CREATE TABLE bankroll_transactions_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            amount REAL NOT NULL,
+            balance_after REAL NOT NULL,
+            bet_id INTEGER,
+            created_at INTEGER NOT NULL
+        )
+        """,
+        """
+        INSERT INTO bankroll_transactions_new
+        SELECT id, kind, amount, balance_after, bet_id, iso_ms(created_at)
+        FROM bankroll_transactions
+        """,
+        "DROP TABLE bankroll_transactions",
+        "ALTER TABLE bankroll_transactions_new RENAME TO bankroll_transactions",
+        "CREATE INDEX idx_bankroll_transactions_bet_id ON bankroll_transactions(bet_id)",
+        *_CONVERT_ROLLUP_SQL,
+    ),
+    # 6: lets exports find betting_lines rows whose last_seen_at moved
+    (
+        "CREATE INDEX IF NOT EXISTS idx_betting_lines_last_seen_at "
+        "ON betting_lines(last_seen_at)",
+    ),
+)
+
+
+def encode_cursor(*values) -> str:
+    """Opaque pagination cursor for the sort key of the last row on a page."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """Inverse of encode_cursor. Raises ValueError for a malformed cursor.
+
+    Every sort key is an integer (an id or epoch ms), so anything else is
+    rejected too, including cursors issued before timestamps were integers.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor") from None
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or not all(type(value) is int for value in values)
+    ):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+class InsufficientFundsError(ValueError):
+    """The bankroll balance does not cover a bet's stake."""
+
+
+@dataclass
+class SaveReport:
+    """Outcome of Database.save_games.
+
+    ``inserted`` games had changed and got a new snapshot, ``unchanged``
+    games had their latest snapshot's last_seen_at bumped, and ``errors``
+    maps the game_id of each game that could not be saved to the reason.
+    """
+
+    inserted: int = 0
+    unchanged: int = 0
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def saved(self) -> int:
+        return self.inserted + self.unchanged
+
+    def to_dict(self) -> dict:
+        return {
+            "inserted": self.inserted,
+            "unchanged": self.unchanged,
+            "errors": dict(self.errors),
+        }
+
 
 class Database:
-    def __init__(self, db_path: Path = DEFAULT_DB_PATH):
+    """SQLite store for line history, bankroll and bets.
+
+    Keeps up to ``pool_size`` open connections for reuse, so one instance
+    should be shared for the life of the process (the server creates it
+    in the app lifespan). The schema is created once, on construction.
+    """
+
+    def __init__(
+        self,
+        db_path: Path = DEFAULT_DB_PATH,
+        pool_size: int = 4,
+        archive_path: Optional[Path] = None,
+    ):
         self.db_path = db_path
+        # Hourly rollups past the retention window live here
+        self.archive_path = archive_path or db_path.with_name(f"{db_path.stem}-archive.db")
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=pool_size)
+        self._closed = False
+        self._close_lock = threading.Lock()
         self._init_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        new_file = not self.db_path.exists() or self.db_path.stat().st_size == 0
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=30,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        if new_file:
+            # Has to come before WAL, which fixes auto_vacuum at NONE for a
+            # new file; incremental_vacuum converts databases created before
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection for one transaction.
+
+        Commits on success and rolls back on error, like ``with conn:``.
+        """
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+
+        try:
+            with conn:
+                yield conn
+        finally:
+            with self._close_lock:
+                returned = False
+                if not self._closed:
+                    try:
+                        self._pool.put_nowait(conn)
+                        returned = True
+                    except queue.Full:
+                        pass
+            if not returned:
+                conn.close()
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        with self._close_lock:
+            self._closed = True
+            while True:
+                try:
+                    self._pool.get_nowait().close()
+                except queue.Empty:
+                    break
+
     def _init_db(self) -> None:
         """Initialize database schema."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS games (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -54,18 +440,10 @@ class Database:
                 )
             """)
 
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_games_game_id ON games(game_id)
-            """)
-
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_games_fetched_at ON games(fetched_at)
             """)
 
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_betting_lines_game_id ON betting_lines(game_id)
-            """)
-
             # Bankroll table (single user)
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS bankroll (
@@ -101,75 +479,257 @@ class Database:
                 CREATE INDEX IF NOT EXISTS idx_bets_game_id ON bets(game_id)
             """)
 
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_bets_status ON bets(status)
-            """)
+            self._migrate(conn)
 
-    def save_games(self, games: List[NFLGame]) -> int:
-        """Save games to database. Returns number of games saved."""
-        saved = 0
-        with sqlite3.connect(self.db_path) as conn:
-            for game in games:
-                try:
-                    fetched_at = game.fetched_at.isoformat()
-
-                    conn.execute("""
-                        INSERT OR REPLACE INTO games
-                        (game_id, home_team_name, home_team_abbr, away_team_name, away_team_abbr,
-                         start_time, status, fetched_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        game.game_id,
-                        game.home_team.name,
-                        game.home_team.abbreviation,
-                        game.away_team.name,
-                        game.away_team.abbreviation,
-                        game.start_time.isoformat(),
-                        game.status,
-                        fetched_at,
-                    ))
-
-                    bl = game.betting_lines
-                    conn.execute("""
-                        INSERT OR REPLACE INTO betting_lines
-                        (game_id, fetched_at, ml_home, ml_away,
-                         spread_home_line, spread_home_odds, spread_away_line, spread_away_odds,
-                         total_over_line, total_over_odds, total_under_line, total_under_odds)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        game.game_id,
-                        fetched_at,
-                        bl.money_line.home,
-                        bl.money_line.away,
-                        bl.spread.home_line,
-                        bl.spread.home_odds,
-                        bl.spread.away_line,
-                        bl.spread.away_odds,
-                        bl.total.over_line,
-                        bl.total.over_odds,
-                        bl.total.under_line,
-                        bl.total.under_odds,
-                    ))
-
-                    saved += 1
-                except sqlite3.Error as e:
-                    print(f"Warning: Failed to save game {game.game_id}: {e}")
-
-        return saved
+        self._migrate_archive()
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Apply any migrations newer than the database's user_version."""
+        conn.create_function("iso_ms", 1, iso_to_epoch_ms, deterministic=True)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, statements in enumerate(_MIGRATIONS[version:], start=version + 1):
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {number}")
+
+    def _migrate_archive(self) -> None:
+        """Convert an archive written with TEXT timestamps to epoch ms."""
+        if not self.archive_path.exists():
+            return
+        conn = sqlite3.connect(self.archive_path, timeout=30)
+        try:
+            with conn:
+                if conn.execute("PRAGMA user_version").fetchone()[0] >= _ARCHIVE_VERSION:
+                    return
+                conn.create_function("iso_ms", 1, iso_to_epoch_ms, deterministic=True)
+                exists = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'betting_lines_rollup'"
+                ).fetchone()
+                if exists:
+                    for statement in _CONVERT_ROLLUP_SQL:
+                        conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {_ARCHIVE_VERSION}")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _line_hash(game: NFLGame) -> str:
+        """Hash of everything stored for a snapshot except the fetch time.
+
+        A start time the parser had to make up is the fetch time under
+        another name, so it is left out too.
+        """
+        bl = game.betting_lines
+        content = (
+            game.home_team.name, game.home_team.abbreviation,
+            game.away_team.name, game.away_team.abbreviation,
+            game.start_time.isoformat() if game.start_time_known else None, game.status,
+            bl.money_line.home, bl.money_line.away,
+            bl.spread.home_line, bl.spread.home_odds, bl.spread.away_line, bl.spread.away_odds,
+            bl.total.over_line, bl.total.over_odds, bl.total.under_line, bl.total.under_odds,
+        )
+        return hashlib.blake2b(repr(content).encode(), digest_size=16).hexdigest()
+
+    def save_games(self, games: List[NFLGame]) -> "SaveReport":
+        """Save a slate of games in one transaction.
+
+        A new snapshot row is only written when a game's lines or status
+        differ from its latest stored snapshot; otherwise that snapshot's
+        last_seen_at is moved forward. Rows are written with executemany;
+        if the batch fails, each game is retried on its own savepoint so
+        one bad row cannot lose the rest. Failures are listed in the report.
+        """
+        report = SaveReport()
+
+        # Later entries win, as they would with row-by-row INSERT OR REPLACE
+        snapshots: Dict[str, Tuple[NFLGame, str]] = {}
+        for game in games:
+            try:
+                snapshots[game.game_id] = (game, self._line_hash(game))
+            except Exception as e:
+                report.errors[getattr(game, "game_id", "?")] = str(e)
+
+        if not snapshots:
+            return report
+
+        with self._connection() as conn:
+            # Take the write lock up front so the hash comparison and the
+            # writes see the same latest snapshots
+            conn.execute("BEGIN IMMEDIATE")
+            latest = self._latest_snapshots(conn, list(snapshots))
+
+            inserts: List[Tuple[NFLGame, str]] = []
+            bumps: List[Tuple[int, str, int]] = []
+            for game_id, (game, line_hash) in snapshots.items():
+                fetched_at = to_epoch_ms(game.fetched_at)
+                previous = latest.get(game_id)
+                if previous and previous[1] == line_hash and previous[0] <= fetched_at:
+                    bumps.append((fetched_at, game_id, previous[0]))
+                else:
+                    inserts.append((game, line_hash))
+
+            try:
+                self._write_snapshots(conn, inserts, bumps)
+                report.inserted = len(inserts)
+                report.unchanged = len(bumps)
+            except sqlite3.Error:
+                conn.rollback()
+                conn.execute("BEGIN IMMEDIATE")
+                self._write_snapshots_one_by_one(conn, inserts, bumps, report)
+
+        return report
+
+    def _latest_snapshots(
+        self, conn: sqlite3.Connection, game_ids: List[str]
+    ) -> Dict[str, Tuple[int, Optional[str]]]:
+        """(fetched_at, line_hash) of the newest stored snapshot per game."""
+        latest: Dict[str, Tuple[int, Optional[str]]] = {}
+        for i in range(0, len(game_ids), 500):
+            chunk = game_ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = conn.execute(f"""
+                SELECT game_id, MAX(fetched_at), line_hash
+                FROM betting_lines
+                WHERE game_id IN ({placeholders})
+                GROUP BY game_id
+            """, chunk)
+            for game_id, fetched_at, line_hash in cursor:
+                latest[game_id] = (fetched_at, line_hash)
+        return latest
+
+    def _write_snapshots(
+        self,
+        conn: sqlite3.Connection,
+        inserts: List[Tuple[NFLGame, str]],
+        bumps: List[Tuple[int, str, int]],
+    ) -> None:
+        """Insert changed snapshots and move last_seen_at on unchanged ones."""
+        if bumps:
+            for table in ("games", "betting_lines"):
+                conn.executemany(
+                    f"UPDATE {table} SET last_seen_at = ? WHERE game_id = ? AND fetched_at = ?",
+                    bumps,
+                )
+
+        if not inserts:
+            return
+
+        conn.executemany("""
+            INSERT OR REPLACE INTO games
+            (game_id, home_team_name, home_team_abbr, away_team_name, away_team_abbr,
+             start_time, status, fetched_at, line_hash, last_seen_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (
+                game.game_id,
+                game.home_team.name,
+                game.home_team.abbreviation,
+                game.away_team.name,
+                game.away_team.abbreviation,
+                to_epoch_ms(game.start_time),
+                game.status,
+                to_epoch_ms(game.fetched_at),
+                line_hash,
+                to_epoch_ms(game.fetched_at),
+            )
+            for game, line_hash in inserts
+        ])
+
+        conn.executemany("""
+            INSERT OR REPLACE INTO betting_lines
+            (game_id, fetched_at, ml_home, ml_away,
+             spread_home_line, spread_home_odds, spread_away_line, spread_away_odds,
+             total_over_line, total_over_odds, total_under_line, total_under_odds,
+             line_hash, last_seen_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (
+                game.game_id,
+                to_epoch_ms(game.fetched_at),
+                game.betting_lines.money_line.home,
+                game.betting_lines.money_line.away,
+                game.betting_lines.spread.home_line,
+                game.betting_lines.spread.home_odds,
+                game.betting_lines.spread.away_line,
+                game.betting_lines.spread.away_odds,
+                game.betting_lines.total.over_line,
+                game.betting_lines.total.over_odds,
+                game.betting_lines.total.under_line,
+                game.betting_lines.total.under_odds,
+                line_hash,
+                to_epoch_ms(game.fetched_at),
+            )
+            for game, line_hash in inserts
+        ])
+
+    def _write_snapshots_one_by_one(
+        self,
+        conn: sqlite3.Connection,
+        inserts: List[Tuple[NFLGame, str]],
+        bumps: List[Tuple[int, str, int]],
+        report: "SaveReport",
+    ) -> None:
+        """Fallback after a failed batch: one savepoint per game."""
+        work = [(game.game_id, [(game, line_hash)], []) for game, line_hash in inserts]
+        work += [(bump[1], [], [bump]) for bump in bumps]
+
+        for game_id, game_inserts, game_bumps in work:
+            conn.execute("SAVEPOINT save_game")
+            try:
+                self._write_snapshots(conn, game_inserts, game_bumps)
+            except sqlite3.Error as e:
+                conn.execute("ROLLBACK TO save_game")
+                report.errors[game_id] = str(e)
+            else:
+                if game_inserts:
+                    report.inserted += 1
+                else:
+                    report.unchanged += 1
+            finally:
+                conn.execute("RELEASE save_game")
 
     def get_games(
         self,
         game_id: Optional[str] = None,
         since: Optional[datetime] = None,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[NFLGame]:
         """Retrieve games from database."""
+        return [game for _, game in self._select_games(game_id, since, limit, cursor)]
+
+    def get_games_page(
+        self,
+        since: Optional[datetime] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[NFLGame], Optional[str]]:
+        """One page of snapshots, newest first, and the cursor for the next page."""
+        rows = self._select_games(None, since, limit + 1, cursor)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_id, last_game = rows[-1]
+            next_cursor = encode_cursor(to_epoch_ms(last_game.fetched_at), last_id)
+        return [game for _, game in rows], next_cursor
+
+    def _select_games(
+        self,
+        game_id: Optional[str],
+        since: Optional[datetime],
+        limit: int,
+        cursor: Optional[str],
+    ) -> List[Tuple[int, NFLGame]]:
+        """(row id, game) pairs ordered by last_seen_at, newest first."""
+        # last_seen_at is set on every row since migration 1
         query = """
             SELECT g.game_id, g.home_team_name, g.home_team_abbr,
-                   g.away_team_name, g.away_team_abbr, g.start_time, g.status, g.fetched_at,
+                   g.away_team_name, g.away_team_abbr, g.start_time, g.status,
+                   g.last_seen_at,
                    b.ml_home, b.ml_away,
                    b.spread_home_line, b.spread_home_odds, b.spread_away_line, b.spread_away_odds,
-                   b.total_over_line, b.total_over_odds, b.total_under_line, b.total_under_odds
+                   b.total_over_line, b.total_over_odds, b.total_under_line, b.total_under_odds,
+                   g.id
             FROM games g
             LEFT JOIN betting_lines b ON g.game_id = b.game_id AND g.fetched_at = b.fetched_at
             WHERE 1=1
@@ -180,24 +740,29 @@ class Database:
             query += " AND g.game_id = ?"
             params.append(game_id)
 
+        # A snapshot covers fetched_at..last_seen_at, so filter and sort on
+        # the last time it was seen
         if since:
-            query += " AND g.fetched_at >= ?"
-            params.append(since.isoformat())
+            query += " AND g.last_seen_at >= ?"
+            params.append(to_epoch_ms(since))
+
+        if cursor:
+            query += " AND (g.last_seen_at, g.id) < (?, ?)"
+            params.extend(decode_cursor(cursor, 2))
 
-        query += " ORDER BY g.fetched_at DESC LIMIT ?"
+        query += " ORDER BY g.last_seen_at DESC, g.id DESC LIMIT ?"
         params.append(limit)
 
         games = []
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(query, params)
-            for row in cursor:
+        with self._connection() as conn:
+            for row in conn.execute(query, params):
                 game = NFLGame(
                     game_id=row[0],
                     home_team=Team(name=row[1], abbreviation=row[2]),
                     away_team=Team(name=row[3], abbreviation=row[4]),
-                    start_time=datetime.fromisoformat(row[5]),
+                    start_time=from_epoch_ms(row[5]),
                     status=row[6],
-                    fetched_at=datetime.fromisoformat(row[7]),
+                    fetched_at=from_epoch_ms(row[7]),
                     betting_lines=BettingLines(
                         money_line=MoneyLine(home=row[8], away=row[9]),
                         spread=Spread(
@@ -210,26 +775,39 @@ class Database:
                         ),
                     ),
                 )
-                games.append(game)
+                games.append((row[18], game))
 
         return games
 
     def get_line_history(self, game_id: str) -> List[dict]:
-        """Get historical line movements for a game."""
+        """Get historical line movements for a game.
+
+        Each stored snapshot yields a point when it was first fetched and,
+        if it stayed unchanged, another when it was last seen, so the
+        timeline has the same shape as storing every fetch.
+        """
         query = """
             SELECT fetched_at, ml_home, ml_away,
                    spread_home_line, spread_home_odds, spread_away_line, spread_away_odds,
-                   total_over_line, total_over_odds
+                   total_over_line, total_over_odds, last_seen_at
             FROM betting_lines
             WHERE game_id = ?
             ORDER BY fetched_at ASC
         """
 
-        history = []
-        with sqlite3.connect(self.db_path) as conn:
+        # Older data comes from the rollup tiers, oldest first
+        history = self._archived_history(game_id)
+        with self._connection() as conn:
+            for resolution in ("hour", "minute"):
+                history += candles_to_history(conn.execute("""
+                    SELECT bucket_start, series, close, last_seen_at
+                    FROM betting_lines_rollup
+                    WHERE game_id = ? AND resolution = ?
+                """, (game_id, resolution)), resolution)
+
             cursor = conn.execute(query, (game_id,))
             for row in cursor:
-                history.append({
+                entry = {
                     "fetched_at": row[0],
                     "money_line": {"home": row[1], "away": row[2]},
                     "spread": {
@@ -237,13 +815,304 @@ class Database:
                         "away_line": row[5], "away_odds": row[6]
                     },
                     "total": {"over_line": row[7], "over_odds": row[8]},
-                })
+                }
+                history.append(entry)
+                if row[9] and row[9] != row[0]:
+                    history.append({**entry, "fetched_at": row[9]})
 
+        # Sort on the integer times, then decode each once
+        history.sort(key=lambda entry: entry["fetched_at"])
+        for entry in history:
+            entry["fetched_at"] = from_epoch_ms(entry["fetched_at"]).isoformat()
         return history
 
+    def _archived_history(self, game_id: str) -> List[dict]:
+        """History entries for a game from the archive database, if any."""
+        if not self.archive_path.exists():
+            return []
+        conn = sqlite3.connect(f"file:{self.archive_path}?mode=ro", uri=True)
+        try:
+            return candles_to_history(conn.execute("""
+                SELECT bucket_start, series, close, last_seen_at
+                FROM betting_lines_rollup
+                WHERE game_id = ? AND resolution = 'hour'
+            """, (game_id,)), "hour")
+        except sqlite3.Error:
+            return []
+        finally:
+            conn.close()
+
+    # ==================== EXPORT METHODS ====================
+
+    def table_columns(self, table: str) -> List[Tuple[str, str]]:
+        """(name, declared type) for each column of an exportable table."""
+        if table not in EXPORT_TABLES:
+            raise ValueError(f"Unknown table: {table}")
+        if table == "betting_lines_archive":
+            # Same schema as the main database's rollups
+            table = "betting_lines_rollup"
+        with self._connection() as conn:
+            return [(row[1], row[2]) for row in conn.execute(f"PRAGMA table_info({table})")]
+
+    def iter_rows(
+        self, table: str, after_id: int = 0, batch_size: int = 10000
+    ) -> Iterator[List[tuple]]:
+        """Yield raw rows of ``table`` with id > ``after_id``, in id order.
+
+        Rows come in batches of ``batch_size``, each read in its own short
+        transaction so a long export never holds up the poller's writes.
+        Columns are in table_columns order. The rollup tables have no id
+        and are read in full, in primary key order.
+        """
+        if table not in EXPORT_TABLES:
+            raise ValueError(f"Unknown table: {table}")
+        if table in ROLLUP_TABLES:
+            yield from self._iter_rollup_rows(table, batch_size)
+            return
+
+        while True:
+            with self._connection() as conn:
+                rows = conn.execute(
+                    f"SELECT * FROM {table} WHERE id > ? ORDER BY id LIMIT ?",
+                    (after_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            yield rows
+            after_id = rows[-1][0]
+
+    def _iter_rollup_rows(self, table: str, batch_size: int) -> Iterator[List[tuple]]:
+        key_columns = "game_id, resolution, bucket_start, series"
+        key: Optional[tuple] = None
+        while True:
+            where = f"WHERE ({key_columns}) > (?, ?, ?, ?)" if key else ""
+            sql = (
+                f"SELECT * FROM betting_lines_rollup {where} "
+                f"ORDER BY {key_columns} LIMIT ?"
+            )
+            params = (*(key or ()), batch_size)
+            if table == "betting_lines_archive":
+                if not self.archive_path.exists():
+                    return
+                conn = sqlite3.connect(f"file:{self.archive_path}?mode=ro", uri=True)
+                try:
+                    rows = conn.execute(sql, params).fetchall()
+                except sqlite3.OperationalError:
+                    # An archive that has never received a rollup
+                    rows = []
+                finally:
+                    conn.close()
+            else:
+                with self._connection() as conn:
+                    rows = conn.execute(sql, params).fetchall()
+            if not rows:
+                return
+            yield rows
+            key = rows[-1][:4]
+
+    def last_seen_high_water(self, table: str) -> int:
+        """The newest last_seen_at in a snapshot table, or 0 if it is empty."""
+        if table not in SEEN_TABLES:
+            raise ValueError(f"Unknown table: {table}")
+        with self._connection() as conn:
+            return conn.execute(f"SELECT MAX(last_seen_at) FROM {table}").fetchone()[0] or 0
+
+    def rows_seen_since(
+        self, table: str, seen_after: int, max_id: int
+    ) -> List[Tuple[int, int, int]]:
+        """(id, fetched_at, last_seen_at) of rows up to ``max_id`` seen after ``seen_after``.
+
+        These are the rows an earlier export wrote whose last_seen_at has
+        since been moved by an unchanged fetch.
+        """
+        if table not in SEEN_TABLES:
+            raise ValueError(f"Unknown table: {table}")
+        with self._connection() as conn:
+            return conn.execute(f"""
+                SELECT id, fetched_at, last_seen_at FROM {table}
+                WHERE last_seen_at > ? AND id <= ?
+            """, (seen_after, max_id)).fetchall()
+
+    # ==================== RETENTION METHODS ====================
+
+    def apply_retention(
+        self,
+        policy: RetentionPolicy,
+        now: Optional[datetime] = None,
+        batch_size: int = 5000,
+    ) -> RetentionReport:
+        """Move history down the retention tiers described by ``policy``.
+
+        The newest snapshot of each game always stays raw, so change
+        detection in save_games and get_games keep working. Each tier is
+        worked through ``batch_size`` rows at a time, one short write
+        transaction per batch, so save_games never waits long for the lock.
+        """
+        raw_cutoff, minute_cutoff, archive_cutoff = policy.cutoffs(now or datetime.now())
+        report = RetentionReport()
+
+        report.raw_rows_rolled_up = self._in_batches(
+            self._roll_up_raw, to_epoch_ms(raw_cutoff), batch_size
+        )
+        report.minute_rows_rolled_up = self._in_batches(
+            self._roll_up_minutes, to_epoch_ms(minute_cutoff), batch_size
+        )
+        report.games_rows_pruned = self._in_batches(
+            self._prune_games, to_epoch_ms(raw_cutoff), batch_size
+        )
+
+        if archive_cutoff is not None:
+            report.hour_rows_archived = self._archive_hours(to_epoch_ms(archive_cutoff))
+
+        return report
+
+    def _in_batches(
+        self,
+        step: Callable[[sqlite3.Connection, int, int], int],
+        cutoff: int,
+        batch_size: int,
+    ) -> int:
+        """Repeat ``step`` in its own transaction until a batch comes up short.
+
+        Each step removes the rows it handled, so the next batch picks up
+        where it stopped. Returns the total rows handled.
+        """
+        total = 0
+        while True:
+            with self._connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                count = step(conn, cutoff, batch_size)
+            total += count
+            if count < batch_size:
+                return total
+
+    def _roll_up_raw(self, conn: sqlite3.Connection, cutoff: int, limit: int) -> int:
+        """Fold up to ``limit`` raw snapshots older than ``cutoff`` into minute rollups.
+
+        Oldest first per game, so a bucket split across batches still gets
+        its open from the first batch and its close from the last.
+        """
+        rows = conn.execute(f"""
+            SELECT id, game_id, fetched_at, COALESCE(last_seen_at, fetched_at),
+                   {", ".join(ROLLUP_SERIES)}
+            FROM betting_lines b
+            WHERE fetched_at < ?
+              AND fetched_at < (SELECT MAX(fetched_at) FROM betting_lines WHERE game_id = b.game_id)
+            ORDER BY game_id, fetched_at
+            LIMIT ?
+        """, (cutoff, limit)).fetchall()
+        if not rows:
+            return 0
+
+        samples = (
+            (row[1], row[2], series, Candle(value, value, value, value, 1, row[3]))
+            for row in rows
+            for series, value in zip(ROLLUP_SERIES, row[4:])
+            if value is not None
+        )
+        self._upsert_candles(conn, fold_candles(samples, "minute"), "minute")
+        conn.executemany("DELETE FROM betting_lines WHERE id = ?", [(row[0],) for row in rows])
+        return len(rows)
+
+    def _roll_up_minutes(self, conn: sqlite3.Connection, cutoff: int, limit: int) -> int:
+        """Fold up to ``limit`` minute rollups older than ``cutoff`` into hour rollups."""
+        rows = conn.execute("""
+            SELECT game_id, bucket_start, series, open, high, low, close, samples, last_seen_at
+            FROM betting_lines_rollup
+            WHERE resolution = 'minute' AND bucket_start < ?
+            ORDER BY game_id, series, bucket_start
+            LIMIT ?
+        """, (cutoff, limit)).fetchall()
+        if not rows:
+            return 0
+
+        samples = ((row[0], row[1], row[2], Candle(*row[3:])) for row in rows)
+        self._upsert_candles(conn, fold_candles(samples, "hour"), "hour")
+        conn.executemany("""
+            DELETE FROM betting_lines_rollup
+            WHERE game_id = ? AND resolution = 'minute' AND bucket_start = ? AND series = ?
+        """, [(row[0], row[1], row[2]) for row in rows])
+        return len(rows)
+
+    def _prune_games(self, conn: sqlite3.Connection, cutoff: int, limit: int) -> int:
+        """Delete up to ``limit`` games rows older than ``cutoff``, keeping each game's newest."""
+        return conn.execute("""
+            DELETE FROM games WHERE id IN (
+                SELECT id FROM games g
+                WHERE fetched_at < ?
+                  AND fetched_at < (SELECT MAX(fetched_at) FROM games WHERE game_id = g.game_id)
+                LIMIT ?
+            )
+        """, (cutoff, limit)).rowcount
+
+    def _upsert_candles(
+        self, conn: sqlite3.Connection, candles: Dict[tuple, Candle], resolution: str
+    ) -> None:
+        conn.executemany(_UPSERT_ROLLUP_SQL, [
+            (
+                game_id, resolution, start, series,
+                candle.open, candle.high, candle.low, candle.close,
+                candle.samples, candle.last_seen_at,
+            )
+            for (game_id, start, series), candle in candles.items()
+        ])
+
+    def _archive_hours(self, cutoff: int) -> int:
+        """Move hour rollups older than ``cutoff`` to the archive database."""
+        with self._connection() as conn:
+            count = conn.execute(
+                "SELECT COUNT(*) FROM betting_lines_rollup "
+                "WHERE resolution = 'hour' AND bucket_start < ?",
+                (cutoff,),
+            ).fetchone()[0]
+            if not count:
+                return 0
+
+            # ATTACH/DETACH cannot run inside a transaction
+            conn.execute("ATTACH DATABASE ? AS archive", (str(self.archive_path),))
+            try:
+                conn.execute(_ROLLUP_TABLE_SQL.format(schema="archive.", suffix=""))
+                conn.execute(f"PRAGMA archive.user_version = {_ARCHIVE_VERSION}")
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("""
+                    INSERT OR REPLACE INTO archive.betting_lines_rollup
+                    SELECT * FROM main.betting_lines_rollup
+                    WHERE resolution = 'hour' AND bucket_start < ?
+                """, (cutoff,))
+                conn.execute("""
+                    DELETE FROM main.betting_lines_rollup
+                    WHERE resolution = 'hour' AND bucket_start < ?
+                """, (cutoff,))
+                conn.commit()
+            finally:
+                if conn.in_transaction:
+                    conn.rollback()
+                conn.execute("DETACH DATABASE archive")
+            return count
+
+    def incremental_vacuum(self, max_pages: int = 0) -> int:
+        """Return free pages to the OS. Returns the number of pages freed.
+
+        ``max_pages`` of 0 frees all of them. A database created before
+        auto_vacuum was enabled is converted with one full VACUUM first.
+        """
+        with self._connection() as conn:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+                return free_pages
+
+            before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            # execute() steps the pragma once, freeing a single page;
+            # executescript() runs it to completion
+            conn.executescript(f"PRAGMA incremental_vacuum({int(max_pages)})")
+            after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            return before - after
+
     def get_unique_games(self) -> List[str]:
         """Get list of unique game IDs in database."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.execute("SELECT DISTINCT game_id FROM games ORDER BY game_id")
             return [row[0] for row in cursor]
 
@@ -251,56 +1120,113 @@ class Database:
 
     def init_bankroll(self, starting_balance: float = 10000.00) -> Bankroll:
         """Initialize bankroll if it doesn't exist."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT balance, updated_at FROM bankroll WHERE id = 1")
-            row = cursor.fetchone()
-            if row:
-                return Bankroll(balance=row[0], updated_at=datetime.fromisoformat(row[1]))
-
-            now = datetime.now()
-            conn.execute(
-                "INSERT INTO bankroll (id, balance, updated_at) VALUES (1, ?, ?)",
-                (starting_balance, now.isoformat())
-            )
-            return Bankroll(balance=starting_balance, updated_at=now)
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._ensure_bankroll(conn, starting_balance)
+            return self._read_bankroll(conn)
 
     def get_bankroll(self) -> Bankroll:
         """Get current bankroll."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT balance, updated_at FROM bankroll WHERE id = 1")
-            row = cursor.fetchone()
+        with self._connection() as conn:
+            row = conn.execute("SELECT balance, updated_at FROM bankroll WHERE id = 1").fetchone()
             if row:
-                return Bankroll(balance=row[0], updated_at=datetime.fromisoformat(row[1]))
-            # Initialize if not exists
-            return self.init_bankroll()
+                return Bankroll(balance=row[0], updated_at=from_epoch_ms(row[1]))
+        # Initialize if not exists
+        return self.init_bankroll()
 
     def update_bankroll(self, new_balance: float) -> Bankroll:
-        """Update bankroll balance."""
-        now = datetime.now()
-        with sqlite3.connect(self.db_path) as conn:
+        """Set the bankroll balance, recording the difference as an adjustment."""
+        now = to_epoch_ms(datetime.now())
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._ensure_bankroll(conn)
+            old_balance = conn.execute("SELECT balance FROM bankroll WHERE id = 1").fetchone()[0]
             conn.execute(
                 "UPDATE bankroll SET balance = ?, updated_at = ? WHERE id = 1",
-                (new_balance, now.isoformat())
+                (new_balance, now)
             )
-        return Bankroll(balance=new_balance, updated_at=now)
+            self._record_transaction(conn, "adjustment", new_balance - old_balance, None, now)
+            return self._read_bankroll(conn)
+
+    def get_transactions(self, limit: int = 100) -> List[dict]:
+        """Most recent bankroll ledger entries, newest first."""
+        with self._connection() as conn:
+            rows = conn.execute("""
+                SELECT id, kind, amount, balance_after, bet_id, created_at
+                FROM bankroll_transactions
+                ORDER BY id DESC LIMIT ?
+            """, (limit,)).fetchall()
+        return [
+            {
+                "id": row[0],
+                "kind": row[1],
+                "amount": row[2],
+                "balance_after": row[3],
+                "bet_id": row[4],
+                "created_at": from_epoch_ms(row[5]).isoformat(),
+            }
+            for row in rows
+        ]
+
+    def _ensure_bankroll(
+        self, conn: sqlite3.Connection, starting_balance: float = 10000.00
+    ) -> None:
+        """Create the bankroll row and its opening ledger entry if missing."""
+        now = to_epoch_ms(datetime.now())
+        created = conn.execute(
+            "INSERT OR IGNORE INTO bankroll (id, balance, updated_at) VALUES (1, ?, ?)",
+            (starting_balance, now)
+        ).rowcount
+        if created:
+            self._record_transaction(conn, "opening", starting_balance, None, now)
+
+    def _read_bankroll(self, conn: sqlite3.Connection) -> Bankroll:
+        row = conn.execute("SELECT balance, updated_at FROM bankroll WHERE id = 1").fetchone()
+        return Bankroll(balance=row[0], updated_at=from_epoch_ms(row[1]))
+
+    def _record_transaction(
+        self,
+        conn: sqlite3.Connection,
+        kind: str,
+        amount: float,
+        bet_id: Optional[int],
+        created_at: int,
+    ) -> None:
+        """Append a ledger entry with the balance it left behind.
+
+        Must run in the same transaction as the balance update it records.
+        """
+        conn.execute("""
+            INSERT INTO bankroll_transactions (kind, amount, balance_after, bet_id, created_at)
+            SELECT ?, ?, balance, ?, ? FROM bankroll WHERE id = 1
+        """, (kind, amount, bet_id, created_at))
 
     # ==================== BET METHODS ====================
 
     def place_bet(self, bet: Bet) -> Bet:
-        """Save a new bet and deduct from bankroll. Returns bet with ID."""
-        with sqlite3.connect(self.db_path) as conn:
-            # Deduct stake from bankroll
-            cursor = conn.execute("SELECT balance FROM bankroll WHERE id = 1")
-            row = cursor.fetchone()
-            current_balance = row[0] if row else 10000.00
+        """Save a new bet and deduct from bankroll. Returns bet with ID.
 
-            new_balance = current_balance - bet.stake
-            now = datetime.now()
+        The stake is taken with one conditional UPDATE under BEGIN IMMEDIATE,
+        so concurrent bets can neither lose an update nor overdraw.
 
-            conn.execute(
-                "UPDATE bankroll SET balance = ?, updated_at = ? WHERE id = 1",
-                (new_balance, now.isoformat())
-            )
+        Raises:
+            InsufficientFundsError: the balance does not cover the stake.
+        """
+        now = to_epoch_ms(datetime.now())
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._ensure_bankroll(conn)
+
+            debited = conn.execute(
+                "UPDATE bankroll SET balance = balance - ?, updated_at = ? "
+                "WHERE id = 1 AND balance >= ?",
+                (bet.stake, now, bet.stake)
+            ).rowcount
+            if not debited:
+                balance = conn.execute("SELECT balance FROM bankroll WHERE id = 1").fetchone()[0]
+                raise InsufficientFundsError(
+                    f"Insufficient funds. Balance: ${balance:.2f}"
+                )
 
             # Insert bet
             cursor = conn.execute("""
@@ -315,18 +1241,19 @@ class Database:
                 bet.odds,
                 bet.potential_payout,
                 bet.status,
-                bet.placed_at.isoformat(),
+                to_epoch_ms(bet.placed_at),
                 bet.home_team_abbr,
                 bet.away_team_abbr,
                 bet.line_value,
             ))
 
             bet.id = cursor.lastrowid
+            self._record_transaction(conn, "stake", -bet.stake, bet.id, now)
             return bet
 
     def get_bet(self, bet_id: int) -> Optional[Bet]:
         """Get a single bet by ID."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.execute("""
                 SELECT id, game_id, bet_type, selection, stake, odds, potential_payout,
                        status, result_amount, home_score, away_score, placed_at, settled_at,
@@ -343,9 +1270,14 @@ class Database:
         game_id: Optional[str] = None,
         status: Optional[str] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None
     ) -> List[Bet]:
-        """Get bets with optional filters."""
+        """Get bets with optional filters, newest first.
+
+        ``cursor`` (from get_bets_page) seeks past earlier pages on the
+        (status, placed_at) index instead of scanning ``offset`` rows.
+        """
         query = """
             SELECT id, game_id, bet_type, selection, stake, odds, potential_payout,
                    status, result_amount, home_score, away_score, placed_at, settled_at,
@@ -362,17 +1294,34 @@ class Database:
             query += " AND status = ?"
             params.append(status)
 
-        query += " ORDER BY placed_at DESC LIMIT ? OFFSET ?"
+        if cursor:
+            query += " AND (placed_at, id) < (?, ?)"
+            params.extend(decode_cursor(cursor, 2))
+
+        query += " ORDER BY placed_at DESC, id DESC LIMIT ? OFFSET ?"
         params.extend([limit, offset])
 
         bets = []
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(query, params)
-            for row in cursor:
+        with self._connection() as conn:
+            for row in conn.execute(query, params):
                 bets.append(self._row_to_bet(row))
 
         return bets
 
+    def get_bets_page(
+        self,
+        status: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Bet], Optional[str]]:
+        """One page of bets, newest first, and the cursor for the next page."""
+        bets = self.get_bets(status=status, limit=limit + 1, cursor=cursor)
+        next_cursor = None
+        if len(bets) > limit:
+            bets = bets[:limit]
+            next_cursor = encode_cursor(to_epoch_ms(bets[-1].placed_at), bets[-1].id)
+        return bets, next_cursor
+
     def get_bets_count(self, status: Optional[str] = None) -> int:
         """Get total count of bets with optional status filter."""
         query = "SELECT COUNT(*) FROM bets WHERE 1=1"
@@ -382,7 +1331,7 @@ class Database:
             query += " AND status = ?"
             params.append(status)
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.execute(query, params)
             return cursor.fetchone()[0]
 
@@ -398,29 +1347,106 @@ class Database:
         home_score: int,
         away_score: int
     ) -> Optional[Bet]:
-        """Settle a bet and update bankroll if won."""
-        now = datetime.now()
-        with sqlite3.connect(self.db_path) as conn:
-            # Update bet
-            conn.execute("""
+        """Settle a pending bet and credit the bankroll if won or pushed.
+
+        A bet that is already settled is left alone, so a retried or
+        concurrent settlement never pays out twice.
+        """
+        now = to_epoch_ms(datetime.now())
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            settled = conn.execute("""
                 UPDATE bets
                 SET status = ?, result_amount = ?, home_score = ?, away_score = ?, settled_at = ?
-                WHERE id = ?
-            """, (status, result_amount, home_score, away_score, now.isoformat(), bet_id))
+                WHERE id = ? AND status = 'pending'
+            """, (status, result_amount, home_score, away_score, now, bet_id)).rowcount
 
             # Add winnings to bankroll if won or push
-            if result_amount > 0:
-                cursor = conn.execute("SELECT balance FROM bankroll WHERE id = 1")
-                row = cursor.fetchone()
-                current_balance = row[0] if row else 10000.00
-                new_balance = current_balance + result_amount
+            if settled and result_amount > 0:
+                self._ensure_bankroll(conn)
                 conn.execute(
-                    "UPDATE bankroll SET balance = ?, updated_at = ? WHERE id = 1",
-                    (new_balance, now.isoformat())
+                    "UPDATE bankroll SET balance = balance + ?, updated_at = ? WHERE id = 1",
+                    (result_amount, now)
                 )
+                self._record_transaction(conn, "payout", result_amount, bet_id, now)
 
         return self.get_bet(bet_id)
 
+    def settle_games(self, scores: Dict[str, Tuple[int, int]]) -> List[Bet]:
+        """Settle every pending bet on the given games in one transaction.
+
+        ``scores`` maps game_id to (home_score, away_score). Results are
+        computed in Python, written with one executemany, and the bankroll
+        gets a single net credit; the ledger still has one payout entry per
+        winning or pushed bet. Returns the settled bets.
+        """
+        if not scores:
+            return []
+
+        now = datetime.now()
+        now_ms = to_epoch_ms(now)
+        game_ids = list(scores)
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+
+            pending: List[Bet] = []
+            for i in range(0, len(game_ids), 500):
+                chunk = game_ids[i:i + 500]
+                pending += [self._row_to_bet(row) for row in conn.execute(f"""
+                    SELECT id, game_id, bet_type, selection, stake, odds, potential_payout,
+                           status, result_amount, home_score, away_score, placed_at, settled_at,
+                           home_team_abbr, away_team_abbr, line_value
+                    FROM bets
+                    WHERE status = 'pending' AND game_id IN ({",".join("?" * len(chunk))})
+                    ORDER BY id
+                """, chunk)]
+            if not pending:
+                return []
+
+            for bet in pending:
+                bet.home_score, bet.away_score = scores[bet.game_id]
+                bet.status, bet.result_amount = determine_bet_result(
+                    bet_type=bet.bet_type,
+                    line_value=bet.line_value,
+                    odds=bet.odds,
+                    stake=bet.stake,
+                    home_score=bet.home_score,
+                    away_score=bet.away_score,
+                )
+                bet.settled_at = from_epoch_ms(now_ms)
+
+            conn.executemany("""
+                UPDATE bets
+                SET status = ?, result_amount = ?, home_score = ?, away_score = ?, settled_at = ?
+                WHERE id = ?
+            """, [
+                (bet.status, bet.result_amount, bet.home_score, bet.away_score,
+                 now_ms, bet.id)
+                for bet in pending
+            ])
+
+            payouts = [bet for bet in pending if bet.result_amount > 0]
+            if payouts:
+                self._ensure_bankroll(conn)
+                balance = conn.execute("SELECT balance FROM bankroll WHERE id = 1").fetchone()[0]
+                conn.execute(
+                    "UPDATE bankroll SET balance = balance + ?, updated_at = ? WHERE id = 1",
+                    (sum(bet.result_amount for bet in payouts), now_ms)
+                )
+
+                # Running balance per entry, as if each payout were applied in turn
+                entries = []
+                for bet in payouts:
+                    balance += bet.result_amount
+                    entries.append(("payout", bet.result_amount, balance, bet.id, now_ms))
+                conn.executemany("""
+                    INSERT INTO bankroll_transactions
+                    (kind, amount, balance_after, bet_id, created_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """, entries)
+
+            return pending
+
     def _row_to_bet(self, row) -> Bet:
         """Convert database row to Bet object."""
         return Bet(
@@ -435,9 +1461,54 @@ class Database:
             result_amount=row[8],
             home_score=row[9],
             away_score=row[10],
-            placed_at=datetime.fromisoformat(row[11]),
-            settled_at=datetime.fromisoformat(row[12]) if row[12] else None,
+            placed_at=from_epoch_ms(row[11]),
+            settled_at=from_epoch_ms(row[12]) if row[12] is not None else None,
             home_team_abbr=row[13],
             away_team_abbr=row[14],
             line_value=row[15],
         )
+
+
+class AsyncDatabase:
+    """Awaitable front for Database, for use on the event loop.
+
+    Every public Database method is available as a coroutine with the same
+    signature; calls run on a small thread pool so SQLite's disk and lock
+    waits never block the loop. Use ``run`` to group several calls into one
+    trip to the pool.
+    """
+
+    def __init__(self, db: Database, max_workers: int = 4):
+        self.db = db
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="dk-db"
+        )
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call ``fn(*args, **kwargs)`` on the database thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        method = getattr(self.db, name)
+        if not callable(method):
+            return method
+
+        @functools.wraps(method)
+        async def call(*args, **kwargs):
+            return await self.run(method, *args, **kwargs)
+
+        return call
+
+    async def close(self) -> None:
+        """Wait for queued calls, then close the database connections.
+
+        The wait happens off the loop, since a save or retention batch may
+        still be running.
+        """
+        await asyncio.to_thread(self._executor.shutdown, wait=True)
+        self.db.close()
@@ -0,0 +1,273 @@
+"""Columnar Parquet export of the history database.
+
+Files are laid out as hive-style partitions that pyarrow, DuckDB, Polars
+and Spark read directly:
+
+    <out>/<table>/season=<year>/week=<nn>/part-<run>-<batch>.parquet
+
+``games`` and ``betting_lines`` are partitioned by ``fetched_at``,
+``bets`` by ``placed_at`` and the rollup tables (``betting_lines_rollup``
+and the archive's ``betting_lines_archive``) by ``bucket_start``.
+
+Exports are incremental: the last id written for each table is kept in
+``<out>/_export_state.json`` and only newer rows are appended next time.
+An unchanged fetch moves ``last_seen_at`` on a game's newest snapshot in
+place, so the state also keeps the newest ``last_seen_at`` exported, and
+the partitions holding rows seen since then are rewritten with the new
+values. Bets change when they settle and rollups are upserted, so those
+tables are rewritten in full on every export.
+
+Timestamp columns are written as UTC ``timestamp[ms]``, straight from the
+epoch milliseconds stored in the database.
+
+pyarrow is an optional dependency: ``pip install 'dk-cli[export]'``.
+"""
+
+import json
+import shutil
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from .database import EXPORT_TABLES, SEEN_TABLES, Database
+from .timestamps import from_epoch_ms
+
+
+DEFAULT_EXPORT_DIR = Path.home() / ".dk_cli" / "export"
+
+STATE_FILE = "_export_state.json"
+
+# Bumped when the file schema changes; an older export is rewritten in full
+STATE_VERSION = 3
+
+PARTITION_COLUMNS = {
+    "games": "fetched_at",
+    "betting_lines": "fetched_at",
+    "bets": "placed_at",
+    "betting_lines_rollup": "bucket_start",
+    "betting_lines_archive": "bucket_start",
+}
+
+# Tables whose rows are updated in place, so appends would go stale
+FULL_REFRESH_TABLES = ("bets", "betting_lines_rollup", "betting_lines_archive")
+
+TIMESTAMP_COLUMNS = (
+    "fetched_at", "last_seen_at", "start_time", "placed_at", "settled_at", "bucket_start",
+)
+
+
+@dataclass
+class ExportReport:
+    """Rows and files written by one export."""
+
+    rows: Dict[str, int] = field(default_factory=dict)
+    # Previously exported rows rewritten with a newer last_seen_at
+    updated: Dict[str, int] = field(default_factory=dict)
+    files: List[Path] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "rows": dict(self.rows),
+            "updated": dict(self.updated),
+            "files": [str(path) for path in self.files],
+        }
+
+
+def season_week(timestamp: int) -> Tuple[int, int]:
+    """NFL (season, week) for an epoch-ms timestamp.
+
+    Weeks run Tuesday to Monday from the Tuesday after Labor Day. Anything
+    before that (preseason, offseason) is week 0. January and February
+    belong to the previous season.
+    """
+    day = from_epoch_ms(timestamp).date()
+    season = day.year if day.month >= 3 else day.year - 1
+    week = (day - _season_start(season)).days // 7 + 1
+    return season, max(week, 0)
+
+
+def _season_start(season: int) -> date:
+    september_first = date(season, 9, 1)
+    labor_day = september_first + timedelta(days=-september_first.weekday() % 7)
+    return labor_day + timedelta(days=1)
+
+
+def export_history(
+    db: Database,
+    out_dir: Path = DEFAULT_EXPORT_DIR,
+    tables: Iterable[str] = EXPORT_TABLES,
+    full: bool = False,
+    batch_size: int = 50000,
+) -> ExportReport:
+    """Export tables to partitioned Parquet under ``out_dir``.
+
+    With ``full``, every table is rewritten from scratch and the
+    incremental state is reset. So is an export whose state file predates
+    the current STATE_VERSION.
+    """
+    pa, pq = _require_pyarrow()
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    state = {} if full else _load_state(out_dir)
+    if state.get("version") != STATE_VERSION:
+        full = True
+        state = {"version": STATE_VERSION}
+    state.setdefault("last_seen_at", {})
+    run_id = datetime.now().strftime("%Y%m%d%H%M%S")
+    report = ExportReport()
+
+    for table in tables:
+        columns = db.table_columns(table)
+        schema = pa.schema([(name, _arrow_type(pa, name, decl)) for name, decl in columns])
+        partition_index = [name for name, _ in columns].index(PARTITION_COLUMNS[table])
+
+        refresh = full or table in FULL_REFRESH_TABLES
+        # Full rewrites go to a side directory and are swapped in at the end
+        table_dir = out_dir / (f".{table}-new" if refresh else table)
+        if refresh and table_dir.exists():
+            shutil.rmtree(table_dir)
+
+        report.rows[table] = 0
+        written: List[Path] = []
+        after_id = 0 if refresh else state.get(table, 0)
+
+        if table in SEEN_TABLES:
+            # Read before any rows, so a row seen during the export is
+            # caught next time
+            high_water = db.last_seen_high_water(table)
+            if after_id:
+                updated, paths = _update_last_seen(
+                    pa, pq, db, table, table_dir, after_id,
+                    state["last_seen_at"].get(table, 0), run_id,
+                )
+                report.updated[table] = updated
+                written += paths
+
+        for batch, rows in enumerate(db.iter_rows(table, after_id, batch_size)):
+            partitions: Dict[Tuple[int, int], List[tuple]] = {}
+            for row in rows:
+                partitions.setdefault(season_week(row[partition_index]), []).append(row)
+
+            for (season, week), part_rows in sorted(partitions.items()):
+                path = (
+                    table_dir / f"season={season}" / f"week={week:02d}"
+                    / f"part-{run_id}-{batch:05d}.parquet"
+                )
+                path.parent.mkdir(parents=True, exist_ok=True)
+                pq.write_table(_to_arrow(pa, schema, part_rows), path)
+                written.append(path.relative_to(table_dir))
+
+            report.rows[table] += len(rows)
+            if table not in FULL_REFRESH_TABLES:
+                state[table] = rows[-1][0]
+            if not refresh:
+                # Saved per batch so an interrupted export resumes where it stopped
+                _save_state(out_dir, state)
+
+        if refresh:
+            final_dir = out_dir / table
+            if final_dir.exists():
+                shutil.rmtree(final_dir)
+            if table_dir.exists():
+                table_dir.rename(final_dir)
+
+        if table in SEEN_TABLES:
+            state["last_seen_at"][table] = high_water
+            _save_state(out_dir, state)
+        report.files += [out_dir / table / path for path in written]
+
+    _save_state(out_dir, state)
+    return report
+
+
+def _update_last_seen(
+    pa, pq, db: Database, table: str, table_dir: Path, max_id: int,
+    seen_after: int, run_id: str,
+) -> Tuple[int, List[Path]]:
+    """Rewrite the partitions holding exported rows seen since ``seen_after``.
+
+    Only ``last_seen_at`` changes, so each affected partition is read back,
+    patched and written as a single file in place of its old parts.
+    Returns the number of rows updated and the files written.
+    """
+    by_partition: Dict[Tuple[int, int], Dict[int, int]] = {}
+    seen = db.rows_seen_since(table, seen_after, max_id)
+    for row_id, fetched_at, last_seen_at in seen:
+        by_partition.setdefault(season_week(fetched_at), {})[row_id] = last_seen_at
+
+    written: List[Path] = []
+    for (season, week), updates in sorted(by_partition.items()):
+        part_dir = table_dir / f"season={season}" / f"week={week:02d}"
+        old_files = sorted(part_dir.glob("*.parquet"))
+        if not old_files:
+            continue
+
+        data = pa.concat_tables([pq.read_table(path) for path in old_files])
+        index = data.schema.get_field_index("last_seen_at")
+        ids = data.column("id").to_pylist()
+        current = data.column(index).cast(pa.int64()).to_pylist()
+        last_seen = pa.array(
+            [updates.get(row_id, value) for row_id, value in zip(ids, current)],
+            type=pa.int64(),
+        ).cast(data.schema.field(index).type)
+        data = data.set_column(index, data.schema.field(index), last_seen)
+
+        # Written under a hidden name first, which readers skip
+        path = part_dir / f"part-{run_id}-updated.parquet"
+        tmp = part_dir / f".{path.name}"
+        pq.write_table(data, tmp)
+        for old in old_files:
+            old.unlink()
+        tmp.rename(path)
+        written.append(path.relative_to(table_dir))
+
+    return len(seen), written
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError(
+            "Parquet export needs pyarrow. Install it with: pip install 'dk-cli[export]'"
+        ) from None
+    return pyarrow, pyarrow.parquet
+
+
+def _arrow_type(pa, name: str, declared: str):
+    if name in TIMESTAMP_COLUMNS:
+        return pa.timestamp("ms", tz="UTC")
+    declared = declared.upper()
+    if "INT" in declared:
+        return pa.int64()
+    if "REAL" in declared or "NUMERIC" in declared:
+        return pa.float64()
+    return pa.string()
+
+
+def _to_arrow(pa, schema, rows: List[tuple]):
+    """Build an Arrow table column by column from row tuples."""
+    arrays = []
+    for field_, values in zip(schema, zip(*rows)):
+        if pa.types.is_timestamp(field_.type):
+            # Epoch ms need no conversion; build int64 and reinterpret
+            arrays.append(pa.array(values, type=pa.int64()).cast(field_.type))
+            continue
+        arrays.append(pa.array(values, type=field_.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _load_state(out_dir: Path) -> Dict[str, int]:
+    path = out_dir / STATE_FILE
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def _save_state(out_dir: Path, state: Dict[str, int]) -> None:
+    path = out_dir / STATE_FILE
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=2))
+    tmp.replace(path)
@@ -0,0 +1,318 @@
+"""Parsers for the JSON feeds the DraftKings sportsbook page loads.
+
+The NFL page (eventGroupId 88808) renders from XHR payloads. Reading those
+payloads directly is cheaper and more stable than scraping the rendered
+DOM. Two payload shapes are understood:
+
+- sportscontent: ``{"events": [...], "markets": [...], "selections": [...]}``
+- eventgroups (legacy v5): ``{"eventGroup": {"events": [...], "offerCategories": [...]}}``
+"""
+
+import asyncio
+import re
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from .models import NFLGame, Team, BettingLines, MoneyLine, Spread, Total
+
+
+NFL_EVENT_GROUP_ID = "88808"
+
+# Responses worth decoding; everything else on the page is ignored
+FEED_URL_PATTERN = re.compile(
+    rf"/api/sportscontent/.*/leagues/{NFL_EVENT_GROUP_ID}|/eventgroups/{NFL_EVENT_GROUP_ID}"
+)
+
+STATUS_MAP = {
+    "NOT_STARTED": "upcoming",
+    "SCHEDULED": "upcoming",
+    "STARTED": "live",
+    "LIVE": "live",
+    "IN_PROGRESS": "live",
+    "FINAL": "final",
+    "FINISHED": "final",
+    "ENDED": "final",
+    "COMPLETE": "final",
+}
+
+Abbreviate = Callable[[str], str]
+
+
+def parse_feed_payload(payload: dict, abbreviate: Abbreviate) -> List[NFLGame]:
+    """Map a DraftKings feed payload to NFLGame objects.
+
+    Returns an empty list when the payload is not a recognised feed.
+    """
+    if not isinstance(payload, dict):
+        return []
+    if "eventGroup" in payload:
+        return _parse_event_group(payload["eventGroup"], abbreviate)
+    if "events" in payload and "selections" in payload:
+        return _parse_sportscontent(payload, abbreviate)
+    return []
+
+
+def _parse_sportscontent(payload: dict, abbreviate: Abbreviate) -> List[NFLGame]:
+    markets_by_event: Dict[str, List[dict]] = {}
+    for market in payload.get("markets", []):
+        markets_by_event.setdefault(str(market.get("eventId")), []).append(market)
+
+    selections_by_market: Dict[str, List[dict]] = {}
+    for selection in payload.get("selections", []):
+        selections_by_market.setdefault(str(selection.get("marketId")), []).append(selection)
+
+    games = []
+    for event in payload.get("events", []):
+        participants = event.get("participants", [])
+        away = _participant(participants, "away")
+        home = _participant(participants, "home")
+        if not away or not home:
+            continue
+
+        betting_lines = BettingLines()
+        for market in markets_by_event.get(str(event.get("id")), []):
+            kind = _market_kind(market.get("marketType", {}).get("name") or market.get("name"))
+            if not kind:
+                continue
+
+            outcomes = [
+                {
+                    "side": _selection_side(selection, away, home),
+                    "line": selection.get("points"),
+                    "odds": _parse_odds(selection.get("displayOdds", {}).get("american")),
+                }
+                for selection in selections_by_market.get(str(market.get("id")), [])
+            ]
+            _apply_market(betting_lines, kind, outcomes)
+
+        games.append(_build_game(
+            away, home, event.get("startEventDate"), event.get("status"),
+            betting_lines, abbreviate,
+        ))
+
+    return games
+
+
+def _parse_event_group(event_group: dict, abbreviate: Abbreviate) -> List[NFLGame]:
+    events = {str(event.get("eventId")): event for event in event_group.get("events", [])}
+    lines_by_event: Dict[str, BettingLines] = {}
+
+    for category in event_group.get("offerCategories", []):
+        for descriptor in category.get("offerSubcategoryDescriptors", []):
+            offers = descriptor.get("offerSubcategory", {}).get("offers", [])
+            for offer_group in offers:
+                for offer in offer_group:
+                    kind = _market_kind(offer.get("label"))
+                    if not kind:
+                        continue
+
+                    event_id = str(offer.get("eventId"))
+                    event = events.get(event_id, {})
+                    outcomes = [
+                        {
+                            "side": _name_side(
+                                outcome.get("label") or "",
+                                event.get("teamName1"),
+                                event.get("teamName2"),
+                            ),
+                            "line": outcome.get("line"),
+                            "odds": _parse_odds(outcome.get("oddsAmerican")),
+                        }
+                        for outcome in offer.get("outcomes", [])
+                    ]
+                    lines_by_event.setdefault(event_id, BettingLines())
+                    _apply_market(lines_by_event[event_id], kind, outcomes)
+
+    games = []
+    for event in events.values():
+        away = event.get("teamName1")
+        home = event.get("teamName2")
+        if not away or not home:
+            continue
+
+        games.append(_build_game(
+            away, home, event.get("startDate"),
+            event.get("eventStatus", {}).get("state"),
+            lines_by_event.get(str(event.get("eventId")), BettingLines()),
+            abbreviate,
+        ))
+
+    return games
+
+
+def _apply_market(betting_lines: BettingLines, kind: str, outcomes: List[dict]) -> None:
+    """Fill one market on BettingLines from outcomes keyed by side.
+
+    Sides are "home", "away", "over" or "under"; unresolved sides are skipped.
+    """
+    by_side = {outcome["side"]: outcome for outcome in outcomes if outcome["side"]}
+
+    if kind == "spread":
+        away = by_side.get("away", {})
+        home = by_side.get("home", {})
+        betting_lines.spread = Spread(
+            away_line=_to_float(away.get("line")),
+            away_odds=away.get("odds"),
+            home_line=_to_float(home.get("line")),
+            home_odds=home.get("odds"),
+        )
+    elif kind == "total":
+        over = by_side.get("over", {})
+        under = by_side.get("under", {})
+        betting_lines.total = Total(
+            over_line=_to_float(over.get("line")),
+            over_odds=over.get("odds"),
+            under_line=_to_float(under.get("line")),
+            under_odds=under.get("odds"),
+        )
+    elif kind == "moneyline":
+        betting_lines.money_line = MoneyLine(
+            away=by_side.get("away", {}).get("odds"),
+            home=by_side.get("home", {}).get("odds"),
+        )
+
+
+def _build_game(
+    away_name: str,
+    home_name: str,
+    start_text: Optional[str],
+    state: Optional[str],
+    betting_lines: BettingLines,
+    abbreviate: Abbreviate,
+) -> NFLGame:
+    parsed_time = _parse_start_time(start_text)
+    start_time = parsed_time or datetime.now()
+    away_abbr = abbreviate(away_name)
+    home_abbr = abbreviate(home_name)
+
+    return NFLGame(
+        game_id=f"{away_abbr}_{home_abbr}_{start_time.strftime('%Y%m%d')}",
+        home_team=Team(name=home_name.strip(), abbreviation=home_abbr),
+        away_team=Team(name=away_name.strip(), abbreviation=away_abbr),
+        start_time=start_time,
+        status=STATUS_MAP.get((state or "").upper(), "upcoming"),
+        betting_lines=betting_lines,
+        start_time_known=parsed_time is not None,
+    )
+
+
+def _participant(participants: List[dict], role: str) -> Optional[str]:
+    for participant in participants:
+        if (participant.get("venueRole") or "").lower() == role:
+            return participant.get("name")
+    return None
+
+
+def _market_kind(name: Optional[str]) -> Optional[str]:
+    """Classify a market name as spread/total/moneyline, ignoring alternates."""
+    name = (name or "").lower()
+    if "alternate" in name or "1st" in name or "half" in name or "quarter" in name:
+        return None
+    if "spread" in name or "point spread" in name:
+        return "spread"
+    if "total" in name:
+        return "total"
+    if "moneyline" in name or "money line" in name:
+        return "moneyline"
+    return None
+
+
+def _selection_side(selection: dict, away: str, home: str) -> str:
+    outcome_type = (selection.get("outcomeType") or "").lower()
+    if outcome_type in ("home", "away", "over", "under"):
+        return outcome_type
+    return _name_side(selection.get("label") or "", away, home)
+
+
+def _name_side(label: str, away: Optional[str], home: Optional[str]) -> str:
+    label = label.strip().lower()
+    if label in ("over", "o"):
+        return "over"
+    if label in ("under", "u"):
+        return "under"
+    if away and label == away.strip().lower():
+        return "away"
+    if home and label == home.strip().lower():
+        return "home"
+    return ""
+
+
+def _parse_odds(text) -> Optional[int]:
+    if text is None:
+        return None
+    if isinstance(text, (int, float)):
+        return int(text)
+    text = str(text).replace("−", "-").replace("–", "-").replace("—", "-")
+    match = re.search(r"([+-]?\d+)", text)
+    return int(match.group(1)) if match else None
+
+
+def _to_float(value) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_start_time(text: Optional[str]) -> Optional[datetime]:
+    """Parse a UTC ISO timestamp into naive local time, like the DOM parser."""
+    if not text:
+        return None
+    # DK sends 7 fractional digits and a trailing Z; fromisoformat wants neither
+    text = re.sub(r"\.\d+", "", text).replace("Z", "+00:00")
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+class FeedCapture:
+    """Collects DraftKings feed payloads from a page's network responses.
+
+    Register ``on_response`` with ``page.on("response", ...)`` before
+    navigating, then await ``wait_for_games``.
+    """
+
+    def __init__(self, abbreviate: Abbreviate):
+        self.abbreviate = abbreviate
+        self.games: List[NFLGame] = []
+        self.payloads_seen = 0
+        self._ready = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    def on_response(self, response) -> None:
+        if response.request.resource_type not in ("xhr", "fetch"):
+            return
+        if not FEED_URL_PATTERN.search(response.url):
+            return
+        self._tasks.append(asyncio.create_task(self._consume(response)))
+
+    async def _consume(self, response) -> None:
+        try:
+            payload = await response.json()
+        except Exception:
+            return
+
+        self.payloads_seen += 1
+        games = parse_feed_payload(payload, self.abbreviate)
+        if games:
+            self.games = games
+            self._ready.set()
+
+    async def wait_for_games(self, timeout: float) -> List[NFLGame]:
+        """Wait for a feed with games. Returns [] if none arrives in time."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.games
+
+    def close(self) -> None:
+        for task in self._tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,206 @@
+"""Fetch timing instrumentation and rolling metrics.
+
+``FetchMetrics`` is filled in by DraftKingsClient for a single fetch.
+``MetricsRegistry`` keeps rolling windows of those observations in the
+server and renders them for /api/health and the Prometheus text endpoint.
+"""
+
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+from .request_filter import RequestStats
+
+
+@dataclass
+class FetchMetrics:
+    """Timings and parse counters for one page fetch."""
+
+    url: str = ""
+    phases: Dict[str, float] = field(default_factory=dict)
+    cards: int = 0
+    games: int = 0
+    parse_failures: int = 0
+    selector_fallback: Optional[str] = None
+    source: Optional[str] = None  # "feed" or "dom"
+    request_stats: Optional[RequestStats] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block and add it to ``phases`` (in seconds)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.phases.values())
+
+    def to_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "phases": {name: round(value, 4) for name, value in self.phases.items()},
+            "total_seconds": round(self.total_seconds, 4),
+            "cards": self.cards,
+            "games": self.games,
+            "parse_failures": self.parse_failures,
+            "selector_fallback": self.selector_fallback,
+            "source": self.source,
+            "request_stats": self.request_stats.to_dict() if self.request_stats else None,
+        }
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class RollingWindow:
+    """The last ``size`` observations plus all-time count and sum."""
+
+    def __init__(self, size: int = 500):
+        self.values: Deque[float] = deque(maxlen=size)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.values.append(value)
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.values:
+            return None
+        ordered = sorted(self.values)
+        index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[index]
+
+
+class MetricsRegistry:
+    """Counters, gauges and rolling summaries keyed by name and labels."""
+
+    QUANTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self.summaries: Dict[str, Dict[LabelKey, RollingWindow]] = {}
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self.help: Dict[str, str] = {}
+
+    def observe(self, name: str, value: float, help: str = "", **labels: str) -> None:
+        series = self.summaries.setdefault(name, {})
+        key = _label_key(labels)
+        if key not in series:
+            series[key] = RollingWindow(self.window)
+        series[key].observe(value)
+        if help:
+            self.help.setdefault(name, help)
+
+    def inc(self, name: str, amount: float = 1, help: str = "", **labels: str) -> None:
+        series = self.counters.setdefault(name, {})
+        key = _label_key(labels)
+        series[key] = series.get(key, 0) + amount
+        if help:
+            self.help.setdefault(name, help)
+
+    def set_gauge(self, name: str, value: float, help: str = "", **labels: str) -> None:
+        self.gauges.setdefault(name, {})[_label_key(labels)] = value
+        if help:
+            self.help.setdefault(name, help)
+
+    def record_fetch(self, metrics: FetchMetrics) -> None:
+        """Fold one fetch's FetchMetrics into the rolling series."""
+        for phase, seconds in metrics.phases.items():
+            self.observe(
+                "dk_fetch_phase_seconds", seconds,
+                help="Time spent in each scrape phase", phase=phase,
+            )
+        self.observe("dk_fetch_seconds", metrics.total_seconds, help="Total scrape time")
+        self.set_gauge("dk_fetch_cards", metrics.cards, help="Game cards found on the last fetch")
+        self.set_gauge("dk_fetch_games", metrics.games, help="Games parsed on the last fetch")
+        self.inc(
+            "dk_parse_failures_total", metrics.parse_failures,
+            help="Game cards that failed to parse",
+        )
+        if metrics.selector_fallback:
+            self.inc(
+                "dk_selector_fallback_total",
+                help="Which selector or fallback found the content",
+                selector=metrics.selector_fallback,
+            )
+        if metrics.source:
+            self.inc("dk_fetch_source_total", help="Fetches by data source", source=metrics.source)
+        if metrics.request_stats:
+            stats = metrics.request_stats
+            self.inc("dk_requests_total", stats.allowed_requests, help="Page requests", result="allowed")
+            self.inc("dk_requests_total", stats.blocked_requests, result="blocked")
+            self.inc("dk_received_bytes_total", stats.bytes_received, help="Bytes received by the page")
+            self.inc(
+                "dk_cached_responses_total", stats.cached_responses,
+                help="Page responses served from the browser's HTTP cache",
+            )
+
+    def summary(self) -> dict:
+        """Compact JSON view: quantiles per summary, values per counter/gauge."""
+        result: dict = {}
+        for name, series in self.summaries.items():
+            result[name] = {
+                _label_str(key) or "all": {
+                    "count": window.count,
+                    **{f"p{int(q * 100)}": _round(window.quantile(q)) for q in self.QUANTILES},
+                }
+                for key, window in series.items()
+            }
+        for name, series in {**self.counters, **self.gauges}.items():
+            result[name] = {_label_str(key) or "all": value for key, value in series.items()}
+        return result
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format."""
+        lines: List[str] = []
+
+        for name, series in self.summaries.items():
+            self._header(lines, name, "summary")
+            for key, window in series.items():
+                for q in self.QUANTILES:
+                    value = window.quantile(q)
+                    if value is not None:
+                        lines.append(f"{name}{_labels(key, quantile=str(q))} {value}")
+                lines.append(f"{name}_sum{_labels(key)} {window.total}")
+                lines.append(f"{name}_count{_labels(key)} {window.count}")
+
+        for kind, group in (("counter", self.counters), ("gauge", self.gauges)):
+            for name, series in group.items():
+                self._header(lines, name, kind)
+                for key, value in series.items():
+                    lines.append(f"{name}{_labels(key)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines: List[str], name: str, kind: str) -> None:
+        if name in self.help:
+            lines.append(f"# HELP {name} {self.help[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _label_str(key: LabelKey) -> str:
+    return ",".join(f"{k}={v}" for k, v in key)
+
+
+def _labels(key: LabelKey, **extra: str) -> str:
+    pairs = list(key) + sorted(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 4) if value is not None else None
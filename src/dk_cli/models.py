@@ -70,6 +70,8 @@ class NFLGame:
     status: str  # "upcoming", "live", "final"
     betting_lines: BettingLines = field(default_factory=BettingLines)
     fetched_at: datetime = field(default_factory=datetime.now)
+    # False when the page showed no kickoff time and start_time is a stand-in
+    start_time_known: bool = True
 
     def to_dict(self) -> dict:
         return {
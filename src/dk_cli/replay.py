@@ -0,0 +1,100 @@
+"""Offline HTML fixtures for replaying and benchmarking the parsers.
+
+``capture_fixture`` saves the rendered sportsbook page to disk. The replay
+side loads a fixture into Chromium with scripts stripped and the network cut
+off, so every parse strategy sees the same DOM and can be timed in isolation.
+"""
+
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List
+
+from .client import DraftKingsClient, PARSE_STRATEGIES
+
+
+DEFAULT_FIXTURE_DIR = Path.home() / ".dk_cli" / "fixtures"
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing for one parse strategy against one fixture."""
+
+    fixture: str
+    strategy: str
+    games: int
+    runs: int
+    median_ms: float
+    best_ms: float
+
+    @property
+    def per_game_ms(self) -> float:
+        return self.median_ms / self.games if self.games else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "fixture": self.fixture,
+            "strategy": self.strategy,
+            "games": self.games,
+            "runs": self.runs,
+            "median_ms": round(self.median_ms, 3),
+            "best_ms": round(self.best_ms, 3),
+            "per_game_ms": round(self.per_game_ms, 3),
+        }
+
+
+async def capture_fixture(
+    client: DraftKingsClient, fixture_dir: Path = DEFAULT_FIXTURE_DIR
+) -> Path:
+    """Save the current NFL page as an HTML fixture. Returns the file path."""
+    html = await client.capture_html()
+
+    fixture_dir.mkdir(parents=True, exist_ok=True)
+    path = fixture_dir / f"nfl-{datetime.now().strftime('%Y%m%d-%H%M%S')}.html"
+    path.write_text(html, encoding="utf-8")
+    return path
+
+
+def list_fixtures(fixture_dir: Path = DEFAULT_FIXTURE_DIR) -> List[Path]:
+    """All saved fixtures, oldest first."""
+    if not fixture_dir.exists():
+        return []
+    return sorted(fixture_dir.glob("*.html"))
+
+
+async def benchmark_fixture(
+    client: DraftKingsClient,
+    path: Path,
+    strategies: Iterable[str] = PARSE_STRATEGIES,
+    repeat: int = 5,
+) -> List[BenchmarkResult]:
+    """Time each parse strategy against one fixture.
+
+    The fixture is loaded once; every strategy parses the same page
+    ``repeat`` times and reports the median and best wall time.
+    """
+    page = await client.load_html(path.read_text(encoding="utf-8"))
+    results = []
+    try:
+        for strategy in strategies:
+            timings = []
+            games = []
+            for _ in range(max(1, repeat)):
+                start = time.perf_counter()
+                games = await client.parse_page(page, strategy)
+                timings.append((time.perf_counter() - start) * 1000)
+
+            results.append(BenchmarkResult(
+                fixture=path.name,
+                strategy=strategy,
+                games=len(games),
+                runs=len(timings),
+                median_ms=statistics.median(timings),
+                best_ms=min(timings),
+            ))
+    finally:
+        await page.close()
+
+    return results
@@ -0,0 +1,151 @@
+"""Retention tiers for betting line history.
+
+Line snapshots stay in ``betting_lines`` at full resolution for
+``raw_days``. After that they are folded into per-minute OHLC rollups, and
+after ``minute_days`` the minute rollups are folded into per-hour ones.
+Hourly rollups older than ``archive_days`` move to a separate archive
+database, so the main file stays small while old seasons remain queryable.
+
+Timestamps here are epoch milliseconds, as stored in the database.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# betting_lines columns that get a rollup series each
+ROLLUP_SERIES = (
+    "ml_home", "ml_away",
+    "spread_home_line", "spread_home_odds", "spread_away_line", "spread_away_odds",
+    "total_over_line", "total_over_odds", "total_under_line", "total_under_odds",
+)
+
+RESOLUTIONS = ("minute", "hour")
+
+BUCKET_MS = {"minute": 60_000, "hour": 3_600_000}
+
+
+@dataclass
+class RetentionPolicy:
+    """How long each tier keeps data, in days."""
+
+    raw_days: int = 7
+    minute_days: int = 30
+    # None keeps hourly rollups in the main database forever
+    archive_days: Optional[int] = 365
+
+    def cutoffs(self, now: datetime) -> Tuple[datetime, datetime, Optional[datetime]]:
+        """Timestamps before which data leaves the raw, minute and hour tiers."""
+        return (
+            now - timedelta(days=self.raw_days),
+            now - timedelta(days=max(self.minute_days, self.raw_days)),
+            now - timedelta(days=self.archive_days) if self.archive_days is not None else None,
+        )
+
+
+@dataclass
+class RetentionReport:
+    """What one maintenance pass did."""
+
+    raw_rows_rolled_up: int = 0
+    minute_rows_rolled_up: int = 0
+    hour_rows_archived: int = 0
+    games_rows_pruned: int = 0
+    pages_vacuumed: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "raw_rows_rolled_up": self.raw_rows_rolled_up,
+            "minute_rows_rolled_up": self.minute_rows_rolled_up,
+            "hour_rows_archived": self.hour_rows_archived,
+            "games_rows_pruned": self.games_rows_pruned,
+            "pages_vacuumed": self.pages_vacuumed,
+        }
+
+
+def bucket_start(timestamp: int, resolution: str) -> int:
+    """Start of the minute or hour bucket containing an epoch-ms timestamp.
+
+    Hours are aligned to UTC, which only differs from local hours in
+    zones with a fractional offset.
+    """
+    return timestamp - timestamp % BUCKET_MS[resolution]
+
+
+@dataclass
+class Candle:
+    """Open/high/low/close of one series within one bucket."""
+
+    open: float
+    high: float
+    low: float
+    close: float
+    samples: int
+    last_seen_at: int
+
+    def add(self, other: "Candle") -> None:
+        """Extend with a later candle (or single sample) of the same series."""
+        self.high = max(self.high, other.high)
+        self.low = min(self.low, other.low)
+        self.close = other.close
+        self.samples += other.samples
+        self.last_seen_at = max(self.last_seen_at, other.last_seen_at)
+
+
+CandleKey = Tuple[str, int, str]  # (game_id, bucket_start, series)
+
+
+def fold_candles(
+    samples: Iterable[Tuple[str, int, str, Candle]], resolution: str
+) -> Dict[CandleKey, Candle]:
+    """Fold time-ordered (game_id, timestamp, series, candle) into buckets.
+
+    Raw snapshots are passed as single-sample candles (open = high = low =
+    close); minute candles fold into hours the same way.
+    """
+    buckets: Dict[CandleKey, Candle] = {}
+    for game_id, timestamp, series, candle in samples:
+        key = (game_id, bucket_start(timestamp, resolution), series)
+        if key in buckets:
+            buckets[key].add(candle)
+        else:
+            buckets[key] = Candle(**vars(candle))
+    return buckets
+
+
+def candles_to_history(rows: Iterable[tuple], resolution: str) -> List[dict]:
+    """Turn (bucket_start, series, close, last_seen_at) rows into history entries.
+
+    Entries match Database.get_line_history, using each bucket's closing
+    values, with a repeat point when the bucket was last seen later.
+    ``fetched_at`` is left in epoch ms for the caller to merge and decode.
+    """
+    buckets: Dict[int, Dict[str, float]] = {}
+    last_seen: Dict[int, int] = {}
+    for start, series, close, seen_at in rows:
+        buckets.setdefault(start, {})[series] = close
+        last_seen[start] = max(last_seen.get(start, seen_at), seen_at)
+
+    history = []
+    for start in sorted(buckets):
+        values = buckets[start]
+        entry = {
+            "fetched_at": start,
+            "money_line": {"home": values.get("ml_home"), "away": values.get("ml_away")},
+            "spread": {
+                "home_line": values.get("spread_home_line"),
+                "home_odds": values.get("spread_home_odds"),
+                "away_line": values.get("spread_away_line"),
+                "away_odds": values.get("spread_away_odds"),
+            },
+            "total": {
+                "over_line": values.get("total_over_line"),
+                "over_odds": values.get("total_over_odds"),
+            },
+            "resolution": resolution,
+        }
+        history.append(entry)
+        if last_seen[start] != start:
+            history.append({**entry, "fetched_at": last_seen[start]})
+    return history
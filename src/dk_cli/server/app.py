@@ -6,14 +6,23 @@ from typing import Optional
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from ..config import ServerConfig
+from ..database import AsyncDatabase, Database
+from .browser_pool import BrowserPool
+from .maintenance import MaintenanceTask
 from .routes import router as api_router
+from .state import app_state
 from .tasks import PollingTask
 from .websocket import router as ws_router
 
-# Module-level polling task reference
+logger = logging.getLogger("dk_cli.server")
+
+# Module-level polling task, browser pool and maintenance task references
 _polling_task: Optional[PollingTask] = None
+_browser_pool: Optional[BrowserPool] = None
+_maintenance_task: Optional[MaintenanceTask] = None
 
 
 def create_app(config: ServerConfig) -> FastAPI:
@@ -28,17 +37,52 @@ def create_app(config: ServerConfig) -> FastAPI:
     @asynccontextmanager
     async def lifespan(app: FastAPI):
         """Manage application lifecycle - start/stop background tasks."""
-        global _polling_task
+        global _polling_task, _browser_pool, _maintenance_task
 
         # Startup
-        _polling_task = PollingTask(config)
+        app_state.db = AsyncDatabase(Database())
+        app_state.connections.queue_size = config.ws_queue_size
+
+        _browser_pool = BrowserPool(
+            size=config.browser_pool_size,
+            max_uses=config.browser_max_uses,
+            max_memory_mb=config.browser_max_memory_mb,
+            **config.client_options(),
+        )
+        try:
+            await _browser_pool.start()
+        except Exception as e:
+            # Serve cached data and the API anyway; the pool launches the
+            # missing browsers on the polling task's next lease
+            logger.exception(f"Browser pool failed to start: {e}")
+        app_state.browser_pool = _browser_pool
+
+        _polling_task = PollingTask(config, browser_pool=_browser_pool)
+        app_state.poll_scheduler = _polling_task.scheduler
         await _polling_task.start()
 
+        if config.retention_enabled:
+            _maintenance_task = MaintenanceTask(
+                app_state.db, config.retention_policy(), config.maintenance_interval
+            )
+            app_state.maintenance = _maintenance_task
+            await _maintenance_task.start()
+
         yield
 
         # Shutdown
+        if _maintenance_task:
+            await _maintenance_task.stop()
+            app_state.maintenance = None
         if _polling_task:
             await _polling_task.stop()
+        await app_state.connections.close_all()
+        if _browser_pool:
+            await _browser_pool.stop()
+            app_state.browser_pool = None
+        if app_state.db:
+            await app_state.db.close()
+            app_state.db = None
 
     app = FastAPI(
         title="DraftKings NFL API",
@@ -70,9 +114,18 @@ def create_app(config: ServerConfig) -> FastAPI:
                 "games": "/api/games",
                 "health": "/api/health",
                 "history": "/api/history",
+                "metrics": "/metrics",
             },
         }
 
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics():
+        """Scrape timings and counters in Prometheus text format."""
+        return PlainTextResponse(
+            app_state.metrics.render_prometheus(),
+            media_type="text/plain; version=0.0.4",
+        )
+
     @app.post("/api/refresh")
     async def trigger_refresh():
         """Manually trigger a data refresh."""
@@ -0,0 +1,170 @@
+"""Pool of long-lived Chromium instances for the polling task."""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, List, Optional
+
+from ..client import DraftKingsClient
+
+logger = logging.getLogger("dk_cli.server")
+
+
+@dataclass
+class PooledClient:
+    """A warm DraftKingsClient plus its usage bookkeeping.
+
+    ``client`` is None until the slot's browser has launched.
+    """
+
+    slot: int
+    client: Optional[DraftKingsClient] = None
+    uses: int = 0
+    last_memory_mb: Optional[float] = None
+
+
+class BrowserPool:
+    """Keeps warm browsers around and leases them out per fetch.
+
+    Each slot holds an entered DraftKingsClient built from ``client_options``.
+    A lease health-checks the browser before handing it out, and the browser
+    is recycled after ``max_uses`` fetches or once it grows past
+    ``max_memory_mb``. A slot whose browser failed to launch is launched
+    again on its next lease.
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        max_uses: int = 50,
+        max_memory_mb: Optional[int] = None,
+        **client_options,
+    ):
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.client_options = client_options
+        self.launches = 0
+        self.recycles = 0
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._slots: List[PooledClient] = []
+        self._started = False
+
+    async def start(self) -> None:
+        """Launch every browser in the pool.
+
+        Raises if a launch fails; the pool is still started and the
+        unlaunched slots are retried on lease.
+        """
+        for slot in range(self.size):
+            pooled = PooledClient(slot=slot)
+            self._slots.append(pooled)
+            self._idle.put_nowait(pooled)
+        self._started = True
+
+        for pooled in self._slots:
+            pooled.client = await self._launch(pooled.slot)
+        logger.info(f"Started browser pool (size: {self.size})")
+
+    async def stop(self) -> None:
+        """Close every browser in the pool."""
+        self._started = False
+        for pooled in self._slots:
+            await self._close(pooled.client)
+            pooled.client = None
+        self._slots.clear()
+        self._idle = asyncio.Queue()
+        logger.info("Stopped browser pool")
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[DraftKingsClient]:
+        """Borrow a healthy client for the duration of one fetch."""
+        if not self._started:
+            raise RuntimeError("Browser pool not started.")
+
+        pooled = await self._idle.get()
+        try:
+            if pooled.client is None:
+                logger.info(f"Launching browser in slot {pooled.slot}")
+                await self._replace(pooled)
+            elif not pooled.client.is_healthy():
+                logger.warning(f"Browser in slot {pooled.slot} is unhealthy, relaunching")
+                await self._replace(pooled)
+
+            yield pooled.client
+
+            pooled.uses += 1
+            # The fetch has already succeeded; a failed relaunch leaves the
+            # slot empty for the next lease rather than failing this one
+            try:
+                if await self._needs_recycle(pooled):
+                    await self._replace(pooled)
+                    self.recycles += 1
+            except Exception as e:
+                logger.warning(f"Failed to recycle browser in slot {pooled.slot}: {e}")
+        finally:
+            if self._started:
+                self._idle.put_nowait(pooled)
+            else:
+                await self._close(pooled.client)
+
+    def stats(self) -> dict:
+        """Pool status for health checks."""
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "launches": self.launches,
+            "recycles": self.recycles,
+            "slots": [
+                {
+                    "slot": pooled.slot,
+                    "uses": pooled.uses,
+                    "healthy": pooled.client is not None and pooled.client.is_healthy(),
+                    "memory_mb": pooled.last_memory_mb,
+                }
+                for pooled in self._slots
+            ],
+        }
+
+    async def _needs_recycle(self, pooled: PooledClient) -> bool:
+        if self.max_uses and pooled.uses >= self.max_uses:
+            return True
+
+        if self.max_memory_mb:
+            pooled.last_memory_mb = await pooled.client.memory_usage_mb()
+            if pooled.last_memory_mb and pooled.last_memory_mb >= self.max_memory_mb:
+                logger.info(
+                    f"Browser in slot {pooled.slot} at {pooled.last_memory_mb:.0f}MB, recycling"
+                )
+                return True
+
+        return False
+
+    async def _replace(self, pooled: PooledClient) -> None:
+        await self._close(pooled.client)
+        # Left empty if the launch fails, so the next lease tries again
+        pooled.client = None
+        pooled.client = await self._launch(pooled.slot)
+        pooled.uses = 0
+        pooled.last_memory_mb = None
+
+    async def _launch(self, slot: int) -> DraftKingsClient:
+        options = dict(self.client_options)
+        # Chromium locks a profile directory, so each slot gets its own
+        if options.get("user_data_dir"):
+            options["user_data_dir"] = Path(options["user_data_dir"]) / f"slot-{slot}"
+
+        client = DraftKingsClient(**options)
+        await client.__aenter__()
+        self.launches += 1
+        return client
+
+    async def _close(self, client: Optional[DraftKingsClient]) -> None:
+        if client is None:
+            return
+        try:
+            await client.__aexit__(None, None, None)
+        except Exception as e:
+            logger.warning(f"Error closing pooled browser: {e}")
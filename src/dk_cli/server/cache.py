@@ -0,0 +1,157 @@
+"""Pre-encoded API responses with ETag and conditional GET support."""
+
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from fastapi import Request, Response
+
+# Bodies smaller than this are not worth compressing
+MIN_GZIP_SIZE = 1024
+
+
+@dataclass
+class CachedBody:
+    """One encoded response body and its validators."""
+
+    body: bytes
+    gzipped: Optional[bytes]
+    etag: str
+    last_modified: Optional[datetime]
+
+    @property
+    def last_modified_header(self) -> Optional[str]:
+        if self.last_modified is None:
+            return None
+        return format_datetime(self.last_modified.astimezone(timezone.utc), usegmt=True)
+
+
+class ResponseCache:
+    """JSON bodies encoded (and gzipped) once per version of the data.
+
+    ``version`` is whatever changes when the underlying data does; the
+    games routes use the delta sequence number, which advances on every
+    fetch and every streamed change. When it moves on, every entry is
+    dropped and rebuilt on its next request.
+    """
+
+    def __init__(self, min_gzip_size: int = MIN_GZIP_SIZE):
+        self.min_gzip_size = min_gzip_size
+        self._version: Optional[Hashable] = None
+        self._entries: Dict[Hashable, CachedBody] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        key: Hashable,
+        version: Hashable,
+        build: Callable[[], Optional[Any]],
+        last_modified: Optional[datetime] = None,
+    ) -> Optional[CachedBody]:
+        """The cached body for ``key``, building it if stale or missing.
+
+        ``build`` returns the JSON-serializable content, or None when there
+        is nothing to serve. None is not cached, so unknown keys cannot
+        grow the cache.
+        """
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+        if key in self._entries:
+            self.hits += 1
+            return self._entries[key]
+
+        self.misses += 1
+        content = build()
+        if content is None:
+            return None
+        entry = self._entries[key] = self._encode(content, last_modified)
+        return entry
+
+    def respond(self, request: Request, entry: CachedBody) -> Response:
+        """A 200 with the (possibly gzipped) body, or a 304 if the client has it."""
+        headers = {
+            "ETag": entry.etag,
+            # Let clients and proxies keep a copy but revalidate every time
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if entry.last_modified_header:
+            headers["Last-Modified"] = entry.last_modified_header
+
+        if _not_modified(request, entry):
+            return Response(status_code=304, headers=headers)
+
+        body = entry.body
+        accept_encoding = request.headers.get("accept-encoding", "")
+        if entry.gzipped is not None and _accepts_gzip(accept_encoding):
+            body = entry.gzipped
+            headers["Content-Encoding"] = "gzip"
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _encode(self, content: Any, last_modified: Optional[datetime]) -> CachedBody:
+        # Same output as FastAPI's JSONResponse
+        body = json.dumps(
+            content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+        ).encode("utf-8")
+        gzipped = None
+        if len(body) >= self.min_gzip_size:
+            gzipped = gzip.compress(body, compresslevel=6)
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        return CachedBody(body=body, gzipped=gzipped, etag=etag, last_modified=last_modified)
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip, honouring q-values.
+
+    ``gzip;q=0`` refuses it; a ``*`` covers gzip unless gzip is listed.
+    """
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+def _not_modified(request: Request, entry: CachedBody) -> bool:
+    """Whether the request's validators show the client already has ``entry``."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or any(tag.removeprefix("W/") == entry.etag for tag in tags)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and entry.last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        modified = entry.last_modified.astimezone(timezone.utc).replace(microsecond=0)
+        return modified <= since
+    return False
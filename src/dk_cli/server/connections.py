@@ -0,0 +1,233 @@
+"""WebSocket fan-out with one outbound queue and writer task per client."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from fastapi import WebSocket
+
+from ..metrics import MetricsRegistry
+from .encoding import DEFAULT_ENCODING, Payload, encode_message
+from .subscriptions import Subscription
+
+logger = logging.getLogger("dk_cli.server")
+
+# Close code for clients dropped for falling behind ("try again later")
+SLOW_CLIENT_CLOSE_CODE = 1013
+
+
+@dataclass
+class ClientConnection:
+    """One attached WebSocket and its pending outbound frames."""
+
+    websocket: WebSocket
+    queue: "asyncio.Queue[Tuple[Payload, float]]"
+    encoding: str = DEFAULT_ENCODING
+    writer: Optional[asyncio.Task] = None
+    subscription: Subscription = field(default_factory=Subscription)
+    connected_at: float = field(default_factory=time.monotonic)
+
+
+class ConnectionManager:
+    """Attached WebSocket clients and the broadcast fan-out to them.
+
+    Clients are indexed by subscription. A broadcast is rendered once per
+    distinct subscription, encoded once per encoding in use within it, and
+    put on each member's bounded queue without awaiting any socket; each
+    client's writer task drains its own queue. A client whose queue is
+    full has fallen ``queue_size`` messages behind and is disconnected, so
+    one slow link never stalls the rest. It reconnects and gets a fresh
+    snapshot.
+
+    All sends to a client, including direct replies, go through its queue
+    so frames are never written to one socket concurrently.
+    """
+
+    def __init__(
+        self,
+        metrics: Optional[MetricsRegistry] = None,
+        queue_size: int = 64,
+        send_timeout: float = 10.0,
+    ):
+        self.metrics = metrics or MetricsRegistry()
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self._clients: Dict[WebSocket, ClientConnection] = {}
+        self._groups: Dict[Subscription, Set[WebSocket]] = {}
+        # Closes of dropped clients; the loop only holds tasks weakly
+        self._closing: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    async def connect(
+        self, websocket: WebSocket, encoding: str = DEFAULT_ENCODING
+    ) -> ClientConnection:
+        """Accept a WebSocket and start its writer task."""
+        await websocket.accept()
+        client = ClientConnection(
+            websocket, asyncio.Queue(maxsize=self.queue_size), encoding=encoding
+        )
+        client.writer = asyncio.create_task(self._write(client))
+        self._clients[websocket] = client
+        self._groups.setdefault(client.subscription, set()).add(websocket)
+        self._record_clients()
+        return client
+
+    def disconnect(self, websocket: WebSocket) -> None:
+        """Forget a client and stop its writer. Safe to call twice."""
+        client = self._clients.pop(websocket, None)
+        if client is None:
+            return
+        self._leave_group(client)
+        if client.writer and client.writer is not asyncio.current_task():
+            client.writer.cancel()
+        self._record_clients()
+
+    def subscription(self, websocket: WebSocket) -> Subscription:
+        """A client's current subscription (everything if unknown)."""
+        client = self._clients.get(websocket)
+        return client.subscription if client else Subscription()
+
+    def subscribe(self, websocket: WebSocket, subscription: Subscription) -> None:
+        """Replace a client's subscription."""
+        client = self._clients.get(websocket)
+        if client is None:
+            return
+        self._leave_group(client)
+        client.subscription = subscription
+        self._groups.setdefault(subscription, set()).add(websocket)
+        self._record_clients()
+
+    def send(self, websocket: WebSocket, message: dict) -> None:
+        """Queue a message for one client."""
+        client = self._clients.get(websocket)
+        if client is not None:
+            self._enqueue(client, encode_message(message, client.encoding), time.perf_counter())
+
+    async def broadcast(self, message: dict) -> None:
+        """Queue a message for every client, filtered by subscription."""
+        await self.publish(lambda subscription: subscription.filter_message(message))
+
+    async def publish(self, render: Callable[[Subscription], dict]) -> None:
+        """Queue ``render(subscription)`` for each client.
+
+        ``render`` is called once per distinct subscription and its result
+        encoded once per encoding, not once per client.
+        """
+        if not self._clients:
+            return
+
+        started = time.perf_counter()
+        for subscription, members in list(self._groups.items()):
+            message = render(subscription)
+            payloads: Dict[str, Payload] = {}
+            for websocket in list(members):
+                client = self._clients.get(websocket)
+                if client is None:
+                    continue
+                if client.encoding not in payloads:
+                    payloads[client.encoding] = encode_message(message, client.encoding)
+                self._enqueue(client, payloads[client.encoding], started)
+
+        self.metrics.observe(
+            "dk_ws_fanout_seconds", time.perf_counter() - started,
+            help="Time to encode a broadcast and queue it for every client",
+        )
+        self.metrics.set_gauge(
+            "dk_ws_queue_depth",
+            max((client.queue.qsize() for client in self._clients.values()), default=0),
+            help="Deepest client outbound queue after the last broadcast",
+        )
+
+    async def close_all(self) -> None:
+        """Stop every writer and finish closing dropped clients, for shutdown."""
+        for websocket in list(self._clients):
+            self.disconnect(websocket)
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+    def stats(self) -> dict:
+        """Client count and queue depths for health checks."""
+        depths = [client.queue.qsize() for client in self._clients.values()]
+        encodings: Dict[str, int] = {}
+        for client in self._clients.values():
+            encodings[client.encoding] = encodings.get(client.encoding, 0) + 1
+        return {
+            "clients": len(depths),
+            "encodings": encodings,
+            "subscription_groups": len(self._groups),
+            "queue_size": self.queue_size,
+            "max_queue_depth": max(depths, default=0),
+            "queued_messages": sum(depths),
+        }
+
+    def _enqueue(self, client: ClientConnection, payload: Payload, started: float) -> None:
+        try:
+            client.queue.put_nowait((payload, started))
+        except asyncio.QueueFull:
+            self._drop(client, "slow")
+
+    async def _write(self, client: ClientConnection) -> None:
+        """Drain one client's queue onto its socket."""
+        try:
+            while True:
+                payload, started = await client.queue.get()
+                if isinstance(payload, bytes):
+                    send = client.websocket.send_bytes(payload)
+                else:
+                    send = client.websocket.send_text(payload)
+                await asyncio.wait_for(send, timeout=self.send_timeout)
+                self.metrics.observe(
+                    "dk_ws_send_seconds", time.perf_counter() - started,
+                    help="Time from queueing a message to writing it to a client",
+                )
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            self._drop(client, "timeout")
+        except Exception:
+            # The socket went away; the endpoint's receive loop cleans up too
+            self.disconnect(client.websocket)
+
+    def _drop(self, client: ClientConnection, reason: str) -> None:
+        """Disconnect a client that fell behind."""
+        if client.websocket not in self._clients:
+            return
+        self.disconnect(client.websocket)
+        self.metrics.inc(
+            "dk_ws_dropped_total", help="Clients disconnected for falling behind", reason=reason
+        )
+        logger.warning(
+            f"Dropping WebSocket client ({reason}): "
+            f"{client.queue.qsize()} messages queued"
+        )
+        task = asyncio.create_task(self._close(client.websocket))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close(self, websocket: WebSocket) -> None:
+        try:
+            await asyncio.wait_for(
+                websocket.close(code=SLOW_CLIENT_CLOSE_CODE), timeout=self.send_timeout
+            )
+        except Exception:
+            pass
+
+    def _leave_group(self, client: ClientConnection) -> None:
+        members = self._groups.get(client.subscription)
+        if members is not None:
+            members.discard(client.websocket)
+            if not members:
+                del self._groups[client.subscription]
+
+    def _record_clients(self) -> None:
+        self.metrics.set_gauge(
+            "dk_ws_clients", len(self._clients), help="Attached WebSocket clients"
+        )
+        self.metrics.set_gauge(
+            "dk_ws_subscription_groups", len(self._groups),
+            help="Distinct subscriptions, each encoded once per broadcast",
+        )
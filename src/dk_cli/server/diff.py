@@ -0,0 +1,100 @@
+"""Field-level diffs between consecutive game snapshots for WebSocket deltas."""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List
+
+from ..models import NFLGame
+
+# Stamped on every fetch, so comparing it would mark every game as changed
+IGNORED_FIELDS = frozenset({"fetched_at"})
+
+
+def diff_dict(old: dict, new: dict) -> dict:
+    """Nested dict of the leaves of ``new`` that differ from ``old``.
+
+    Applying the result to ``old`` with a recursive merge yields ``new``.
+    """
+    changes = {}
+    for key, value in new.items():
+        if key in IGNORED_FIELDS:
+            continue
+        previous = old.get(key)
+        if isinstance(value, dict) and isinstance(previous, dict):
+            nested = diff_dict(previous, value)
+            if nested:
+                changes[key] = nested
+        elif value != previous or key not in old:
+            changes[key] = value
+    return changes
+
+
+@dataclass
+class Delta:
+    """Changes between two states of the slate, numbered by ``seq``.
+
+    ``games`` (the full current dict of every changed game) and
+    ``previous_status`` are not sent; subscription filters use them.
+    """
+
+    seq: int
+    changed: Dict[str, dict] = field(default_factory=dict)
+    added: List[dict] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    games: Dict[str, dict] = field(default_factory=dict)
+    previous_status: Dict[str, str] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.changed or self.added or self.removed)
+
+    def to_dict(self) -> dict:
+        return {
+            "seq": self.seq,
+            "changed": self.changed,
+            "added": self.added,
+            "removed": self.removed,
+        }
+
+
+class DeltaEngine:
+    """Tracks the last broadcast snapshot per game_id and numbers updates.
+
+    Every call to ``update`` advances ``seq`` by one, so a client that sees
+    a gap in the sequence knows it missed an update and should resync from
+    a full snapshot.
+    """
+
+    def __init__(self):
+        self.seq = 0
+        self._snapshot: Dict[str, dict] = {}
+
+    def update(self, games: Iterable[NFLGame], complete: bool) -> Delta:
+        """Diff ``games`` against the last snapshot and advance ``seq``.
+
+        ``complete`` means ``games`` is the whole slate, so games missing
+        from it are reported as removed; streamed changes pass False.
+        """
+        self.seq += 1
+        delta = Delta(seq=self.seq)
+
+        seen = set()
+        for game in games:
+            current = game.to_dict()
+            seen.add(game.game_id)
+            previous = self._snapshot.get(game.game_id)
+            if previous is None:
+                delta.added.append(current)
+            else:
+                changes = diff_dict(previous, current)
+                if changes:
+                    delta.changed[game.game_id] = changes
+                    delta.games[game.game_id] = current
+                    if "status" in changes:
+                        delta.previous_status[game.game_id] = previous.get("status")
+            self._snapshot[game.game_id] = current
+
+        if complete:
+            delta.removed = [game_id for game_id in self._snapshot if game_id not in seen]
+            for game_id in delta.removed:
+                del self._snapshot[game_id]
+
+        return delta
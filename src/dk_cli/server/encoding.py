@@ -0,0 +1,90 @@
+"""Wire encodings for WebSocket messages, chosen per client at connect time.
+
+- ``json``: compact JSON text frames (the default).
+- ``msgpack``: MessagePack binary frames. Needs the optional ``msgpack``
+  package: ``pip install 'dk-cli[msgpack]'``.
+- ``columnar``: JSON text where every list of full games (``games``, and
+  ``added`` in deltas) becomes ``{"columns": [...], "rows": [[...], ...]}``.
+  Column names are dotted paths into the game dict, such as
+  ``betting_lines.spread.home.line``, so key strings are sent once per
+  message instead of once per game.
+
+Per-message compression (permessage-deflate) is separate and negotiated by
+the WebSocket handshake itself; see ``ws_compression`` in the config.
+"""
+
+import json
+from typing import Dict, List, Optional, Union
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+ENCODINGS = ("json", "msgpack", "columnar")
+
+DEFAULT_ENCODING = "json"
+
+# Message keys that hold lists of full game dicts
+GAME_LIST_KEYS = ("games", "added")
+
+Payload = Union[str, bytes]
+
+
+def available_encodings() -> List[str]:
+    """Encodings this server can produce."""
+    return [name for name in ENCODINGS if name != "msgpack" or msgpack is not None]
+
+
+def encode_message(message: dict, encoding: str = DEFAULT_ENCODING) -> Payload:
+    """Encode a message for the wire: ``str`` for text frames, ``bytes`` for binary."""
+    if encoding == "msgpack":
+        return msgpack.packb(message, use_bin_type=True)
+    if encoding == "columnar":
+        message = to_columnar(message)
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+def decode_message(data: Payload) -> dict:
+    """Decode a client message: JSON text, or MessagePack bytes."""
+    if isinstance(data, bytes):
+        if msgpack is None:
+            raise ValueError("Binary messages need msgpack on the server")
+        return msgpack.unpackb(data, raw=False)
+    return json.loads(data)
+
+
+def to_columnar(message: dict) -> dict:
+    """Replace each list of full games in a message with columns and rows."""
+    converted = message
+    for key in GAME_LIST_KEYS:
+        games = message.get(key)
+        if isinstance(games, list):
+            if converted is message:
+                converted = dict(message)
+            converted[key] = games_to_columns(games)
+    return converted
+
+
+def games_to_columns(games: List[dict]) -> dict:
+    """Flatten game dicts into one column list and a row per game."""
+    flat = [_flatten(game) for game in games]
+    columns = list(dict.fromkeys(name for row in flat for name in row))
+    return {
+        "columns": columns,
+        "rows": [[row.get(name) for name in columns] for row in flat],
+    }
+
+
+def _flatten(
+    value: dict, prefix: str = "", out: Optional[Dict[str, object]] = None
+) -> Dict[str, object]:
+    if out is None:
+        out = {}
+    for key, item in value.items():
+        name = f"{prefix}{key}"
+        if isinstance(item, dict):
+            _flatten(item, f"{name}.", out)
+        else:
+            out[name] = item
+    return out
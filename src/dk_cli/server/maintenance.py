@@ -0,0 +1,77 @@
+"""Background retention and vacuum job for the history database."""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+
+from ..database import AsyncDatabase
+from ..retention import RetentionPolicy, RetentionReport
+
+logger = logging.getLogger("dk_cli.server")
+
+
+class MaintenanceTask:
+    """Applies the retention policy and reclaims free pages on an interval."""
+
+    def __init__(self, db: AsyncDatabase, policy: RetentionPolicy, interval: float = 3600):
+        self.db = db
+        self.policy = policy
+        self.interval = interval
+        self.last_run: Optional[datetime] = None
+        self.last_report: Optional[RetentionReport] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event = asyncio.Event()
+
+    async def start(self) -> None:
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._loop())
+        logger.info(f"Started maintenance task (interval: {self.interval}s)")
+
+    async def stop(self) -> None:
+        self._stop_event.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _loop(self) -> None:
+        # First pass after one interval, so startup stays fast
+        while not self._stop_event.is_set():
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self.interval)
+                break
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Maintenance error: {e}")
+
+    async def run_once(self) -> RetentionReport:
+        """Apply retention, then incrementally vacuum."""
+        report = await self.db.apply_retention(self.policy)
+        report.pages_vacuumed = await self.db.incremental_vacuum()
+
+        self.last_run = datetime.now()
+        self.last_report = report
+        logger.info(
+            f"Maintenance: rolled up {report.raw_rows_rolled_up} raw and "
+            f"{report.minute_rows_rolled_up} minute rows, archived "
+            f"{report.hour_rows_archived} hour rows, freed {report.pages_vacuumed} pages"
+        )
+        return report
+
+    def status(self) -> dict:
+        """Last run for health checks."""
+        return {
+            "interval": self.interval,
+            "raw_days": self.policy.raw_days,
+            "minute_days": self.policy.minute_days,
+            "archive_days": self.policy.archive_days,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "last_report": self.last_report.to_dict() if self.last_report else None,
+        }
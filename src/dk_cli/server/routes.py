@@ -3,14 +3,13 @@
 from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel, Field
 
-from ..database import Database
+from ..database import AsyncDatabase, Database, InsufficientFundsError
 from ..models import Bet
 from ..betting import (
     calculate_payout,
-    determine_bet_result,
     generate_mock_scores,
     validate_bet_placement,
 )
@@ -32,6 +31,13 @@ class PlaceBetRequest(BaseModel):
 router = APIRouter()
 
 
+def _get_db() -> AsyncDatabase:
+    """The shared database from the app lifespan, created on first use otherwise."""
+    if app_state.db is None:
+        app_state.db = AsyncDatabase(Database())
+    return app_state.db
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -42,15 +48,26 @@ async def health_check():
         ),
         "is_fetching": app_state.is_fetching,
         "game_count": len(app_state.games),
-        "websocket_clients": len(app_state.websocket_connections),
+        "websocket_clients": len(app_state.connections),
+        "websocket": app_state.connections.stats(),
         "fetch_count": app_state.fetch_count,
         "last_error": app_state.last_error,
+        "browser_pool": (
+            app_state.browser_pool.stats() if app_state.browser_pool else None
+        ),
+        "schedule": (
+            app_state.poll_scheduler.status() if app_state.poll_scheduler else None
+        ),
+        "maintenance": (
+            app_state.maintenance.status() if app_state.maintenance else None
+        ),
+        "last_fetch": [metrics.to_dict() for metrics in app_state.last_fetch_metrics],
+        "response_cache": app_state.response_cache.stats(),
+        "metrics": app_state.metrics.summary(),
     }
 
 
-@router.get("/games")
-async def get_games():
-    """Get current NFL games with betting lines."""
+def _games_content() -> dict:
     if not app_state.games:
         return {
             "games": [],
@@ -67,21 +84,45 @@ async def get_games():
     }
 
 
-@router.get("/games/{game_id}")
-async def get_game(game_id: str):
-    """Get a specific game by ID."""
+def _game_content(game_id: str) -> Optional[dict]:
     for game in app_state.games:
         if game.game_id == game_id:
             return {"game": game.to_dict()}
+    return None
 
-    raise HTTPException(status_code=404, detail=f"Game not found: {game_id}")
+
+@router.get("/games")
+async def get_games(request: Request):
+    """Get current NFL games with betting lines.
+
+    The body is encoded once per update and served with an ETag, so a
+    client sending If-None-Match gets a 304 until the games change.
+    """
+    cache = app_state.response_cache
+    entry = cache.get(
+        "games", app_state.deltas.seq, _games_content, app_state.last_updated
+    )
+    return cache.respond(request, entry)
+
+
+@router.get("/games/{game_id}")
+async def get_game(game_id: str, request: Request):
+    """Get a specific game by ID."""
+    cache = app_state.response_cache
+    entry = cache.get(
+        ("game", game_id), app_state.deltas.seq,
+        lambda: _game_content(game_id), app_state.last_updated,
+    )
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Game not found: {game_id}")
+    return cache.respond(request, entry)
 
 
 @router.get("/games/{game_id}/history")
 async def get_game_history(game_id: str):
     """Get historical line movements for a game."""
-    db = Database()
-    history = db.get_line_history(game_id)
+    db = _get_db()
+    history = await db.get_line_history(game_id)
 
     if not history:
         raise HTTPException(status_code=404, detail=f"No history for game: {game_id}")
@@ -93,9 +134,10 @@ async def get_game_history(game_id: str):
 async def get_historical_games(
     since: Optional[str] = Query(None, description="ISO datetime to filter from"),
     limit: int = Query(50, ge=1, le=500, description="Max results"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
 ):
-    """Get historical games from database."""
-    db = Database()
+    """Get historical games from database, newest first."""
+    db = _get_db()
 
     since_dt = None
     if since:
@@ -104,16 +146,23 @@ async def get_historical_games(
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid datetime format")
 
-    games = db.get_games(since=since_dt, limit=limit)
+    try:
+        games, next_cursor = await db.get_games_page(since=since_dt, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return {"games": [g.to_dict() for g in games], "count": len(games)}
+    return {
+        "games": [g.to_dict() for g in games],
+        "count": len(games),
+        "next_cursor": next_cursor,
+    }
 
 
 @router.get("/game-ids")
 async def get_game_ids():
     """Get list of all game IDs in database."""
-    db = Database()
-    game_ids = db.get_unique_games()
+    db = _get_db()
+    game_ids = await db.get_unique_games()
 
     return {"game_ids": game_ids, "count": len(game_ids)}
 
@@ -123,18 +172,28 @@ async def get_game_ids():
 @router.get("/bankroll")
 async def get_bankroll():
     """Get current bankroll balance."""
-    db = Database()
-    bankroll = db.get_bankroll()
+    db = _get_db()
+    bankroll = await db.get_bankroll()
     return bankroll.to_dict()
 
 
+@router.get("/bankroll/transactions")
+async def get_bankroll_transactions(
+    limit: int = Query(50, ge=1, le=500, description="Max results"),
+):
+    """Get recent bankroll ledger entries, newest first."""
+    db = _get_db()
+    transactions = await db.get_transactions(limit=limit)
+    return {"transactions": transactions, "count": len(transactions)}
+
+
 @router.post("/bets")
 async def place_bet(request: PlaceBetRequest):
     """Place a new bet."""
-    db = Database()
+    db = _get_db()
 
     # Validate bet
-    bankroll = db.get_bankroll()
+    bankroll = await db.get_bankroll()
     is_valid, error = validate_bet_placement(request.stake, bankroll.balance)
     if not is_valid:
         raise HTTPException(status_code=400, detail=error)
@@ -160,8 +219,12 @@ async def place_bet(request: PlaceBetRequest):
         line_value=request.line_value,
     )
 
-    saved_bet = db.place_bet(bet)
-    updated_bankroll = db.get_bankroll()
+    # The balance check above is advisory; place_bet re-checks atomically
+    try:
+        saved_bet = await db.place_bet(bet)
+    except InsufficientFundsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    updated_bankroll = await db.get_bankroll()
 
     return {
         "bet": saved_bet.to_dict(),
@@ -173,27 +236,40 @@ async def place_bet(request: PlaceBetRequest):
 async def get_bets(
     status: Optional[str] = Query(None, description="Filter by status: pending, won, lost, push"),
     limit: int = Query(50, ge=1, le=200, description="Max results"),
-    offset: int = Query(0, ge=0, description="Offset for pagination"),
+    offset: int = Query(0, ge=0, description="Offset for pagination (prefer cursor)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
 ):
-    """Get bet history with optional filters."""
-    db = Database()
-
-    bets = db.get_bets(status=status, limit=limit, offset=offset)
-    total_count = db.get_bets_count(status=status)
+    """Get bet history with optional filters, newest first.
+
+    Pass the returned next_cursor to fetch the following page; it stays
+    fast however deep the page. offset is kept for existing clients.
+    """
+    db = _get_db()
+
+    try:
+        if offset and not cursor:
+            bets = await db.get_bets(status=status, limit=limit, offset=offset)
+            next_cursor = None
+        else:
+            bets, next_cursor = await db.get_bets_page(status=status, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total_count = await db.get_bets_count(status=status)
 
     return {
         "bets": [b.to_dict() for b in bets],
         "total_count": total_count,
         "limit": limit,
         "offset": offset,
+        "next_cursor": next_cursor,
     }
 
 
 @router.get("/bets/{bet_id}")
 async def get_bet(bet_id: int):
     """Get a specific bet by ID."""
-    db = Database()
-    bet = db.get_bet(bet_id)
+    db = _get_db()
+    bet = await db.get_bet(bet_id)
 
     if not bet:
         raise HTTPException(status_code=404, detail=f"Bet not found: {bet_id}")
@@ -204,45 +280,24 @@ async def get_bet(bet_id: int):
 @router.post("/games/{game_id}/settle")
 async def settle_game(game_id: str):
     """Simulate game end with random scores and settle all pending bets."""
-    db = Database()
-
-    # Get pending bets for this game
-    pending_bets = db.get_pending_bets_for_game(game_id)
-
-    if not pending_bets:
-        raise HTTPException(
-            status_code=400,
-            detail=f"No pending bets for game: {game_id}"
-        )
+    db = _get_db()
 
     # Generate mock scores
     home_score, away_score = generate_mock_scores()
 
-    # Settle each bet
-    settled_bets = []
-    for bet in pending_bets:
-        status, result_amount = determine_bet_result(
-            bet_type=bet.bet_type,
-            line_value=bet.line_value,
-            odds=bet.odds,
-            stake=bet.stake,
-            home_score=home_score,
-            away_score=away_score,
-        )
+    # Settle every pending bet in one transaction
+    settled = await db.settle_games({game_id: (home_score, away_score)})
 
-        settled_bet = db.settle_bet(
-            bet_id=bet.id,
-            status=status,
-            result_amount=result_amount,
-            home_score=home_score,
-            away_score=away_score,
+    if not settled:
+        raise HTTPException(
+            status_code=400,
+            detail=f"No pending bets for game: {game_id}"
         )
 
-        if settled_bet:
-            settled_bets.append(settled_bet.to_dict())
+    settled_bets = [bet.to_dict() for bet in settled]
 
     # Get updated bankroll
-    updated_bankroll = db.get_bankroll()
+    updated_bankroll = await db.get_bankroll()
 
     return {
         "game_id": game_id,
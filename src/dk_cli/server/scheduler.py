@@ -0,0 +1,154 @@
+"""Adaptive poll scheduling driven by kickoff proximity and line volatility."""
+
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Deque, Dict, List, Optional, Tuple
+
+from ..models import NFLGame
+
+
+@dataclass
+class ScheduleDecision:
+    """The interval chosen for the next fetch and why."""
+
+    interval: float
+    reason: str
+    decided_at: datetime
+
+    @property
+    def next_fetch_at(self) -> datetime:
+        return self.decided_at + timedelta(seconds=self.interval)
+
+
+class PollScheduler:
+    """Chooses the delay before the next fetch.
+
+    The base interval is scaled by how close the next kickoff is, tightened
+    to ``min_interval`` while games are live, and stretched overnight unless
+    a kickoff is close. Lines that moved on most recent fetches halve the
+    interval; a window of unchanged fetches doubles it. The result is
+    clamped to [min_interval, max_interval].
+    """
+
+    # (kickoff within, multiplier of base interval)
+    KICKOFF_TIERS = (
+        (timedelta(minutes=30), 0.0),
+        (timedelta(hours=3), 0.5),
+        (timedelta(hours=24), 1.0),
+        (timedelta(hours=72), 3.0),
+    )
+
+    def __init__(
+        self,
+        base_interval: float,
+        min_interval: float,
+        max_interval: float,
+        volatility_window: int = 10,
+        quiet_hours: Tuple[int, int] = (1, 8),
+    ):
+        self.base_interval = base_interval
+        self.min_interval = min(min_interval, base_interval)
+        self.max_interval = max(max_interval, base_interval)
+        self.quiet_hours = quiet_hours
+        self._changes: Deque[bool] = deque(maxlen=volatility_window)
+        self._fingerprints: Dict[str, tuple] = {}
+        self.last_decision: Optional[ScheduleDecision] = None
+
+    def observe(self, games: List[NFLGame]) -> None:
+        """Record whether any line moved since the previous fetch."""
+        fingerprints = {game.game_id: _fingerprint(game) for game in games}
+        if self._fingerprints:
+            changed = any(
+                self._fingerprints.get(game_id) != fingerprint
+                for game_id, fingerprint in fingerprints.items()
+            )
+            self._changes.append(changed)
+        self._fingerprints = fingerprints
+
+    @property
+    def change_rate(self) -> Optional[float]:
+        """Fraction of recent fetches where any line moved."""
+        if not self._changes:
+            return None
+        return sum(self._changes) / len(self._changes)
+
+    def next_interval(
+        self, games: List[NFLGame], now: Optional[datetime] = None
+    ) -> ScheduleDecision:
+        """Decide how long to wait before the next fetch."""
+        now = now or datetime.now()
+        interval, reason = self._kickoff_interval(games, now)
+
+        if reason != "live games":
+            rate = self.change_rate
+            if rate is not None and rate >= 0.5:
+                interval /= 2
+                reason += ", volatile lines"
+            elif rate == 0 and len(self._changes) == self._changes.maxlen:
+                interval *= 2
+                reason += ", lines static"
+
+            # Overnight backoff never overrides an imminent kickoff
+            start_hour, end_hour = self.quiet_hours
+            if start_hour <= now.hour < end_hour and interval >= self.base_interval:
+                interval = self.max_interval
+                reason = "overnight"
+
+        interval = max(self.min_interval, min(self.max_interval, interval))
+        self.last_decision = ScheduleDecision(interval=interval, reason=reason, decided_at=now)
+        return self.last_decision
+
+    def status(self) -> dict:
+        """Current schedule for health checks."""
+        decision = self.last_decision
+        return {
+            "base_interval": self.base_interval,
+            "min_interval": self.min_interval,
+            "max_interval": self.max_interval,
+            "change_rate": self.change_rate,
+            "next_interval": decision.interval if decision else None,
+            "next_fetch_at": decision.next_fetch_at.isoformat() if decision else None,
+            "reason": decision.reason if decision else None,
+        }
+
+    def _kickoff_interval(self, games: List[NFLGame], now: datetime) -> Tuple[float, str]:
+        if any(game.status == "live" for game in games):
+            return self.min_interval, "live games"
+
+        # A start time the parser made up is the fetch time, which would
+        # look like an imminent kickoff on every poll
+        upcoming = [
+            game.start_time - now
+            for game in games
+            if game.status == "upcoming"
+            and game.start_time_known
+            and game.start_time >= now - timedelta(hours=1)
+        ]
+        if not upcoming:
+            return self.base_interval, "no upcoming games"
+
+        until_kickoff = min(upcoming)
+        for within, multiplier in self.KICKOFF_TIERS:
+            if until_kickoff <= within:
+                return (
+                    max(self.min_interval, self.base_interval * multiplier),
+                    f"kickoff within {_format_delta(within)}",
+                )
+
+        return self.max_interval, "no kickoff within 72h"
+
+
+def _fingerprint(game: NFLGame) -> tuple:
+    bl = game.betting_lines
+    return (
+        game.status,
+        bl.money_line.home, bl.money_line.away,
+        bl.spread.home_line, bl.spread.home_odds, bl.spread.away_line, bl.spread.away_odds,
+        bl.total.over_line, bl.total.over_odds, bl.total.under_line, bl.total.under_odds,
+    )
+
+
+def _format_delta(delta: timedelta) -> str:
+    minutes = int(delta.total_seconds() // 60)
+    return f"{minutes // 60}h" if minutes >= 60 else f"{minutes}m"
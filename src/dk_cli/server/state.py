@@ -3,11 +3,19 @@
 import asyncio
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional, Set
+from typing import List, Optional
 
 from fastapi import WebSocket
 
+from ..database import AsyncDatabase
+from ..metrics import FetchMetrics, MetricsRegistry
 from ..models import NFLGame
+from .browser_pool import BrowserPool
+from .cache import ResponseCache
+from .connections import ConnectionManager
+from .diff import Delta, DeltaEngine
+from .maintenance import MaintenanceTask
+from .scheduler import PollScheduler
 
 
 @dataclass
@@ -15,9 +23,12 @@ class AppState:
     """Shared application state for the server.
 
     This singleton manages:
-    - Cached games data from latest fetch
-    - WebSocket connections for broadcasting updates
+    - Cached games data from latest fetch, the delta engine that numbers
+      each change to it for WebSocket clients, and pre-encoded responses
+    - WebSocket connections and the broadcast fan-out to them
     - Fetch status for health checks
+    - The shared Database, browser pool, poll scheduler and maintenance job
+    - Rolling scrape metrics for /api/health and /metrics
     """
 
     games: List[NFLGame] = field(default_factory=list)
@@ -25,16 +36,38 @@ class AppState:
     is_fetching: bool = False
     last_error: Optional[str] = None
     fetch_count: int = 0
-    websocket_connections: Set[WebSocket] = field(default_factory=set)
+    deltas: DeltaEngine = field(default_factory=DeltaEngine)
+    response_cache: ResponseCache = field(default_factory=ResponseCache)
+    connections: ConnectionManager = field(init=False)
+    db: Optional[AsyncDatabase] = None
+    browser_pool: Optional[BrowserPool] = None
+    poll_scheduler: Optional[PollScheduler] = None
+    maintenance: Optional[MaintenanceTask] = None
+    metrics: MetricsRegistry = field(default_factory=MetricsRegistry)
+    last_fetch_metrics: List[FetchMetrics] = field(default_factory=list)
     _lock: asyncio.Lock = field(default_factory=asyncio.Lock)
 
-    async def update_games(self, games: List[NFLGame]) -> None:
-        """Update cached games with thread safety."""
+    def __post_init__(self) -> None:
+        self.connections = ConnectionManager(self.metrics)
+
+    async def update_games(self, games: List[NFLGame]) -> Delta:
+        """Replace the cached slate and return what changed."""
         async with self._lock:
             self.games = games
             self.last_updated = datetime.now()
             self.fetch_count += 1
             self.last_error = None
+            return self.deltas.update(games, complete=True)
+
+    async def update_game_lines(self, games: List[NFLGame]) -> Delta:
+        """Merge changed games into the cache, keyed by game_id."""
+        async with self._lock:
+            changed = {game.game_id: game for game in games}
+            merged = [changed.pop(game.game_id, game) for game in self.games]
+            self.games = merged + list(changed.values())
+            self.last_updated = datetime.now()
+            self.last_error = None
+            return self.deltas.update(games, complete=False)
 
     async def set_error(self, error: str) -> None:
         """Record a fetch error."""
@@ -45,29 +78,46 @@ class AppState:
         """Get games as list of dicts for JSON serialization."""
         return [game.to_dict() for game in self.games]
 
-    async def connect_websocket(self, websocket: WebSocket) -> None:
+    def snapshot(self) -> dict:
+        """Full-slate message fields, tagged with the current delta seq.
+
+        Clients apply deltas numbered seq + 1 onwards on top of it.
+        """
+        return {
+            "seq": self.deltas.seq,
+            "game_count": len(self.games),
+            "games": self.get_games_dict(),
+            "last_updated": (
+                self.last_updated.isoformat() if self.last_updated else None
+            ),
+        }
+
+    async def connect_websocket(self, websocket: WebSocket, encoding: str = "json") -> None:
         """Register a new WebSocket connection."""
-        await websocket.accept()
-        self.websocket_connections.add(websocket)
+        await self.connections.connect(websocket, encoding)
 
     def disconnect_websocket(self, websocket: WebSocket) -> None:
         """Remove a WebSocket connection."""
-        self.websocket_connections.discard(websocket)
+        self.connections.disconnect(websocket)
 
     async def broadcast(self, message: dict) -> None:
-        """Broadcast message to all connected WebSocket clients."""
-        if not self.websocket_connections:
-            return
-
-        disconnected = set()
-        for ws in self.websocket_connections:
-            try:
-                await ws.send_json(message)
-            except Exception:
-                disconnected.add(ws)
-
-        for ws in disconnected:
-            self.websocket_connections.discard(ws)
+        """Queue a message for every connected WebSocket client.
+
+        Game lists are filtered by each client's subscription. Returns once
+        the message is queued; each client's writer sends it.
+        """
+        await self.connections.broadcast(message)
+
+    async def broadcast_delta(self, delta: Delta) -> None:
+        """Queue a games_delta, filtered per subscription."""
+        timestamp = datetime.now().isoformat()
+        await self.connections.publish(
+            lambda subscription: {
+                "type": "games_delta",
+                "timestamp": timestamp,
+                **subscription.filter_delta(delta),
+            }
+        )
 
 
 # Global singleton state instance
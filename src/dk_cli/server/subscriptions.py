@@ -0,0 +1,176 @@
+"""Per-client WebSocket subscriptions by game, status and market."""
+
+from dataclasses import dataclass
+from typing import FrozenSet, Iterable, List, Optional, Union
+
+from .diff import Delta
+
+# Market names accepted from clients -> betting_lines keys
+MARKETS = {
+    "moneyline": "money_line",
+    "money_line": "money_line",
+    "spread": "spread",
+    "total": "total",
+}
+
+
+def _names(field: str, value: Union[str, Iterable[str], None]) -> Optional[FrozenSet[str]]:
+    """A message field's names: one string or a list of them."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return frozenset([value])
+    if not isinstance(value, list) or not all(isinstance(item, (str, int)) for item in value):
+        raise ValueError(f"{field} must be a string or a list of strings")
+    return frozenset(str(item) for item in value)
+
+
+@dataclass(frozen=True)
+class Subscription:
+    """Which games and markets a client wants; None means no restriction.
+
+    Subscriptions are hashable so clients with the same filter can share
+    one rendered and encoded copy of each message.
+    """
+
+    game_ids: Optional[FrozenSet[str]] = None
+    statuses: Optional[FrozenSet[str]] = None
+    markets: Optional[FrozenSet[str]] = None
+
+    @property
+    def is_all(self) -> bool:
+        return self.game_ids is None and self.statuses is None and self.markets is None
+
+    def subscribe(self, message: dict) -> "Subscription":
+        """Widen with a subscribe message's game_ids, status and markets.
+
+        A subscribe message with none of them resets to everything. A
+        field that was unrestricted becomes restricted to the given names.
+
+        Raises:
+            ValueError: an unknown market name.
+        """
+        game_ids, statuses, markets = self._parse(message)
+        if game_ids is None and statuses is None and markets is None:
+            return Subscription()
+        return Subscription(
+            game_ids=_union(self.game_ids, game_ids),
+            statuses=_union(self.statuses, statuses),
+            markets=_union(self.markets, markets),
+        )
+
+    def unsubscribe(self, message: dict) -> "Subscription":
+        """Narrow by removing an unsubscribe message's names.
+
+        Names can only be removed from a field that is already restricted.
+        """
+        game_ids, statuses, markets = self._parse(message)
+        return Subscription(
+            game_ids=_difference(self.game_ids, game_ids),
+            statuses=_difference(self.statuses, statuses),
+            markets=_difference(self.markets, markets),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "game_ids": sorted(self.game_ids) if self.game_ids is not None else None,
+            "status": sorted(self.statuses) if self.statuses is not None else None,
+            "markets": sorted(self.markets) if self.markets is not None else None,
+        }
+
+    def filter_message(self, message: dict) -> dict:
+        """Restrict a message's ``games`` list; other messages pass through."""
+        if self.is_all or "games" not in message:
+            return message
+        games = self.filter_games(message["games"])
+        filtered = {**message, "games": games}
+        if "game_count" in message:
+            filtered["game_count"] = len(games)
+        return filtered
+
+    def filter_games(self, games: List[dict]) -> List[dict]:
+        return [self._trim_game(game) for game in games if self._visible(game)]
+
+    def filter_delta(self, delta: Delta) -> dict:
+        """A delta as this subscriber sees it, under the same seq.
+
+        A game whose status moves into the filter arrives in ``added`` and
+        one that moves out arrives in ``removed``, so a client's view stays
+        consistent with the snapshot it would get by resyncing.
+        """
+        if self.is_all:
+            return delta.to_dict()
+
+        changed = {}
+        added = [self._trim_game(game) for game in delta.added if self._visible(game)]
+        removed = [game_id for game_id in delta.removed if self._wants_game(game_id)]
+
+        for game_id, patch in delta.changed.items():
+            if not self._wants_game(game_id):
+                continue
+            game = delta.games[game_id]
+            now_visible = self._wants_status(game.get("status"))
+            was_visible = self._wants_status(delta.previous_status.get(game_id, game.get("status")))
+            if now_visible and not was_visible:
+                added.append(self._trim_game(game))
+            elif was_visible and not now_visible:
+                removed.append(game_id)
+            elif now_visible:
+                patch = self._trim_patch(patch)
+                if patch:
+                    changed[game_id] = patch
+
+        return {"seq": delta.seq, "changed": changed, "added": added, "removed": removed}
+
+    def _parse(self, message: dict):
+        markets = _names("markets", message.get("markets"))
+        if markets is not None:
+            unknown = markets - MARKETS.keys()
+            if unknown:
+                raise ValueError(f"Unknown markets: {', '.join(sorted(unknown))}")
+            markets = frozenset(MARKETS[name] for name in markets)
+        return (
+            _names("game_ids", message.get("game_ids")),
+            _names("status", message.get("status")),
+            markets,
+        )
+
+    def _wants_game(self, game_id: str) -> bool:
+        return self.game_ids is None or game_id in self.game_ids
+
+    def _wants_status(self, status: Optional[str]) -> bool:
+        return self.statuses is None or status in self.statuses
+
+    def _visible(self, game: dict) -> bool:
+        return self._wants_game(game.get("game_id")) and self._wants_status(game.get("status"))
+
+    def _trim_game(self, game: dict) -> dict:
+        if self.markets is None or "betting_lines" not in game:
+            return game
+        lines = {k: v for k, v in game["betting_lines"].items() if k in self.markets}
+        return {**game, "betting_lines": lines}
+
+    def _trim_patch(self, patch: dict) -> dict:
+        if self.markets is None or "betting_lines" not in patch:
+            return patch
+        trimmed = {k: v for k, v in patch.items() if k != "betting_lines"}
+        lines = {k: v for k, v in patch["betting_lines"].items() if k in self.markets}
+        if lines:
+            trimmed["betting_lines"] = lines
+        return trimmed
+
+
+def _union(
+    current: Optional[FrozenSet[str]], names: Optional[FrozenSet[str]]
+) -> Optional[FrozenSet[str]]:
+    if names is None:
+        return current
+    return names if current is None else current | names
+
+
+def _difference(
+    current: Optional[FrozenSet[str]], names: Optional[FrozenSet[str]]
+) -> Optional[FrozenSet[str]]:
+    if names is None or current is None:
+        return current
+    return current - names
@@ -2,12 +2,18 @@
 
 import asyncio
 import logging
+import time
 from datetime import datetime
-from typing import Optional
+from typing import AsyncContextManager, List, Optional
 
-from ..client import DraftKingsClient
+from ..client import DraftKingsClient, LineStream, merge_league_games
 from ..config import ServerConfig
-from ..database import Database
+from ..database import AsyncDatabase, Database, SaveReport
+from ..metrics import FetchMetrics
+from ..models import NFLGame
+from .browser_pool import BrowserPool
+from .diff import Delta
+from .scheduler import PollScheduler
 from .state import app_state
 
 logger = logging.getLogger("dk_cli.server")
@@ -16,24 +22,45 @@ logger = logging.getLogger("dk_cli.server")
 class PollingTask:
     """Background task that polls DraftKings for updated data."""
 
-    def __init__(self, config: ServerConfig):
+    def __init__(self, config: ServerConfig, browser_pool: Optional[BrowserPool] = None):
         self.config = config
-        self.db: Optional[Database] = None
+        self.browser_pool = browser_pool
+        self.db: Optional[AsyncDatabase] = None
         self._task: Optional[asyncio.Task] = None
         self._stop_event = asyncio.Event()
+        self._stream: Optional[LineStream] = None
+        # Held from numbering a delta until it is queued for every client,
+        # so stream callbacks and manual refreshes broadcast in seq order
+        # and a failed save can never leave a gap
+        self._publish_lock = asyncio.Lock()
+        self.scheduler: Optional[PollScheduler] = None
+        if config.adaptive_polling:
+            self.scheduler = PollScheduler(
+                base_interval=config.poll_interval,
+                min_interval=config.min_poll_interval,
+                max_interval=config.max_poll_interval,
+            )
 
     async def start(self) -> None:
         """Start the background polling task."""
         if self.config.save_to_db:
-            self.db = Database()
+            self.db = app_state.db or AsyncDatabase(Database())
 
         self._stop_event.clear()
-        self._task = asyncio.create_task(self._poll_loop())
-        logger.info(f"Started polling task (interval: {self.config.poll_interval}s)")
+        if self.config.streaming:
+            self._task = asyncio.create_task(self._stream_loop())
+            logger.info(
+                f"Started streaming task (resync interval: {self.config.poll_interval}s)"
+            )
+        else:
+            self._task = asyncio.create_task(self._poll_loop())
+            logger.info(f"Started polling task (interval: {self.config.poll_interval}s)")
 
     async def stop(self) -> None:
         """Stop the background polling task."""
         self._stop_event.set()
+        if self._stream:
+            self._stream.stop()
         if self._task:
             self._task.cancel()
             try:
@@ -50,13 +77,55 @@ class PollingTask:
         while not self._stop_event.is_set():
             try:
                 await asyncio.wait_for(
-                    self._stop_event.wait(), timeout=self.config.poll_interval
+                    self._stop_event.wait(), timeout=self._next_interval()
                 )
                 break  # Stop event was set
             except asyncio.TimeoutError:
                 # Timeout = time to poll again
                 await self._fetch_and_broadcast()
 
+    async def _stream_loop(self) -> None:
+        """Keep one page open and push line changes as they happen.
+
+        The stream is re-established after poll_interval if the page dies.
+        """
+        while not self._stop_event.is_set():
+            try:
+                logger.info("Opening streaming page on DraftKings...")
+                async with self._client() as client:
+                    self._stream = client.stream(
+                        on_snapshot=self._publish_games,
+                        on_change=self._publish_changes,
+                        resync_interval=self.config.poll_interval,
+                    )
+                    await self._stream.run()
+            except Exception as e:
+                await self._report_error(str(e))
+            finally:
+                self._stream = None
+
+            try:
+                await asyncio.wait_for(
+                    self._stop_event.wait(), timeout=self.config.poll_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def _next_interval(self) -> float:
+        """Seconds until the next poll, adaptive when a scheduler is set."""
+        if not self.scheduler:
+            return self.config.poll_interval
+
+        decision = self.scheduler.next_interval(app_state.games)
+        logger.info(f"Next fetch in {decision.interval:.0f}s ({decision.reason})")
+        return decision.interval
+
+    def _client(self) -> AsyncContextManager[DraftKingsClient]:
+        """Lease a pooled client, or launch a one-off one without a pool."""
+        if self.browser_pool:
+            return self.browser_pool.lease()
+        return DraftKingsClient(**self.config.client_options())
+
     async def _fetch_and_broadcast(self) -> None:
         """Fetch data and broadcast to WebSocket clients."""
         app_state.is_fetching = True
@@ -64,48 +133,149 @@ class PollingTask:
         try:
             logger.info("Fetching NFL games from DraftKings...")
 
-            async with DraftKingsClient(headless=self.config.headless) as client:
-                games = await client.fetch_nfl_games()
+            acquire_start = time.perf_counter()
+            async with self._client() as client:
+                # Includes the browser launch when there is no warm pool slot
+                app_state.metrics.observe(
+                    "dk_browser_acquire_seconds", time.perf_counter() - acquire_start,
+                    help="Time to launch or lease a browser",
+                )
+                if self.config.leagues == ["nfl"]:
+                    games = await client.fetch_nfl_games()
+                else:
+                    games_by_league = await client.fetch_leagues(
+                        self.config.leagues, self.config.max_concurrent_pages
+                    )
+                    games = merge_league_games(games_by_league)
+                    logger.info(
+                        "Fetched leagues: "
+                        + ", ".join(f"{k}={len(v)}" for k, v in games_by_league.items())
+                    )
+                request_stats = client.last_request_stats
+                fetch_metrics = client.last_fetch_metrics
+
+            self._record_metrics(fetch_metrics)
+            if request_stats:
+                logger.info(
+                    f"Requests: {request_stats.allowed_requests} allowed, "
+                    f"{request_stats.blocked_requests} blocked, "
+                    f"{request_stats.bytes_received} bytes received, "
+                    f"{request_stats.cached_responses} from cache"
+                )
 
             if games:
-                await app_state.update_games(games)
+                await self._publish_games(games)
+            else:
+                logger.warning("No games fetched")
+
+        except Exception as e:
+            app_state.metrics.inc("dk_fetch_total", help="Fetches by result", result="error")
+            await self._report_error(str(e))
+
+        finally:
+            app_state.is_fetching = False
 
-                if self.db:
-                    saved = self.db.save_games(games)
-                    logger.info(f"Saved {saved} games to database")
+    def _record_metrics(self, fetch_metrics: List[FetchMetrics]) -> None:
+        """Fold per-page fetch metrics into the app registry and log them."""
+        app_state.metrics.inc("dk_fetch_total", help="Fetches by result", result="ok")
+        app_state.last_fetch_metrics = fetch_metrics
 
+        for metrics in fetch_metrics:
+            app_state.metrics.record_fetch(metrics)
+            phases = ", ".join(
+                f"{name}={seconds:.2f}s" for name, seconds in metrics.phases.items()
+            )
+            logger.info(
+                f"Fetch timings for {metrics.url}: {phases} "
+                f"({metrics.cards} cards, {metrics.games} games, "
+                f"{metrics.parse_failures} parse failures)"
+            )
+
+    async def _publish_games(self, games: List[NFLGame]) -> None:
+        """Store a full slate and broadcast what changed to WebSocket clients."""
+        async with self._publish_lock:
+            delta = await app_state.update_games(games)
+            if self.config.delta_updates:
+                await self._broadcast_delta(delta)
+            else:
                 await app_state.broadcast(
                     {
                         "type": "games_update",
                         "timestamp": datetime.now().isoformat(),
-                        "game_count": len(games),
-                        "games": app_state.get_games_dict(),
+                        **app_state.snapshot(),
                     }
                 )
 
-                logger.info(
-                    f"Fetched {len(games)} games, broadcast to "
-                    f"{len(app_state.websocket_connections)} clients"
-                )
+        if self.scheduler:
+            self.scheduler.observe(games)
+
+        logger.info(
+            f"Fetched {len(games)} games, broadcast to "
+            f"{len(app_state.connections)} clients"
+        )
+
+        if self.db:
+            self._log_save(await self.db.save_games(games))
+
+    async def _publish_changes(self, games: List[NFLGame]) -> None:
+        """Merge changed games from the stream and broadcast just those."""
+        async with self._publish_lock:
+            delta = await app_state.update_game_lines(games)
+            if self.config.delta_updates:
+                await self._broadcast_delta(delta)
             else:
-                logger.warning("No games fetched")
+                await app_state.broadcast(
+                    {
+                        "type": "games_changed",
+                        "timestamp": datetime.now().isoformat(),
+                        "seq": delta.seq,
+                        "game_count": len(games),
+                        "games": [game.to_dict() for game in games],
+                    }
+                )
 
-        except Exception as e:
-            error_msg = str(e)
-            await app_state.set_error(error_msg)
-            logger.error(f"Fetch error: {error_msg}")
-
-            await app_state.broadcast(
-                {
-                    "type": "error",
-                    "timestamp": datetime.now().isoformat(),
-                    "error": error_msg,
-                }
-            )
+        logger.debug(f"Streamed changes for {len(games)} games")
 
-        finally:
-            app_state.is_fetching = False
+        if self.db:
+            self._log_save(await self.db.save_games(games))
+
+    async def _broadcast_delta(self, delta: Delta) -> None:
+        """Send only the changed fields, numbered so clients can spot gaps.
+
+        Sent even when nothing changed, so the sequence stays contiguous
+        and clients see the fetch time advance.
+        """
+        await app_state.broadcast_delta(delta)
+        logger.debug(
+            f"Delta {delta.seq}: {len(delta.changed)} changed, "
+            f"{len(delta.added)} added, {len(delta.removed)} removed"
+        )
+
+    def _log_save(self, report: SaveReport) -> None:
+        logger.info(
+            f"Saved {report.saved} games to database ({report.inserted} changed)"
+        )
+        for game_id, error in report.errors.items():
+            logger.warning(f"Failed to save game {game_id}: {error}")
+
+    async def _report_error(self, error_msg: str) -> None:
+        await app_state.set_error(error_msg)
+        logger.error(f"Fetch error: {error_msg}")
+
+        await app_state.broadcast(
+            {
+                "type": "error",
+                "timestamp": datetime.now().isoformat(),
+                "error": error_msg,
+            }
+        )
 
     async def trigger_fetch(self) -> None:
-        """Manually trigger a fetch (for API endpoint)."""
+        """Manually trigger a fetch (for API endpoint).
+
+        While streaming, this re-reads the open page instead of loading a new one.
+        """
+        if self._stream:
+            self._stream.resync()
+            return
         await self._fetch_and_broadcast()
@@ -3,57 +3,113 @@
 import logging
 from datetime import datetime
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect, status
 
+from .encoding import DEFAULT_ENCODING, available_encodings, decode_message
 from .state import app_state
 
 logger = logging.getLogger("dk_cli.server")
 router = APIRouter()
 
 
+def _send_snapshot(websocket: WebSocket) -> None:
+    """Queue a full games_update for the client's current subscription."""
+    subscription = app_state.connections.subscription(websocket)
+    message = {
+        "type": "games_update",
+        "timestamp": datetime.now().isoformat(),
+        **app_state.snapshot(),
+        "subscription": subscription.to_dict(),
+    }
+    app_state.connections.send(websocket, subscription.filter_message(message))
+
+
 @router.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
+async def websocket_endpoint(
+    websocket: WebSocket,
+    encoding: str = Query(DEFAULT_ENCODING, description="json, msgpack or columnar"),
+):
     """WebSocket endpoint for real-time updates.
 
+    ``?encoding=`` picks the wire format for this client (see encoding.py);
+    JSON is the default. An encoding the server cannot produce is refused.
+
     Message types sent to clients:
     - connection_established: Sent immediately on connect with current state
-    - games_update: Sent when new data is fetched
+    - games_delta: Sent on each update with only the changed fields
+      (changed: game_id -> nested fields, added: full games, removed: ids)
+    - games_update: Full slate, in reply to resync (and on each fetch when
+      delta_updates is off)
+    - games_changed: Streaming mode with delta_updates off; whole changed games
     - error: Sent when a fetch error occurs
     - pong: Response to client ping
 
+    Every state message carries ``seq``. A delta applies on top of the
+    state with seq - 1; a client that sees a gap sends resync.
+
     Message types accepted from clients:
     - ping: Client heartbeat, server responds with pong
+    - resync: Client missed a delta, server responds with games_update
+    - subscribe: Narrow updates to some games, statuses or markets, e.g.
+      {"type": "subscribe", "game_ids": [...], "status": ["live"],
+      "markets": ["spread", "total", "moneyline"]}. Each field is optional
+      and adds to the current filter; with no fields, resets to everything.
+      Server responds with a games_update for the new filter.
+    - unsubscribe: Same fields, removed from the current filter
     """
-    await app_state.connect_websocket(websocket)
+    if encoding not in available_encodings():
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        logger.warning(f"WebSocket refused: unsupported encoding {encoding!r}")
+        return
+
+    await app_state.connect_websocket(websocket, encoding)
     logger.info(
-        f"WebSocket connected. Total clients: {len(app_state.websocket_connections)}"
+        f"WebSocket connected. Total clients: {len(app_state.connections)}"
     )
 
     try:
         # Send current state on connection
-        await websocket.send_json(
+        app_state.connections.send(
+            websocket,
             {
                 "type": "connection_established",
                 "timestamp": datetime.now().isoformat(),
-                "game_count": len(app_state.games),
-                "games": app_state.get_games_dict() if app_state.games else [],
-                "last_updated": (
-                    app_state.last_updated.isoformat()
-                    if app_state.last_updated
-                    else None
-                ),
-            }
+                "encoding": encoding,
+                **app_state.snapshot(),
+            },
         )
 
         # Listen for client messages
         while True:
-            data = await websocket.receive_json()
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            # Text is JSON; binary is MessagePack
+            raw = message.get("text")
+            data = decode_message(raw if raw is not None else message.get("bytes", b""))
             msg_type = data.get("type", "")
 
             if msg_type == "ping":
-                await websocket.send_json(
-                    {"type": "pong", "timestamp": datetime.now().isoformat()}
+                app_state.connections.send(
+                    websocket, {"type": "pong", "timestamp": datetime.now().isoformat()}
                 )
+            elif msg_type == "resync":
+                _send_snapshot(websocket)
+            elif msg_type in ("subscribe", "unsubscribe"):
+                current = app_state.connections.subscription(websocket)
+                try:
+                    if msg_type == "subscribe":
+                        subscription = current.subscribe(data)
+                    else:
+                        subscription = current.unsubscribe(data)
+                except ValueError as e:
+                    app_state.connections.send(
+                        websocket,
+                        {"type": "error", "timestamp": datetime.now().isoformat(), "error": str(e)},
+                    )
+                    continue
+                app_state.connections.subscribe(websocket, subscription)
+                _send_snapshot(websocket)
 
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected")
@@ -62,5 +118,5 @@ async def websocket_endpoint(websocket: WebSocket):
     finally:
         app_state.disconnect_websocket(websocket)
         logger.info(
-            f"WebSocket removed. Total clients: {len(app_state.websocket_connections)}"
+            f"WebSocket removed. Total clients: {len(app_state.connections)}"
         )
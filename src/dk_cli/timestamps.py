@@ -0,0 +1,34 @@
+"""Epoch-millisecond timestamps for the history database.
+
+Datetimes in this package are naive local time. They are stored as
+integer milliseconds since the Unix epoch, which compare and index as
+plain integers; ``from_epoch_ms`` turns them back into the same naive
+local datetimes.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Union
+
+
+def to_epoch_ms(moment: datetime) -> int:
+    """Milliseconds since the epoch for a naive local (or aware) datetime."""
+    return round(moment.timestamp() * 1000)
+
+
+# Snapshots share a handful of kickoff and fetch times, so most decodes hit
+@lru_cache(maxsize=8192)
+def from_epoch_ms(ms: int) -> datetime:
+    """Naive local datetime for epoch milliseconds."""
+    return datetime.fromtimestamp(ms / 1000)
+
+
+def iso_to_epoch_ms(value: Union[str, int, None]) -> Optional[int]:
+    """Convert a stored ISO-8601 timestamp, for migrating TEXT columns.
+
+    Integers pass through, so a column that is already converted is left
+    as it is.
+    """
+    if value is None or isinstance(value, int):
+        return value
+    return to_epoch_ms(datetime.fromisoformat(value))
@@ -0,0 +1,108 @@
+"""Shared fixtures: games, recorded DraftKings pages and benchmark timing."""
+
+import statistics
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+
+from dk_cli.models import BettingLines, MoneyLine, NFLGame, Spread, Team, Total
+from dk_cli.replay import BenchmarkResult
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+_benchmark_results: List[BenchmarkResult] = []
+
+
+@pytest.fixture
+def make_game() -> Callable[..., NFLGame]:
+    """Build an NFLGame with simple lines; keyword arguments override them."""
+    def make(
+        game_id: str = "BUF_KC_20261018",
+        status: str = "upcoming",
+        ml_home: int = -150,
+        spread: float = -3.5,
+        total: float = 47.5,
+        start_time: datetime = datetime(2026, 10, 18, 16, 25),
+        fetched_at: datetime = datetime(2026, 10, 17, 9, 0),
+    ) -> NFLGame:
+        return NFLGame(
+            game_id=game_id,
+            home_team=Team("Kansas City Chiefs", "KC"),
+            away_team=Team("Buffalo Bills", "BUF"),
+            start_time=start_time,
+            status=status,
+            betting_lines=BettingLines(
+                money_line=MoneyLine(home=ml_home, away=-ml_home - 20),
+                spread=Spread(spread, -110, -spread, -110),
+                total=Total(total, -110, total, -110),
+            ),
+            fetched_at=fetched_at,
+        )
+
+    return make
+
+
+@pytest.fixture
+def fixture_path() -> Callable[[str], Path]:
+    """Path to a recorded fixture under tests/fixtures."""
+    return lambda name: FIXTURE_DIR / name
+
+
+@pytest.fixture(scope="session")
+def chromium() -> None:
+    """Skip browser benchmarks when Chromium is not installed."""
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as playwright:
+        if not Path(playwright.chromium.executable_path).exists():
+            pytest.skip("Chromium is not installed; run 'dk install-browser'")
+
+
+@pytest.fixture
+def benchmark() -> Callable[..., object]:
+    """Time ``func(*args)`` over ``repeat`` runs and report it after the session.
+
+    Returns the last run's result so the test can check it.
+    """
+    def run(fixture: str, name: str, func: Callable, *args, repeat: int = 20):
+        timings = []
+        result = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func(*args)
+            timings.append((time.perf_counter() - start) * 1000)
+        _benchmark_results.append(BenchmarkResult(
+            fixture=fixture,
+            strategy=name,
+            games=len(result) if isinstance(result, list) else 0,
+            runs=repeat,
+            median_ms=statistics.median(timings),
+            best_ms=min(timings),
+        ))
+        return result
+
+    return run
+
+
+@pytest.fixture
+def record_benchmark() -> Callable[[List[BenchmarkResult]], None]:
+    """Report results timed elsewhere, such as by replay.benchmark_fixture."""
+    return _benchmark_results.extend
+
+
+def pytest_terminal_summary(terminalreporter) -> None:
+    if not _benchmark_results:
+        return
+    terminalreporter.section("parser benchmarks")
+    terminalreporter.write_line(
+        f"{'fixture':<24} {'parser':<18} {'games':>5} {'median ms':>10} "
+        f"{'best ms':>9} {'per game ms':>12}"
+    )
+    for r in _benchmark_results:
+        terminalreporter.write_line(
+            f"{r.fixture:<24} {r.strategy:<18} {r.games:>5} {r.median_ms:>10.3f} "
+            f"{r.best_ms:>9.3f} {r.per_game_ms:>12.3f}"
+        )
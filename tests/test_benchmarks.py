@@ -0,0 +1,75 @@
+"""Parser benchmarks against the recorded NFL slate in tests/fixtures.
+
+Each benchmark also checks the parse, so a faster parser that gets the
+lines wrong fails. Timings are printed after the run; nothing asserts on
+them, since they depend on the machine. Run just these with
+``pytest -m benchmark``; ``dk bench`` times fixtures saved by ``dk capture``.
+"""
+
+import json
+
+import pytest
+
+from dk_cli.client import DraftKingsClient
+from dk_cli.feeds import parse_feed_payload
+from dk_cli.replay import benchmark_fixture
+
+pytestmark = pytest.mark.benchmark
+
+SLATE_GAMES = 16
+
+
+def _check_first_game(games):
+    """Titans @ Colts, the first card in every fixture."""
+    game = games[0]
+    assert (game.away_team.abbreviation, game.home_team.abbreviation) == ("TEN", "IND")
+    lines = game.betting_lines
+    assert (lines.spread.away_line, lines.spread.away_odds) == (-1.5, -105)
+    assert (lines.spread.home_line, lines.spread.home_odds) == (1.5, -112)
+    assert (lines.total.over_line, lines.total.over_odds) == (49.5, -115)
+    assert (lines.total.under_line, lines.total.under_odds) == (49.5, -105)
+    assert (lines.money_line.away, lines.money_line.home) == (-260, 235)
+    assert (game.start_time.month, game.start_time.day) == (10, 18)
+
+
+def test_parse_card_data(benchmark, fixture_path):
+    """The Python half of the "evaluate" strategy: card dicts to games."""
+    cards = json.loads(fixture_path("nfl-cards.json").read_text(encoding="utf-8"))
+    client = DraftKingsClient()
+
+    games = benchmark("nfl-cards.json", "card-data", client._parse_card_data_list, cards)
+
+    assert len(games) == SLATE_GAMES
+    _check_first_game(games)
+
+
+def test_parse_feed_payload(benchmark, fixture_path):
+    """The "network" ingestion path: a sportscontent payload to games."""
+    payload = json.loads(fixture_path("nfl-sportscontent.json").read_text(encoding="utf-8"))
+    client = DraftKingsClient()
+
+    games = benchmark(
+        "nfl-sportscontent.json", "feed", parse_feed_payload, payload, client._abbreviate
+    )
+
+    assert len(games) == SLATE_GAMES
+    _check_first_game(games)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("strategy", ["evaluate", "elements"])
+async def test_parse_strategy(strategy, chromium, fixture_path, record_benchmark):
+    """Each DOM strategy against the recorded page, loaded offline."""
+    async with DraftKingsClient() as client:
+        results = await benchmark_fixture(
+            client, fixture_path("nfl-slate.html"), [strategy], repeat=5
+        )
+        page = await client.load_html(fixture_path("nfl-slate.html").read_text(encoding="utf-8"))
+        try:
+            games = await client.parse_page(page, strategy)
+        finally:
+            await page.close()
+
+    record_benchmark(results)
+    assert results[0].games == SLATE_GAMES
+    _check_first_game(games)
@@ -0,0 +1,106 @@
+"""BrowserPool launching, relaunching and recovering from failed starts."""
+
+import pytest
+
+from dk_cli.server import browser_pool
+from dk_cli.server.browser_pool import BrowserPool
+
+
+class FakeClient:
+    """Stands in for DraftKingsClient; the first ``failures`` launches raise."""
+
+    failures = 0
+    launched = []
+
+    def __init__(self, **options):
+        self.healthy = True
+        self.closed = False
+
+    async def __aenter__(self):
+        if FakeClient.failures:
+            FakeClient.failures -= 1
+            raise RuntimeError("Executable doesn't exist")
+        FakeClient.launched.append(self)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.closed = True
+
+    def is_healthy(self):
+        return self.healthy and not self.closed
+
+
+@pytest.fixture(autouse=True)
+def fake_client(monkeypatch):
+    monkeypatch.setattr(browser_pool, "DraftKingsClient", FakeClient)
+    FakeClient.failures = 0
+    FakeClient.launched = []
+
+
+@pytest.mark.asyncio
+async def test_failed_start_launches_on_next_lease():
+    FakeClient.failures = 1
+    pool = BrowserPool(size=1, max_uses=0)
+
+    with pytest.raises(RuntimeError):
+        await pool.start()
+    assert pool.stats()["slots"][0]["healthy"] is False
+
+    async with pool.lease() as client:
+        assert client is FakeClient.launched[0]
+    assert pool.launches == 1
+    assert pool.stats()["slots"][0]["healthy"] is True
+    await pool.stop()
+    assert client.closed
+
+
+@pytest.mark.asyncio
+async def test_failed_relaunch_is_retried():
+    pool = BrowserPool(size=1, max_uses=0)
+    await pool.start()
+    FakeClient.launched[0].healthy = False
+    FakeClient.failures = 1
+
+    with pytest.raises(RuntimeError):
+        async with pool.lease():
+            pass
+
+    async with pool.lease() as client:
+        assert client is FakeClient.launched[1]
+    assert pool.launches == 2
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_clients_recycle_after_max_uses():
+    pool = BrowserPool(size=1, max_uses=2)
+    await pool.start()
+
+    for _ in range(3):
+        async with pool.lease():
+            pass
+
+    assert (pool.launches, pool.recycles) == (2, 1)
+    assert FakeClient.launched[0].closed
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_recycle_keeps_the_leased_result():
+    pool = BrowserPool(size=1, max_uses=1)
+    await pool.start()
+    FakeClient.failures = 1
+
+    async with pool.lease() as client:
+        result = "games"
+
+    assert result == "games"
+    assert client.closed
+    assert (pool.launches, pool.recycles) == (1, 0)
+    assert pool.stats()["slots"][0]["healthy"] is False
+
+    async with pool.lease() as client:
+        assert client is FakeClient.launched[1]
+    # That lease used up max_uses too and recycled normally
+    assert (pool.launches, pool.recycles) == (3, 1)
+    await pool.stop()
@@ -0,0 +1,99 @@
+"""Pre-encoded responses, gzip negotiation and conditional GETs."""
+
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from dk_cli.server.cache import ResponseCache, _accepts_gzip
+
+BODY = {"games": [{"game_id": f"G{i}", "note": "x" * 40} for i in range(50)]}
+
+
+@pytest.fixture
+def served():
+    """An app serving one cached body; ``state`` controls its version."""
+    cache = ResponseCache()
+    state = {"version": 1, "builds": 0, "body": BODY}
+    app = FastAPI()
+
+    @app.get("/games")
+    def games(request: Request):
+        def build():
+            state["builds"] += 1
+            return state["body"]
+
+        entry = cache.get("games", state["version"], build, datetime(2026, 10, 17, 9, 0))
+        return cache.respond(request, entry)
+
+    # The test client asks for gzip by default; the tests opt in explicitly
+    client = TestClient(app, headers={"Accept-Encoding": "identity"})
+    return client, cache, state
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", True),
+    ("gzip, deflate, br", True),
+    ("br;q=1.0, gzip;q=0.8", True),
+    ("GZIP", True),
+    ("x-gzip", True),
+    ("*", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.0, *", False),
+    ("*;q=0", False),
+    ("identity", False),
+    ("deflate, br", False),
+    ("", False),
+])
+def test_accepts_gzip(header, expected):
+    assert _accepts_gzip(header) is expected
+
+
+def test_body_is_built_once_per_version(served):
+    client, cache, state = served
+
+    first = client.get("/games")
+    second = client.get("/games")
+
+    assert first.status_code == second.status_code == 200
+    assert json.loads(first.content) == BODY
+    assert first.headers["etag"] == second.headers["etag"]
+    assert state["builds"] == 1
+    assert cache.stats()["hits"] == 1
+
+    state["version"] = 2
+    state["body"] = {"games": []}
+    third = client.get("/games")
+    assert json.loads(third.content) == {"games": []}
+    assert third.headers["etag"] != first.headers["etag"]
+    assert state["builds"] == 2
+
+
+def test_gzip_follows_accept_encoding(served):
+    client = served[0]
+
+    zipped = client.get("/games", headers={"Accept-Encoding": "gzip"})
+    refused = client.get("/games", headers={"Accept-Encoding": "gzip;q=0, identity"})
+
+    assert zipped.headers["content-encoding"] == "gzip"
+    # httpx decompresses the body for us
+    assert json.loads(zipped.content) == BODY
+    assert "content-encoding" not in refused.headers
+    assert json.loads(refused.content) == BODY
+
+
+def test_conditional_get(served):
+    client = served[0]
+    first = client.get("/games")
+
+    by_etag = client.get("/games", headers={"If-None-Match": first.headers["etag"]})
+    by_date = client.get("/games", headers={"If-Modified-Since": first.headers["last-modified"]})
+    stale = client.get("/games", headers={"If-None-Match": '"other"'})
+
+    assert by_etag.status_code == 304
+    assert by_etag.content == b""
+    assert by_etag.headers["etag"] == first.headers["etag"]
+    assert by_date.status_code == 304
+    assert stale.status_code == 200
@@ -0,0 +1,315 @@
+"""Schema migrations, the bankroll ledger and the async front."""
+
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+from dk_cli.client import DraftKingsClient
+from dk_cli.database import _MIGRATIONS, AsyncDatabase, Database, InsufficientFundsError
+from dk_cli.models import Bet
+from dk_cli.timestamps import to_epoch_ms
+
+# The schema as first released, before user_version was tracked
+BASELINE_SCHEMA = """
+CREATE TABLE games (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    game_id TEXT NOT NULL,
+    home_team_name TEXT NOT NULL,
+    home_team_abbr TEXT NOT NULL,
+    away_team_name TEXT NOT NULL,
+    away_team_abbr TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    status TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    UNIQUE(game_id, fetched_at)
+);
+CREATE TABLE betting_lines (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    game_id TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    ml_home INTEGER,
+    ml_away INTEGER,
+    spread_home_line REAL,
+    spread_home_odds INTEGER,
+    spread_away_line REAL,
+    spread_away_odds INTEGER,
+    total_over_line REAL,
+    total_over_odds INTEGER,
+    total_under_line REAL,
+    total_under_odds INTEGER,
+    UNIQUE(game_id, fetched_at)
+);
+CREATE INDEX idx_games_game_id ON games(game_id);
+CREATE INDEX idx_games_fetched_at ON games(fetched_at);
+CREATE INDEX idx_betting_lines_game_id ON betting_lines(game_id);
+CREATE TABLE bankroll (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    balance REAL NOT NULL DEFAULT 10000.00,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE bets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    game_id TEXT NOT NULL,
+    bet_type TEXT NOT NULL,
+    selection TEXT NOT NULL,
+    stake REAL NOT NULL,
+    odds INTEGER NOT NULL,
+    potential_payout REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    result_amount REAL,
+    home_score INTEGER,
+    away_score INTEGER,
+    placed_at TEXT NOT NULL,
+    settled_at TEXT,
+    home_team_abbr TEXT NOT NULL,
+    away_team_abbr TEXT NOT NULL,
+    line_value REAL
+);
+CREATE INDEX idx_bets_game_id ON bets(game_id);
+CREATE INDEX idx_bets_status ON bets(status);
+"""
+
+GAME_ID = "BUF_KC_20261018"
+
+# Two fetches with different lines, as the baseline stored them
+FETCHES = (
+    ("2026-10-17T09:00:00.123456", -150, 130, -3.0),
+    ("2026-10-17T09:05:00.654321", -160, 140, -3.5),
+)
+
+
+@pytest.fixture
+def baseline_path(tmp_path):
+    """A history database written by the baseline schema."""
+    path = tmp_path / "history.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA)
+    for fetched_at, ml_home, ml_away, spread in FETCHES:
+        conn.execute(
+            "INSERT INTO games (game_id, home_team_name, home_team_abbr, away_team_name, "
+            "away_team_abbr, start_time, status, fetched_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (GAME_ID, "Kansas City Chiefs", "KC", "Buffalo Bills", "BUF",
+             "2026-10-18T16:25:00", "upcoming", fetched_at),
+        )
+        conn.execute(
+            "INSERT INTO betting_lines (game_id, fetched_at, ml_home, ml_away, "
+            "spread_home_line, spread_home_odds, spread_away_line, spread_away_odds, "
+            "total_over_line, total_over_odds, total_under_line, total_under_odds) "
+            "VALUES (?, ?, ?, ?, ?, -110, ?, -110, 47.5, -110, 47.5, -110)",
+            (GAME_ID, fetched_at, ml_home, ml_away, spread, -spread),
+        )
+    conn.execute("INSERT INTO bankroll (id, balance, updated_at) VALUES (1, 9890.0, ?)",
+                 ("2026-10-17T09:10:00",))
+    conn.execute(
+        "INSERT INTO bets (game_id, bet_type, selection, stake, odds, potential_payout, "
+        "status, result_amount, home_score, away_score, placed_at, settled_at, "
+        "home_team_abbr, away_team_abbr, line_value) "
+        "VALUES (?, 'ml_home', 'KC ML', 110.0, -110, 210.0, 'won', 210.0, 27, 24, "
+        "'2026-10-17T09:06:00', '2026-10-18T19:40:00', 'KC', 'BUF', NULL)",
+        (GAME_ID,),
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_migrates_baseline_schema(baseline_path):
+    db = Database(baseline_path)
+
+    with db._connection() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == len(_MIGRATIONS)
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        assert conn.execute(
+            "SELECT typeof(fetched_at), typeof(start_time), typeof(last_seen_at) FROM games"
+        ).fetchall() == [("integer", "integer", "integer")] * 2
+        fetched = [row[0] for row in conn.execute(
+            "SELECT fetched_at FROM betting_lines ORDER BY id"
+        )]
+
+    # Epoch ms keep millisecond precision of the old ISO text
+    assert fetched == [to_epoch_ms(datetime.fromisoformat(f[0])) for f in FETCHES]
+    history = db.get_line_history(GAME_ID)
+    assert [entry["fetched_at"] for entry in history] == [
+        "2026-10-17T09:00:00.123000", "2026-10-17T09:05:00.654000",
+    ]
+    assert [entry["money_line"]["home"] for entry in history] == [-150, -160]
+
+    assert db.get_bankroll().balance == 9890.0
+    [opening] = db.get_transactions()
+    assert (opening["kind"], opening["amount"], opening["balance_after"]) == (
+        "opening", 9890.0, 9890.0,
+    )
+
+    [bet] = db.get_bets()
+    assert bet.placed_at == datetime(2026, 10, 17, 9, 6)
+    assert bet.settled_at == datetime(2026, 10, 18, 19, 40)
+    assert (bet.status, bet.result_amount) == ("won", 210.0)
+    db.close()
+
+
+def test_migration_runs_once(baseline_path):
+    Database(baseline_path).close()
+    db = Database(baseline_path)
+
+    assert len(db.get_line_history(GAME_ID)) == 2
+    assert len(db.get_transactions()) == 1
+    db.close()
+
+
+def test_migrates_text_archive(baseline_path):
+    archive_path = baseline_path.with_name("history-archive.db")
+    conn = sqlite3.connect(archive_path)
+    conn.execute("""
+        CREATE TABLE betting_lines_rollup (
+            game_id TEXT NOT NULL, resolution TEXT NOT NULL, bucket_start TEXT NOT NULL,
+            series TEXT NOT NULL, open NUMERIC, high NUMERIC, low NUMERIC, close NUMERIC,
+            samples INTEGER NOT NULL, last_seen_at TEXT NOT NULL,
+            PRIMARY KEY (game_id, resolution, bucket_start, series)
+        ) WITHOUT ROWID
+    """)
+    conn.execute(
+        "INSERT INTO betting_lines_rollup VALUES "
+        "('BUF_KC_20251005', 'hour', '2025-10-05T13:00:00', 'ml_home', "
+        "-150, -140, -155, -145, 12, '2025-10-05T13:55:00')"
+    )
+    conn.commit()
+    conn.close()
+
+    db = Database(baseline_path)
+
+    conn = sqlite3.connect(archive_path)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == 1
+    assert conn.execute(
+        "SELECT bucket_start, last_seen_at FROM betting_lines_rollup"
+    ).fetchall() == [(
+        to_epoch_ms(datetime(2025, 10, 5, 13)), to_epoch_ms(datetime(2025, 10, 5, 13, 55)),
+    )]
+    conn.close()
+    assert db.get_line_history("BUF_KC_20251005")
+    db.close()
+
+
+def _bet(game_id: str = GAME_ID, bet_type: str = "ml_home", stake: float = 5.0) -> Bet:
+    return Bet(
+        game_id=game_id,
+        bet_type=bet_type,
+        selection="KC ML",
+        stake=stake,
+        odds=100,
+        potential_payout=stake * 2,
+        home_team_abbr="KC",
+        away_team_abbr="BUF",
+    )
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(tmp_path / "history.db")
+    db.init_bankroll(100.0)
+    yield db
+    db.close()
+
+
+def test_concurrent_bets_never_overdraw(db):
+    """40 threads race to stake $5 each from $100: exactly 20 get through."""
+    def place(_):
+        try:
+            return db.place_bet(_bet())
+        except InsufficientFundsError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        placed = [bet for bet in pool.map(place, range(40)) if bet]
+
+    assert len(placed) == 20
+    assert len({bet.id for bet in placed}) == 20
+    assert db.get_bankroll().balance == 0.0
+
+    ledger = db.get_transactions()
+    stakes = [entry for entry in ledger if entry["kind"] == "stake"]
+    assert sorted(entry["bet_id"] for entry in stakes) == sorted(bet.id for bet in placed)
+    # Each stake saw the balance the one before it left
+    assert sorted(entry["balance_after"] for entry in stakes) == [5.0 * n for n in range(20)]
+    assert sum(entry["amount"] for entry in ledger) == 0.0
+
+
+def test_insufficient_funds_leaves_no_trace(db):
+    with pytest.raises(InsufficientFundsError):
+        db.place_bet(_bet(stake=100.01))
+
+    assert db.get_bankroll().balance == 100.0
+    assert db.get_bets() == []
+    assert [entry["kind"] for entry in db.get_transactions()] == ["opening"]
+
+
+def test_settle_games_pays_out_once(db):
+    won = db.place_bet(_bet(bet_type="ml_home", stake=10.0))
+    lost = db.place_bet(_bet(bet_type="ml_away", stake=20.0))
+    pushed = db.place_bet(_bet(bet_type="spread_home", stake=30.0))
+    db.place_bet(_bet(game_id="OTHER", stake=5.0))
+    with db._connection() as conn:
+        conn.execute("UPDATE bets SET line_value = -3 WHERE id = ?", (pushed.id,))
+
+    settled = db.settle_games({GAME_ID: (27, 24)})
+
+    assert {bet.id: bet.status for bet in settled} == {
+        won.id: "won", lost.id: "lost", pushed.id: "push",
+    }
+    # 100 - 65 staked + 20 (won at even money) + 30 (push)
+    assert db.get_bankroll().balance == 85.0
+    payouts = [entry for entry in db.get_transactions() if entry["kind"] == "payout"]
+    assert sorted((e["bet_id"], e["amount"]) for e in payouts) == [
+        (won.id, 20.0), (pushed.id, 30.0),
+    ]
+    assert max(entry["balance_after"] for entry in payouts) == 85.0
+
+    # Already settled: nothing moves the second time
+    assert db.settle_games({GAME_ID: (27, 24)}) == []
+    assert db.get_bankroll().balance == 85.0
+    assert [bet.status for bet in db.get_bets(game_id="OTHER")] == ["pending"]
+
+
+def test_made_up_start_times_do_not_defeat_dedup(db, make_game):
+    """A card without a time text gets now() as its start time on every parse."""
+    card = {
+        "labels": ["Buffalo Bills", "Kansas City Chiefs"],
+        "buttons": [{"points": "", "odds": "-110", "title": ""}] * 24,
+        "time_text": "",
+    }
+    client = DraftKingsClient()
+    first, second = client._parse_card_data(card), client._parse_card_data(card)
+    second.start_time = first.start_time.replace(microsecond=0) - timedelta(minutes=5)
+    second.fetched_at = first.fetched_at + timedelta(minutes=5)
+
+    assert not first.start_time_known
+    assert db.save_games([first]).inserted == 1
+    assert db.save_games([second]).inserted == 0
+
+    # A parsed kickoff time that moves is a real change
+    kickoff = make_game(fetched_at=datetime(2026, 10, 17, 9, 0))
+    flexed = make_game(
+        start_time=datetime(2026, 10, 18, 20, 20), fetched_at=datetime(2026, 10, 17, 9, 5)
+    )
+    assert db.save_games([kickoff]).inserted == 1
+    assert db.save_games([flexed]).inserted == 1
+
+
+@pytest.mark.asyncio
+async def test_async_close_does_not_block_the_loop(tmp_path):
+    adb = AsyncDatabase(Database(tmp_path / "history.db"))
+    release = threading.Event()
+    pending = asyncio.ensure_future(adb.run(release.wait))
+    await asyncio.sleep(0.01)
+
+    closing = asyncio.ensure_future(adb.close())
+    await asyncio.sleep(0.01)
+    assert not closing.done()
+
+    # The loop is still free to run other work while close waits
+    release.set()
+    await asyncio.wait_for(closing, timeout=5)
+    assert pending.result() is True
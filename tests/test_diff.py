@@ -0,0 +1,76 @@
+"""Field-level deltas between game snapshots."""
+
+from datetime import datetime
+
+from dk_cli.server.diff import DeltaEngine, diff_dict
+
+
+def _merge(old: dict, patch: dict) -> dict:
+    """Apply a patch the way the web client does."""
+    merged = dict(old)
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def test_diff_dict_keeps_only_changed_leaves():
+    old = {"a": 1, "lines": {"spread": {"home": -3.5, "away": 3.5}, "total": 47.5}}
+    new = {"a": 1, "lines": {"spread": {"home": -4.0, "away": 3.5}, "total": 47.5}, "b": None}
+
+    patch = diff_dict(old, new)
+
+    assert patch == {"lines": {"spread": {"home": -4.0}}, "b": None}
+    assert _merge(old, patch) == new
+
+
+def test_diff_dict_ignores_fetched_at():
+    assert diff_dict({"fetched_at": "09:00", "x": 1}, {"fetched_at": "09:05", "x": 1}) == {}
+
+
+def test_delta_engine_numbers_every_update(make_game):
+    engine = DeltaEngine()
+
+    first = engine.update([make_game("A"), make_game("B")], complete=True)
+    assert first.seq == 1
+    assert [game["game_id"] for game in first.added] == ["A", "B"]
+
+    # Nothing changed but the fetch time: still numbered, so no gap
+    again = engine.update(
+        [make_game("A", fetched_at=datetime(2026, 10, 17, 9, 5)), make_game("B")],
+        complete=True,
+    )
+    assert again.seq == 2
+    assert not again
+
+    moved = engine.update([make_game("A", spread=-4.0), make_game("B")], complete=True)
+    assert moved.seq == 3
+    assert moved.changed == {
+        "A": {"betting_lines": {"spread": {"home": {"line": -4.0}, "away": {"line": 4.0}}}},
+    }
+    assert moved.games["A"]["betting_lines"]["spread"]["home"]["line"] == -4.0
+
+
+def test_delta_engine_removals_only_on_complete_slates(make_game):
+    engine = DeltaEngine()
+    engine.update([make_game("A"), make_game("B")], complete=True)
+
+    streamed = engine.update([make_game("A", ml_home=-160)], complete=False)
+    assert streamed.removed == []
+    assert list(streamed.changed) == ["A"]
+
+    full = engine.update([make_game("A", ml_home=-160)], complete=True)
+    assert full.removed == ["B"]
+    assert engine.update([make_game("B")], complete=False).added[0]["game_id"] == "B"
+
+
+def test_delta_engine_records_status_transitions(make_game):
+    engine = DeltaEngine()
+    engine.update([make_game("A")], complete=True)
+
+    delta = engine.update([make_game("A", status="live")], complete=True)
+
+    assert delta.changed["A"] == {"status": "live"}
+    assert delta.previous_status == {"A": "upcoming"}
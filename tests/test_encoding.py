@@ -0,0 +1,110 @@
+"""WebSocket wire encodings."""
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from dk_cli.server import encoding
+from dk_cli.server.encoding import (
+    available_encodings, decode_message, encode_message, games_to_columns,
+)
+from dk_cli.server.websocket import router
+
+
+def _rows_to_games(table: dict) -> list:
+    """Rebuild nested game dicts from columnar form, as a client would."""
+    games = []
+    for row in table["rows"]:
+        game: dict = {}
+        for name, value in zip(table["columns"], row):
+            *parents, leaf = name.split(".")
+            node = game
+            for parent in parents:
+                node = node.setdefault(parent, {})
+            node[leaf] = value
+        games.append(game)
+    return games
+
+
+def test_json_is_compact_text(make_game):
+    message = {"type": "games_update", "games": [make_game().to_dict()]}
+
+    payload = encode_message(message, "json")
+
+    assert isinstance(payload, str)
+    assert ", " not in payload and ": " not in payload
+    assert decode_message(payload) == message
+
+
+def test_columnar_round_trips_game_lists(make_game):
+    games = [make_game("A").to_dict(), make_game("B", status="live").to_dict()]
+    message = {"type": "games_delta", "seq": 4, "added": games, "changed": {}, "removed": []}
+
+    payload = json.loads(encode_message(message, "columnar"))
+
+    assert payload["seq"] == 4
+    assert "betting_lines.spread.home.line" in payload["added"]["columns"]
+    assert _rows_to_games(payload["added"]) == games
+    # The caller's message is left as it was
+    assert message["added"] == games
+
+
+def test_columnar_fills_missing_columns_with_none():
+    table = games_to_columns([{"a": 1}, {"b": {"c": 2}}])
+
+    assert table == {"columns": ["a", "b.c"], "rows": [[1, None], [None, 2]]}
+
+
+def test_msgpack_round_trips(make_game):
+    pytest.importorskip("msgpack")
+    message = {"type": "games_update", "games": [make_game().to_dict()]}
+
+    payload = encode_message(message, "msgpack")
+
+    assert isinstance(payload, bytes)
+    assert decode_message(payload) == message
+
+
+def test_msgpack_is_optional(monkeypatch):
+    monkeypatch.setattr(encoding, "msgpack", None)
+
+    assert available_encodings() == ["json", "columnar"]
+    with pytest.raises(ValueError):
+        decode_message(b"\x81\xa4type\xa4ping")
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_endpoint_negotiates_encoding(client):
+    with client.websocket_connect("/ws?encoding=columnar") as websocket:
+        hello = websocket.receive_json()
+        assert hello["type"] == "connection_established"
+        assert hello["encoding"] == "columnar"
+        assert hello["games"] == {"columns": [], "rows": []}
+
+
+def test_endpoint_refuses_unknown_encoding(client):
+    with pytest.raises(WebSocketDisconnect) as refused:
+        with client.websocket_connect("/ws?encoding=xml") as websocket:
+            websocket.receive_json()
+    assert refused.value.code == 1008
+
+
+def test_endpoint_answers_a_malformed_subscribe_with_an_error(client):
+    with client.websocket_connect("/ws") as websocket:
+        websocket.receive_json()
+        websocket.send_json({"type": "subscribe", "game_ids": 5})
+        error = websocket.receive_json()
+        assert error["type"] == "error"
+        assert "game_ids" in error["error"]
+
+        websocket.send_json({"type": "ping"})
+        assert websocket.receive_json()["type"] == "pong"
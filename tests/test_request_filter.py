@@ -0,0 +1,101 @@
+"""RequestFilter decisions and its DevTools session wiring."""
+
+import pytest
+
+from dk_cli.request_filter import RequestFilter
+
+
+class FakeSession:
+    """Records sent commands and lets a test fire DevTools events."""
+
+    def __init__(self):
+        self.sent = []
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    async def send(self, method, params=None):
+        self.sent.append((method, params))
+        return {}
+
+    async def emit(self, event, params):
+        result = self.handlers[event](params)
+        if result is not None:
+            await result
+
+
+class FakePage:
+    def __init__(self):
+        self.session = FakeSession()
+        self.context = self
+
+    async def new_cdp_session(self, page):
+        return self.session
+
+
+def _paused(request_id, resource_type, url):
+    return {"requestId": request_id, "resourceType": resource_type, "request": {"url": url}}
+
+
+def test_should_block():
+    request_filter = RequestFilter(allowed_url_patterns=[r"draftkings\.com/.*\.css"])
+
+    assert request_filter.should_block("image", "https://cdn.example.com/logo.png")
+    assert request_filter.should_block("script", "https://www.googletagmanager.com/gtm.js")
+    assert not request_filter.should_block("script", "https://sportsbook.draftkings.com/app.js")
+    assert not request_filter.should_block("stylesheet", "https://sportsbook.draftkings.com/a.css")
+    assert not request_filter.should_block("document", "https://www.google-analytics.com/")
+
+
+@pytest.mark.asyncio
+async def test_install_pauses_only_requests_that_can_be_blocked():
+    page = FakePage()
+    await RequestFilter().install(page)
+
+    methods = [method for method, _ in page.session.sent]
+    assert methods == ["Network.enable", "Fetch.enable"]
+    types = {pattern["resourceType"] for pattern in page.session.sent[1][1]["patterns"]}
+    assert types == {"Font", "Image", "Media", "Stylesheet", "Script", "XHR", "Fetch", "Ping", "Other"}
+    assert "Document" not in types
+
+    page = FakePage()
+    await RequestFilter(blocked_resource_types=[], blocked_url_patterns=[]).install(page)
+    assert [method for method, _ in page.session.sent] == ["Network.enable"]
+
+
+@pytest.mark.asyncio
+async def test_install_fails_blocked_requests_and_counts_the_rest():
+    page = FakePage()
+    stats = await RequestFilter().install(page)
+    session = page.session
+    session.sent.clear()
+
+    await session.emit("Fetch.requestPaused", _paused("1", "Image", "https://cdn.example.com/a.png"))
+    await session.emit("Fetch.requestPaused", _paused("2", "Script", "https://sportsbook.draftkings.com/app.js"))
+    await session.emit("Fetch.requestPaused", _paused("3", "Script", "https://www.googletagmanager.com/gtm.js"))
+    assert session.sent == [
+        ("Fetch.failRequest", {"requestId": "1", "errorReason": "BlockedByClient"}),
+        ("Fetch.continueRequest", {"requestId": "2"}),
+        ("Fetch.failRequest", {"requestId": "3", "errorReason": "BlockedByClient"}),
+    ]
+    assert stats.blocked_requests == 2
+    assert stats.blocked_by_type == {"image": 1, "script": 1}
+
+    for url, resource_type in (
+        ("https://sportsbook.draftkings.com/", "Document"),
+        ("https://sportsbook.draftkings.com/app.js", "Script"),
+        ("https://cdn.example.com/a.png", "Image"),
+    ):
+        await session.emit(
+            "Network.requestWillBeSent", {"type": resource_type, "request": {"url": url}}
+        )
+    await session.emit("Network.responseReceived", {"response": {"fromDiskCache": True}})
+    await session.emit("Network.responseReceived", {"response": {}})
+    await session.emit("Network.requestServedFromCache", {"requestId": "4"})
+    await session.emit("Network.loadingFinished", {"encodedDataLength": 2048})
+    await session.emit("Network.loadingFinished", {"encodedDataLength": 0})
+
+    assert stats.allowed_requests == 2
+    assert stats.cached_responses == 2
+    assert stats.bytes_received == 2048
@@ -0,0 +1,121 @@
+"""Retention tiers: rollups, archiving and vacuuming."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from dk_cli.database import Database
+from dk_cli.retention import Candle, RetentionPolicy, bucket_start, fold_candles
+from dk_cli.timestamps import to_epoch_ms
+
+NOW = datetime(2026, 10, 17, 12, 0)
+POLICY = RetentionPolicy(raw_days=3, minute_days=10, archive_days=30)
+
+
+def test_bucket_start():
+    ms = to_epoch_ms(datetime(2026, 10, 17, 9, 41, 27, 500000))
+
+    assert ms - bucket_start(ms, "minute") == 27_500
+    assert bucket_start(ms, "hour") % 3_600_000 == 0
+    assert bucket_start(bucket_start(ms, "hour"), "hour") == bucket_start(ms, "hour")
+
+
+def test_fold_candles_keeps_open_and_close_in_time_order():
+    base = to_epoch_ms(datetime(2026, 10, 17, 9, 0))
+    samples = [
+        ("A", base + offset, "ml_home", Candle(value, value, value, value, 1, base + offset))
+        for offset, value in ((0, -150), (10_000, -170), (20_000, -140), (70_000, -160))
+    ]
+
+    folded = fold_candles(samples, "minute")
+
+    first = folded[("A", base, "ml_home")]
+    assert (first.open, first.high, first.low, first.close) == (-150, -140, -170, -140)
+    assert (first.samples, first.last_seen_at) == (3, base + 20_000)
+    assert folded[("A", base + 60_000, "ml_home")].samples == 1
+
+
+def _fill(db, make_game, days=40):
+    """A game whose moneyline moves every 90 minutes for ``days``."""
+    fetched_at = NOW - timedelta(days=days)
+    step = 0
+    while fetched_at < NOW:
+        db.save_games([make_game(ml_home=-150 - step % 7, fetched_at=fetched_at)])
+        fetched_at += timedelta(minutes=90)
+        step += 1
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(tmp_path / "history.db")
+    yield db
+    db.close()
+
+
+def test_retention_moves_history_down_the_tiers(db, make_game):
+    _fill(db, make_game)
+    before = db.get_line_history("BUF_KC_20261018")
+
+    report = db.apply_retention(POLICY, NOW)
+
+    assert report.raw_rows_rolled_up > 0
+    assert report.minute_rows_rolled_up > 0
+    assert report.hour_rows_archived > 0
+    assert db.archive_path.exists()
+
+    after = db.get_line_history("BUF_KC_20261018")
+    assert after[0]["fetched_at"] == before[0]["fetched_at"][:13] + ":00:00"
+    assert after[-1] == before[-1]
+    with db._connection() as conn:
+        oldest_raw = conn.execute("SELECT MIN(fetched_at) FROM betting_lines").fetchone()[0]
+        resolutions = dict(conn.execute(
+            "SELECT resolution, COUNT(*) FROM betting_lines_rollup GROUP BY resolution"
+        ).fetchall())
+    assert oldest_raw >= to_epoch_ms(NOW - timedelta(days=3))
+    assert set(resolutions) == {"minute", "hour"}
+
+
+def test_newest_snapshot_stays_raw(db, make_game):
+    db.save_games([make_game(fetched_at=NOW - timedelta(days=60))])
+
+    db.apply_retention(POLICY, NOW)
+
+    [game] = db.get_games()
+    assert game.betting_lines.money_line.home == -150
+    # Unchanged lines are still recognised after retention
+    report = db.save_games([make_game(fetched_at=NOW)])
+    assert (report.inserted, report.unchanged) == (0, 1)
+
+
+def test_batches_fold_to_the_same_rollups(tmp_path, make_game):
+    whole = Database(tmp_path / "whole.db")
+    batched = Database(tmp_path / "batched.db")
+    for db in (whole, batched):
+        _fill(db, make_game)
+
+    assert whole.apply_retention(POLICY, NOW) == batched.apply_retention(POLICY, NOW, batch_size=7)
+
+    def dump(db):
+        with db._connection() as conn:
+            return [
+                conn.execute(f"SELECT * FROM {table} ORDER BY 1, 2, 3, 4").fetchall()
+                for table in ("betting_lines_rollup", "betting_lines", "games")
+            ]
+
+    assert dump(whole) == dump(batched)
+    assert whole.get_line_history("BUF_KC_20261018") == batched.get_line_history(
+        "BUF_KC_20261018"
+    )
+
+
+def test_new_databases_vacuum_incrementally(db, make_game):
+    _fill(db, make_game, days=20)
+    with db._connection() as conn:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    db.apply_retention(POLICY, NOW)
+
+    assert db.incremental_vacuum() > 0
+    with db._connection() as conn:
+        assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
@@ -0,0 +1,65 @@
+"""Adaptive poll intervals."""
+
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+import pytest
+
+from dk_cli.server.scheduler import PollScheduler
+
+NOW = datetime(2026, 10, 18, 11, 0)
+
+
+@pytest.fixture
+def scheduler():
+    return PollScheduler(base_interval=60, min_interval=15, max_interval=600, volatility_window=4)
+
+
+@pytest.mark.parametrize("until_kickoff, interval, reason", [
+    (timedelta(minutes=20), 15, "kickoff within 30m"),
+    (timedelta(hours=2), 30, "kickoff within 3h"),
+    (timedelta(hours=10), 60, "kickoff within 24h"),
+    (timedelta(hours=48), 180, "kickoff within 72h"),
+    (timedelta(days=5), 600, "no kickoff within 72h"),
+])
+def test_interval_follows_next_kickoff(scheduler, make_game, until_kickoff, interval, reason):
+    decision = scheduler.next_interval([make_game(start_time=NOW + until_kickoff)], NOW)
+
+    assert (decision.interval, decision.reason) == (interval, reason)
+
+
+def test_live_games_poll_at_the_minimum(scheduler, make_game):
+    games = [make_game("A", status="live"), make_game("B", start_time=NOW + timedelta(days=5))]
+
+    assert scheduler.next_interval(games, NOW).interval == 15
+
+
+def test_made_up_start_times_are_ignored(scheduler, make_game):
+    """now() stand-ins must not pin the slate to the minimum interval."""
+    unknown = replace(make_game("A", start_time=NOW), start_time_known=False)
+    later = make_game("B", start_time=NOW + timedelta(hours=10))
+
+    assert scheduler.next_interval([unknown, later], NOW).reason == "kickoff within 24h"
+    assert scheduler.next_interval([unknown], NOW).reason == "no upcoming games"
+
+
+def test_volatility_scales_the_interval(scheduler, make_game):
+    kickoff = NOW + timedelta(hours=10)
+    for ml_home in (-150, -160, -170):
+        scheduler.observe([make_game(ml_home=ml_home, start_time=kickoff)])
+    assert scheduler.next_interval([make_game(start_time=kickoff)], NOW).interval == 30
+
+    quiet = PollScheduler(60, 15, 600, volatility_window=4)
+    for _ in range(5):
+        quiet.observe([make_game(start_time=kickoff)])
+    assert quiet.next_interval([make_game(start_time=kickoff)], NOW).interval == 120
+
+
+def test_overnight_backs_off_unless_kickoff_is_close(scheduler, make_game):
+    night = datetime(2026, 10, 18, 3, 0)
+
+    far = scheduler.next_interval([make_game(start_time=night + timedelta(hours=10))], night)
+    near = scheduler.next_interval([make_game(start_time=night + timedelta(hours=1))], night)
+
+    assert (far.interval, far.reason) == (600, "overnight")
+    assert near.interval == 30
@@ -0,0 +1,160 @@
+"""Per-client subscriptions and the fan-out that groups clients by them."""
+
+import asyncio
+import json
+
+import pytest
+
+from dk_cli.server.connections import SLOW_CLIENT_CLOSE_CODE, ConnectionManager
+from dk_cli.server.diff import DeltaEngine
+from dk_cli.server.subscriptions import Subscription
+
+
+class FakeWebSocket:
+    """Records frames instead of sending them."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data):
+        self.sent.append(json.loads(data))
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+    async def close(self, code=1000):
+        pass
+
+
+def test_subscribe_restricts_and_resets():
+    sub = Subscription().subscribe({"game_ids": ["A"], "markets": ["moneyline"]})
+    assert sub.to_dict() == {"game_ids": ["A"], "status": None, "markets": ["money_line"]}
+
+    sub = sub.subscribe({"game_ids": "B"})
+    assert sub.game_ids == {"A", "B"}
+    assert sub.unsubscribe({"game_ids": ["A"]}).game_ids == {"B"}
+
+    assert sub.subscribe({}).is_all
+
+
+def test_unknown_market_is_rejected():
+    with pytest.raises(ValueError, match="player_props"):
+        Subscription().subscribe({"markets": ["spread", "player_props"]})
+
+
+@pytest.mark.parametrize("message", [
+    {"game_ids": 5},
+    {"status": {"live": True}},
+    {"markets": [["spread"]]},
+])
+def test_malformed_fields_are_rejected(message):
+    with pytest.raises(ValueError, match="must be a string or a list"):
+        Subscription().subscribe(message)
+
+
+def test_filter_message_trims_games_and_markets(make_game):
+    sub = Subscription().subscribe({"status": "live", "markets": "total"})
+    games = [make_game("A", status="live").to_dict(), make_game("B").to_dict()]
+
+    message = sub.filter_message({"type": "games_update", "game_count": 2, "games": games})
+
+    assert message["game_count"] == 1
+    [game] = message["games"]
+    assert game["game_id"] == "A"
+    assert list(game["betting_lines"]) == ["total"]
+    # Messages without games pass through untouched
+    error = {"type": "error", "error": "boom"}
+    assert sub.filter_message(error) is error
+
+
+def test_filter_delta_turns_status_moves_into_adds_and_removes(make_game):
+    engine = DeltaEngine()
+    engine.update([make_game("A"), make_game("B", status="live")], complete=True)
+    delta = engine.update(
+        [make_game("A", status="live"), make_game("B", status="final")], complete=True
+    )
+
+    live = Subscription().subscribe({"status": "live"}).filter_delta(delta)
+
+    assert live["seq"] == delta.seq
+    assert [game["game_id"] for game in live["added"]] == ["A"]
+    assert live["removed"] == ["B"]
+    assert live["changed"] == {}
+
+
+def test_filter_delta_drops_patches_for_other_markets(make_game):
+    engine = DeltaEngine()
+    engine.update([make_game("A")], complete=True)
+    delta = engine.update([make_game("A", spread=-4.0)], complete=True)
+
+    totals = Subscription().subscribe({"markets": "total"}).filter_delta(delta)
+    spreads = Subscription().subscribe({"markets": "spread"}).filter_delta(delta)
+
+    assert totals["changed"] == {}
+    assert list(spreads["changed"]["A"]["betting_lines"]) == ["spread"]
+
+
+@pytest.mark.asyncio
+async def test_publish_renders_once_per_subscription(make_game):
+    manager = ConnectionManager()
+    sockets = [FakeWebSocket() for _ in range(4)]
+    for websocket in sockets:
+        await manager.connect(websocket)
+    live = Subscription().subscribe({"status": "live"})
+    manager.subscribe(sockets[2], live)
+    manager.subscribe(sockets[3], live)
+
+    renders = []
+
+    def render(subscription):
+        renders.append(subscription)
+        return subscription.filter_message(
+            {"type": "games_update", "games": [make_game("A").to_dict()]}
+        )
+
+    await manager.publish(render)
+    await asyncio.sleep(0.01)
+
+    assert len(renders) == 2
+    assert set(renders) == {Subscription(), live}
+    assert [len(ws.sent[0]["games"]) for ws in sockets] == [1, 1, 0, 0]
+    assert manager.stats()["subscription_groups"] == 2
+    await manager.close_all()
+
+
+class StuckWebSocket(FakeWebSocket):
+    """Never finishes a send, and closes only when released."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+        self.close_code = None
+
+    async def send_text(self, data):
+        await asyncio.Event().wait()
+
+    async def close(self, code=1000):
+        await self.release.wait()
+        self.close_code = code
+
+
+@pytest.mark.asyncio
+async def test_dropped_clients_are_closed_by_tracked_tasks():
+    manager = ConnectionManager(queue_size=1)
+    websocket = StuckWebSocket()
+    await manager.connect(websocket)
+
+    for _ in range(3):
+        await manager.broadcast({"type": "ping"})
+        await asyncio.sleep(0)
+
+    assert len(manager) == 0
+    assert len(manager._closing) == 1
+
+    websocket.release.set()
+    await manager.close_all()
+    assert websocket.close_code == SLOW_CLIENT_CLOSE_CODE
+    assert not manager._closing
@@ -0,0 +1,60 @@
+"""Publishing fetched games from the polling task."""
+
+import asyncio
+
+import pytest
+
+from dk_cli.config import ServerConfig
+from dk_cli.database import SaveReport
+from dk_cli.server import tasks
+from dk_cli.server.state import AppState
+
+
+class SlowDatabase:
+    """Stands in for AsyncDatabase: each save waits, and some fail."""
+
+    def __init__(self, delays, fail_on=()):
+        self.delays = list(delays)
+        self.fail_on = set(fail_on)
+        self.saves = 0
+
+    async def save_games(self, games):
+        call = self.saves
+        self.saves += 1
+        await asyncio.sleep(self.delays[call])
+        if call in self.fail_on:
+            raise RuntimeError("disk I/O error")
+        return SaveReport(inserted=1)
+
+
+@pytest.fixture
+def state(monkeypatch):
+    state = AppState()
+    monkeypatch.setattr(tasks, "app_state", state)
+    sent = []
+
+    async def broadcast_delta(delta):
+        sent.append(delta.seq)
+
+    monkeypatch.setattr(state, "broadcast_delta", broadcast_delta)
+    state.sent = sent
+    return state
+
+
+@pytest.mark.asyncio
+async def test_deltas_broadcast_in_seq_order_despite_slow_saves(state, make_game):
+    task = tasks.PollingTask(ServerConfig(save_to_db=False, adaptive_polling=False))
+    # The first save is the slowest; the broadcasts must not wait for it
+    task.db = SlowDatabase(delays=[0.05, 0.0, 0.02], fail_on={1})
+
+    results = await asyncio.gather(
+        task._publish_changes([make_game("A", ml_home=-160)]),
+        task._publish_changes([make_game("A", ml_home=-170)]),
+        task._publish_changes([make_game("A", ml_home=-180)]),
+        return_exceptions=True,
+    )
+
+    # The failed save still left its delta broadcast, in order
+    assert [type(result) for result in results] == [type(None), RuntimeError, type(None)]
+    assert state.sent == [1, 2, 3]
+    assert state.deltas.seq == 3
@@ -37,6 +37,7 @@ export async function getBets(params?: {
   status?: BetStatus;
   limit?: number;
   offset?: number;
+  cursor?: string;
 }): Promise<BetsResponse> {
   const searchParams = new URLSearchParams();
 
@@ -49,6 +50,9 @@ export async function getBets(params?: {
   if (params?.offset) {
     searchParams.set('offset', String(params.offset));
   }
+  if (params?.cursor) {
+    searchParams.set('cursor', params.cursor);
+  }
 
   const url = `${API_BASE}/bets${searchParams.toString() ? `?${searchParams}` : ''}`;
   const response = await fetch(url);
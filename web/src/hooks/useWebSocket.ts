@@ -1,5 +1,19 @@
 import { useEffect, useRef, useState, useCallback } from 'react';
-import type { NFLGame, WebSocketMessage } from '../types/api';
+import type { GamePatch, NFLGame, WebSocketMessage } from '../types/api';
+
+// Recursively merge a delta's changed fields into a copy of target
+function applyPatch<T>(target: T, patch: GamePatch): T {
+  const result: Record<string, unknown> = { ...(target as Record<string, unknown>) };
+  for (const [key, value] of Object.entries(patch)) {
+    const current = result[key];
+    if (value !== null && typeof value === 'object' && current && typeof current === 'object') {
+      result[key] = applyPatch(current, value);
+    } else {
+      result[key] = value;
+    }
+  }
+  return result as T;
+}
 
 interface UseWebSocketReturn {
   games: NFLGame[];
@@ -18,6 +32,8 @@ export function useWebSocket(): UseWebSocketReturn {
   const wsRef = useRef<WebSocket | null>(null);
   const reconnectTimeoutRef = useRef<number | null>(null);
   const reconnectAttemptsRef = useRef(0);
+  // seq of the state we hold; null until the first full snapshot arrives
+  const seqRef = useRef<number | null>(null);
 
   const connect = useCallback(() => {
     // Clean up existing connection
@@ -32,6 +48,7 @@ export function useWebSocket(): UseWebSocketReturn {
     console.log('Connecting to WebSocket:', wsUrl);
     const ws = new WebSocket(wsUrl);
     wsRef.current = ws;
+    seqRef.current = null;
 
     ws.onopen = () => {
       console.log('WebSocket connected');
@@ -51,11 +68,69 @@ export function useWebSocket(): UseWebSocketReturn {
             if (message.games) {
               setGames(message.games);
             }
+            if (message.seq !== undefined) {
+              seqRef.current = message.seq;
+            }
+            if (message.timestamp) {
+              setLastUpdated(new Date(message.timestamp));
+            }
+            setError(null);
+            break;
+
+          case 'games_delta': {
+            const seq = message.seq ?? 0;
+            // Already covered by the snapshot we hold
+            if (seqRef.current === null || seq <= seqRef.current) {
+              break;
+            }
+            if (seq !== seqRef.current + 1) {
+              // Missed an update: ask for a full snapshot and wait for it
+              console.warn(`WebSocket gap: have ${seqRef.current}, got ${seq}; resyncing`);
+              seqRef.current = null;
+              ws.send(JSON.stringify({ type: 'resync' }));
+              break;
+            }
+            seqRef.current = seq;
+
+            const changed = message.changed ?? {};
+            const removed = new Set(message.removed ?? []);
+            const added = message.added ?? [];
+            if (Object.keys(changed).length || removed.size || added.length) {
+              setGames((prev) => {
+                const addedIds = new Set(added.map((g) => g.game_id));
+                const kept = prev
+                  .filter((g) => !removed.has(g.game_id) && !addedIds.has(g.game_id))
+                  .map((g) => (changed[g.game_id] ? applyPatch(g, changed[g.game_id]) : g));
+                return [...kept, ...added];
+              });
+            }
             if (message.timestamp) {
               setLastUpdated(new Date(message.timestamp));
             }
             setError(null);
             break;
+          }
+
+          case 'games_changed':
+            // Streaming mode: merge only the games whose lines changed
+            if (message.seq !== undefined && seqRef.current !== null) {
+              seqRef.current = message.seq;
+            }
+            if (message.games) {
+              const changed = new Map(message.games.map((g) => [g.game_id, g]));
+              setGames((prev) => {
+                const merged = prev.map((g) => {
+                  const update = changed.get(g.game_id);
+                  changed.delete(g.game_id);
+                  return update ?? g;
+                });
+                return [...merged, ...changed.values()];
+              });
+            }
+            if (message.timestamp) {
+              setLastUpdated(new Date(message.timestamp));
+            }
+            break;
 
           case 'error':
             setError(message.error || 'Unknown error');
@@ -60,13 +60,28 @@ export interface HealthResponse {
   last_error: string | null;
 }
 
+// Nested subset of an NFLGame's fields that changed
+export type GamePatch = { [key: string]: GamePatch | string | number | null };
+
 export interface WebSocketMessage {
-  type: 'connection_established' | 'games_update' | 'error' | 'pong';
+  type:
+    | 'connection_established'
+    | 'games_update'
+    | 'games_changed'
+    | 'games_delta'
+    | 'error'
+    | 'pong';
   timestamp: string;
+  seq?: number;
+  encoding?: 'json' | 'msgpack' | 'columnar';
   game_count?: number;
   games?: NFLGame[];
   last_updated?: string | null;
   error?: string;
+  // games_delta only
+  changed?: Record<string, GamePatch>;
+  added?: NFLGame[];
+  removed?: string[];
 }
 
 // ==================== BETTING TYPES ====================
@@ -119,6 +134,7 @@ export interface BetsResponse {
   total_count: number;
   limit: number;
   offset: number;
+  next_cursor: string | null;
 }
 
 export interface SettleGameResponse {